@@ -5,12 +5,18 @@
 - 통계적 검정
 """
 
+import argparse
 import pandas as pd
-import numpy as np
 from scipy import stats
 import matplotlib.pyplot as plt
 import seaborn as sns
-from kinship_analysis import KwagwaDataParser, KinshipAnalyzer
+from kinship_analysis import add_loader_arguments, KwagwaDataParser, KinshipAnalyzer
+from dictionary_encoding import count_codes
+from era_binning import get_scheme
+from inequality import inequality
+from name_index import name_index
+from null_model import null_model_test
+from resampling import DEFAULT_SEED
 
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
@@ -19,41 +25,32 @@ plt.rcParams['axes.unicode_minus'] = False
 class AdvancedKinshipAnalyzer(KinshipAnalyzer):
     """고급 혈연관계 분석 클래스"""
     
-    def __init__(self, data_dict):
+    REQUIRED_COLUMNS = KinshipAnalyzer.REQUIRED_COLUMNS + ('등급',)
+    
+    def __init__(self, data_dict, n_permutations=1000, seed=DEFAULT_SEED, workers=1):
         super().__init__(data_dict)
+        # 귀무모형 몬테카를로 검정 설정 (n_permutations=0이면 생략)
+        self.null_model_options = {'n_permutations': n_permutations, 'seed': seed,
+                                   'workers': workers}
     
     def analyze_name_patterns(self):
         """항렬(行列) 분석 - 이름 패턴으로 동일 가문 추정"""
         print("\n[고급 분석 1] 이름 패턴 분석")
         print("-" * 60)
         
-        df = self.combined_df.copy()
-        
-        # 성관별로 그룹화
-        grouped = df.groupby('성관')
+        # 이름 글자 색인에서 성관별 두 번째 글자(항렬자) 사용 횟수를 한 번에 집계
+        # (최소 5명 이상인 성관, 최소 3명 이상 같은 항렬자, 성관마다 가장 많이 사용된 항렬자)
+        shared = name_index(self.combined_df).shared_characters(positions=(2,), min_count=3,
+                                                                min_family=5)
+        top = shared.drop_duplicates('성관')
         
-        name_patterns = []
-        
-        for name, group in grouped:
-            if len(group) >= 5:  # 최소 5명 이상인 성관만
-                # 이름의 두 번째 글자 (항렬자) 분석
-                names = group['급제자'].str.split('', expand=True)
-                if len(names.columns) >= 3:
-                    second_chars = names[2].value_counts()
-                    
-                    # 가장 많이 사용된 항렬자
-                    if len(second_chars) > 0:
-                        top_char = second_chars.index[0]
-                        top_count = second_chars.iloc[0]
-                        
-                        if top_count >= 3:  # 최소 3명 이상 같은 항렬자
-                            name_patterns.append({
-                                '성관': name,
-                                '총급제자수': len(group),
-                                '주요항렬자': top_char,
-                                '항렬자사용횟수': top_count,
-                                '항렬자비율': f"{(top_count/len(group)*100):.1f}%"
-                            })
+        name_patterns = [{
+            '성관': row.성관,
+            '총급제자수': row.성관급제자수,
+            '주요항렬자': row.항렬자,
+            '항렬자사용횟수': row.사용횟수,
+            '항렬자비율': f"{(row.사용횟수/row.성관급제자수*100):.1f}%"
+        } for row in top.itertuples(index=False)]
         
         pattern_df = pd.DataFrame(name_patterns)
         if not pattern_df.empty:
@@ -63,41 +60,45 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         
         return pattern_df
     
+    def analyze_shared_generation_chars(self):
+        """성관별 공유 항렬자 전체 목록 (이름 두·세 번째 글자, 사용 연도 범위 포함)"""
+        print("\n[고급 분석 1-1] 성관별 공유 항렬자")
+        print("-" * 60)
+        
+        shared = name_index(self.combined_df).shared_characters()
+        shared['사용기간'] = shared['최종년도'] - shared['최초년도']
+        
+        if not shared.empty:
+            print(f"\n공유 항렬자 {len(shared)}개 (성관 {shared['성관'].nunique()}개, "
+                  f"같은 위치에 3명 이상)")
+            ranked = shared.sort_values('사용횟수', ascending=False, kind='stable')
+            print(ranked.head(15).to_string(index=False))
+        
+        return shared
+    
     def analyze_exam_success_rate_by_period(self):
         """시대별 특정 성관의 급제율 변화 추적"""
         print("\n[고급 분석 2] 주요 성관의 시대별 급제 패턴")
         print("-" * 60)
         
-        df = self.combined_df.copy()
-        
         # 상위 5개 성관 선정
-        top_families = df['성관'].value_counts().head(5).index.tolist()
+        top_families = count_codes(self.combined_df['성관']).head(5).index.tolist()
         
-        # 시대별로 분류
-        def get_period(year):
-            if pd.isna(year):
-                return None
-            if year < 1494:
-                return '조선 전기'
-            elif year < 1608:
-                return '조선 중기'
-            else:
-                return '조선 후기'
-        
-        df['시대'] = df['시험년_int'].apply(get_period)
+        # 시대별로 분류 (조선 전기/중기/후기) 후 성관 × 시대 큐브 한 번 집계
+        scheme = get_scheme('3-era')
+        cube = self.context.cube('성관', '시대')
+        period_totals = cube.rollup('시대').to_series()
+        family_period = cube.dice(성관=top_families).table('성관', '시대')
         
         # 각 가문별 시대별 통계
         results = []
         for family in top_families:
-            family_data = df[df['성관'] == family]
-            
-            for period in ['조선 전기', '조선 중기', '조선 후기']:
-                period_data = family_data[family_data['시대'] == period]
-                total_period = df[df['시대'] == period]
+            for period in scheme.labels:
+                total_period = period_totals[period]
                 
-                if len(total_period) > 0:
-                    count = len(period_data)
-                    ratio = (count / len(total_period)) * 100
+                if total_period > 0:
+                    count = int(family_period.at[family, period])
+                    ratio = (count / total_period) * 100
                     
                     results.append({
                         '성관': family,
@@ -120,19 +121,21 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         print("\n[고급 분석 3] 지역-성관 집중도 분석")
         print("-" * 60)
         
-        df = self.combined_df[self.combined_df['거주지'] != ''].copy()
+        # 거주지 × 성관 큐브 한 번 집계 (빈 거주지는 순위에서 제외)
+        cube = self.context.cube('거주지', '성관')
         
         # 주요 지역 선정 (상위 10개)
-        top_regions = df['거주지'].value_counts().head(10).index.tolist()
+        region_counts = cube.ranked('거주지', exclude=[''])
+        top_regions = region_counts.head(10).index.tolist()
         
         region_family_map = []
         
         for region in top_regions:
-            region_data = df[df['거주지'] == region]
-            top_families = region_data['성관'].value_counts().head(3)
+            region_total = region_counts[region]
+            top_families = cube.slice(거주지=region).ranked('성관').head(3)
             
             for family, count in top_families.items():
-                ratio = (count / len(region_data)) * 100
+                ratio = (count / region_total) * 100
                 region_family_map.append({
                     '지역': region,
                     '성관': family,
@@ -157,7 +160,7 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         print("-" * 60)
         
         # 성관별 급제자 수
-        family_counts = self.combined_df['성관'].value_counts()
+        family_counts = count_codes(self.combined_df['성관'])
         
         # 균등 분포 가정 (모든 성관이 동일한 급제자 수)
         expected_mean = len(self.combined_df) / len(family_counts)
@@ -181,7 +184,7 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         print(f"  상위 10% 성관({n_top}개)의 급제자 비율: {top_concentration:.2f}%")
         
         # 지니계수 계산 (불평등도 측정)
-        gini = self._calculate_gini(family_counts.values)
+        gini = inequality(family_counts.values)['지니계수']
         print(f"\n지니계수: {gini:.4f}")
         print(f"  (0: 완전 평등, 1: 완전 불평등)")
         
@@ -192,36 +195,41 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         else:
             print(f"  → 낮은 불평등: 비교적 균등한 분포")
         
+        # 귀무모형 검정 (성관·연도 규모를 고정한 연도순열 대비 경험적 p값)
+        null_test = None
+        if self.null_model_options['n_permutations'] > 0:
+            null_test = null_model_test(self.combined_df, **self.null_model_options)
+            print(f"\n귀무모형 검정 (복제 {self.null_model_options['n_permutations']}회):")
+            print(null_test.round(4).to_string())
+        
         # 통계적 해석
         print(f"\n해석:")
         if gini > 0.5:
             print(f"  과거제는 형식적으로는 능력주의였으나,")
             print(f"  실질적으로는 특정 명문 가문에 급제 기회가 집중됨")
+        if null_test is not None:
+            for name, row in null_test.iterrows():
+                verdict = "우연보다 큼" if row['p값'] < 0.05 else "우연과 구별되지 않음"
+                print(f"  {name}: p = {row['p값']:.4f} → {verdict} ({row['귀무모형']} 기준)")
         
         return {
             'mean': actual_mean,
             'std': actual_std,
             'cv': actual_std / actual_mean,
             'top_concentration': top_concentration,
-            'gini': gini
+            'gini': gini,
+            'null_model': null_test
         }
     
-    def _calculate_gini(self, values):
-        """지니계수 계산"""
-        sorted_values = np.sort(values)
-        n = len(values)
-        cumsum = np.cumsum(sorted_values)
-        return (2 * np.sum((np.arange(1, n+1)) * sorted_values)) / (n * cumsum[-1]) - (n + 1) / n
-    
     def analyze_exam_grade_distribution(self):
         """등급별(갑과/을과/병과) 성관 분포"""
         print("\n[고급 분석 5] 등급별 성관 분포 분석")
         print("-" * 60)
         
-        df = self.combined_df[self.combined_df['등급'] != ''].copy()
+        df = self.combined_df[self.combined_df['등급'] != '']
         
         # 등급별 통계
-        grade_stats = df.groupby('등급').agg({
+        grade_stats = df.groupby('등급', observed=True).agg({
             '급제자': 'count',
             '성관': 'nunique'
         }).rename(columns={'급제자': '급제자수', '성관': '성관수'})
@@ -230,12 +238,13 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         print(grade_stats)
         
         # 주요 성관의 등급 분포
-        top_families = df['성관'].value_counts().head(5).index
+        top_families = count_codes(df['성관']).head(5).index
         
         print("\n주요 성관의 등급별 분포:")
         for family in top_families:
             family_data = df[df['성관'] == family]
             grade_dist = family_data['등급'].value_counts()
+            grade_dist = grade_dist[grade_dist > 0]
             
             print(f"\n{family} (총 {len(family_data)}명):")
             for grade, count in grade_dist.items():
@@ -249,20 +258,18 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         print("\n[고급 분석 6] 시간대별 급제 추이 시각화")
         print("-" * 60)
         
-        df = self.combined_df.copy()
-        df = df[df['시험년_int'].notna()]
-        
-        # 10년 단위로 그룹화
-        df['decade'] = (df['시험년_int'] // 10) * 10
+        # 성관 × 10년 단위 연대 큐브 (연대 목록으로 제한하면 시험년 미상 행이 빠짐)
+        cube = self.context.cube('성관', '연대')
+        cube = cube.dice(연대=cube.labels('연대'))
         
         # 상위 5개 성관
-        top_families = df['성관'].value_counts().head(5).index
+        top_families = cube.ranked('성관').head(5).index
         
         fig, ax = plt.subplots(figsize=(16, 8))
         
         for family in top_families:
-            family_data = df[df['성관'] == family]
-            timeline = family_data.groupby('decade').size()
+            timeline = cube.slice(성관=family).to_series()
+            timeline = timeline[timeline > 0]
             ax.plot(timeline.index, timeline.values, marker='o', label=family, linewidth=2)
         
         ax.set_xlabel('연도', fontsize=14)
@@ -285,6 +292,7 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         
         # 각 분석 실행
         patterns = self.analyze_name_patterns()
+        shared_chars = self.analyze_shared_generation_chars()
         period_trend = self.analyze_exam_success_rate_by_period()
         geo = self.analyze_geographic_concentration()
         stats_test = self.statistical_test_concentration()
@@ -300,14 +308,23 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
             patterns.to_csv('항렬자_분석.csv', encoding='utf-8-sig', index=False)
             print("  → 항렬자_분석.csv 저장")
         
+        if not shared_chars.empty:
+            shared_chars.to_csv('항렬자_공유.csv', encoding='utf-8-sig', index=False)
+            print("  → 항렬자_공유.csv 저장")
+        
         period_trend.to_csv('시대별_성관추이.csv', encoding='utf-8-sig', index=False)
         print("  → 시대별_성관추이.csv 저장")
         
         geo.to_csv('지역별_성관분포.csv', encoding='utf-8-sig', index=False)
         print("  → 지역별_성관분포.csv 저장")
         
+        if stats_test['null_model'] is not None:
+            stats_test['null_model'].to_csv('귀무모형_검정.csv', encoding='utf-8-sig')
+            print("  → 귀무모형_검정.csv 저장")
+        
         return {
             'patterns': patterns,
+            'shared_chars': shared_chars,
             'period_trend': period_trend,
             'geo': geo,
             'stats': stats_test,
@@ -315,14 +332,22 @@ class AdvancedKinshipAnalyzer(KinshipAnalyzer):
         }
 
 
-def main():
+def main(argv=None):
     """메인 실행"""
+    arg_parser = argparse.ArgumentParser(description="조선시대 과거제 급제자 고급 혈연관계 분석")
+    add_loader_arguments(arg_parser)
+    arg_parser.add_argument('--permutations', type=int, default=1000,
+                            help='귀무모형 검정 복제 수, 0이면 생략 (기본: %(default)s)')
+    arg_parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                            help='귀무모형 난수 시드 (기본: %(default)s)')
+    args = arg_parser.parse_args(argv)
+    
     print("조선시대 과거제 급제자 고급 혈연관계 분석")
     print("=" * 60)
     
     # 데이터 로딩
-    parser = KwagwaDataParser(".")
-    data = parser.load_all_data()
+    parser = KwagwaDataParser.from_args(args)
+    data = parser.load_all_data(columns=AdvancedKinshipAnalyzer.REQUIRED_COLUMNS)
     
     # 기본 분석
     basic_analyzer = KinshipAnalyzer(data)
@@ -330,7 +355,8 @@ def main():
     basic_analyzer.visualize_results(basic_results)
     
     # 고급 분석
-    advanced_analyzer = AdvancedKinshipAnalyzer(data)
+    advanced_analyzer = AdvancedKinshipAnalyzer(data, n_permutations=args.permutations,
+                                                seed=args.seed, workers=args.workers)
     advanced_results = advanced_analyzer.generate_advanced_report()
     
     print("\n" + "=" * 60)
@@ -345,6 +371,8 @@ def main():
     print("  6. 항렬자_분석.csv")
     print("  7. 시대별_성관추이.csv")
     print("  8. 지역별_성관분포.csv")
+    print("  9. 귀무모형_검정.csv")
+    print("  10. 항렬자_공유.csv")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+읽기 전용 분석 문맥 (복사 없는 파생 컬럼 뷰)
+
+분석 메서드마다 combined_df.copy()로 전처리 DataFrame을 복사한 뒤 임시 컬럼을 더하는 대신,
+AnalysisContext가 공유 전처리 DataFrame 하나를 그대로 들고 시대/연대/지역 같은 파생 컬럼을
+처음 요청될 때 한 번만 계산하여 캐시(prepared_store.derived_column)한다.
+
+- column(name)       : 원본 컬럼 또는 DERIVED_COLUMNS에 등록된 파생 컬럼
+- with_columns(...)  : 파생 컬럼을 붙인 DataFrame (Copy-on-Write라 기존 컬럼은 복사되지 않음,
+                      pandas 2.x에서는 prepared_store가 옵션을 켬)
+- cube(*dims)        : 원본/파생 차원의 CountCube (문맥별로 캐시)
+- sessions(*keys)    : 시험 회차 색인 SessionIndex (문맥별로 캐시)
+- dated              : 시험년이 있는 행 마스크
+
+문맥은 전처리 DataFrame을 바꾸지 않으므로 여러 분석기가 같은 문맥을 공유해도 안전하다.
+"""
+
+from count_cube import CountCube
+from era_binning import era_column, get_scheme
+from prepared_store import derived_column
+from region_gazetteer import default_gazetteer
+from session_index import SESSION_KEYS, SessionIndex
+
+
+class AnalysisContext:
+    """공유 전처리 DataFrame 위의 읽기 전용 분석 문맥"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def column(self, name):
+        """원본 컬럼, 없으면 등록된 파생 컬럼"""
+        if name in self.frame.columns:
+            return self.frame[name]
+        if name in DERIVED_COLUMNS:
+            return DERIVED_COLUMNS[name](self)
+        raise KeyError(f"알 수 없는 컬럼입니다: {name}")
+
+    def era(self, scheme='3-era', unknown=None, span_labels=False):
+        """시대 구분 Series (span_labels=True면 '조선 초기 (1392-1449)' 형태 라벨)"""
+        scheme = get_scheme(scheme)
+        eras = era_column(self.frame, scheme, unknown)
+        if not span_labels:
+            return eras
+        return derived_column(self.frame, ('era_span', scheme.name, id(scheme), unknown),
+                              lambda frame: eras.cat.rename_categories(scheme.span_labels()))
+
+    def decade(self, year_column='시험년_int'):
+        """10년 단위 연대 Series (시험년 미상은 NaN)"""
+        return derived_column(self.frame, ('decade', year_column),
+                              lambda frame: ((frame[year_column] // 10) * 10).rename('연대'))
+
+    def region(self):
+        """거주지 → 지역 분류 Series (기본 지역 분류표 사용)"""
+        return derived_column(self.frame, ('region', id(default_gazetteer())),
+                              lambda frame: default_gazetteer().classify(frame['거주지']))
+
+    @property
+    def dated(self):
+        """시험년이 있는 행 마스크 (numpy bool 배열)"""
+        return derived_column(self.frame, ('dated', '시험년_int'),
+                              lambda frame: frame['시험년_int'].notna().to_numpy())
+
+    def with_columns(self, *names, **columns):
+        """등록된 파생 컬럼(names)과 주어진 컬럼을 붙인 DataFrame (기존 컬럼은 공유)"""
+        extra = {name: self.column(name) for name in names if name not in self.frame.columns}
+        extra.update(columns)
+        return self.frame.assign(**extra) if extra else self.frame
+
+    def cube(self, *dims):
+        """원본/파생 차원의 급제자 수 큐브 (문맥의 DataFrame·차원 조합별로 캐시)"""
+        return derived_column(self.frame, ('context_cube', dims),
+                              lambda frame: CountCube.from_frame(self.with_columns(*dims), dims))
+
+    def sessions(self, *keys):
+        """시험 회차 색인 (키 생략 시 시험년 + 시험명, 문맥의 DataFrame·키 조합별로 캐시)"""
+        keys = keys or SESSION_KEYS
+        return derived_column(self.frame, ('context_sessions', keys),
+                              lambda frame: SessionIndex(self, keys))
+
+
+# 이름으로 요청할 수 있는 파생 컬럼
+DERIVED_COLUMNS = {
+    '시대': lambda context: context.era('3-era'),
+    '시대_상세': lambda context: context.era('6-era', span_labels=True),
+    '연대': lambda context: context.decade(),
+    '지역': lambda context: context.region()
+}
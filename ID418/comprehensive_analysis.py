@@ -4,15 +4,16 @@
 1. 가문별 집중도 분석 (파레토, 로렌츠 곡선, 지니계수)
 2. 세대 연속성 분석 (세과, 음서 배경)
 3. 시기별 혈연 영향력 변화 (시계열 분석)
-4. 혼인 관계망 분석 (네트워크 분석)
+4. 동방(同榜) 성관 관계망 분석 (네트워크 분석)
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
-from collections import defaultdict, Counter
+from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -21,15 +22,27 @@ plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
 sns.set_style("whitegrid")
 
-from kinship_analysis import KwagwaDataParser, KinshipAnalyzer
+from kinship_analysis import add_loader_arguments, KwagwaDataParser, KinshipAnalyzer
+from dictionary_encoding import count_codes
+from era_binning import get_scheme
+from inequality import inequality, inequality_by, lorenz_curve
+from continuity import clan_runs
+from resampling import DEFAULT_SEED, bootstrap_by, bootstrap_counts
+from network import EXAM_TYPES, SESSION_COLUMNS, clan_network
 
 
 class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
     """종합 혈연관계 분석 클래스"""
     
-    def __init__(self, data_dict):
+    # 분석 4(관계망)는 회차 구분을 위해 시험명도 읽는다
+    REQUIRED_COLUMNS = KinshipAnalyzer.REQUIRED_COLUMNS + tuple(
+        c for c in SESSION_COLUMNS if c not in KinshipAnalyzer.REQUIRED_COLUMNS)
+    
+    def __init__(self, data_dict, n_bootstrap=1000, seed=DEFAULT_SEED, workers=1):
         super().__init__(data_dict)
         self.analysis_results = {}
+        # 불평등 지표 부트스트랩 신뢰구간 설정 (n_bootstrap=0이면 생략)
+        self.bootstrap_options = {'n_boot': n_bootstrap, 'seed': seed, 'workers': workers}
     
     # =========================================================================
     # 분석 1: 가문별 집중도 분석 (파레토, 로렌츠, 지니계수)
@@ -41,7 +54,7 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         print("📊 분석 1: 가문별 급제자 집중도 분석")
         print("="*70)
         
-        family_counts = self.combined_df['성관'].value_counts()
+        family_counts = count_codes(self.combined_df['성관'])
         total_families = len(family_counts)
         total_gwageo = len(self.combined_df)
         
@@ -90,21 +103,20 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         print("\n[로렌츠 곡선 & 지니계수]")
         print("-" * 70)
         
-        # 오름차순 정렬
-        sorted_counts = np.sort(family_counts.values)
-        n = len(sorted_counts)
-        
-        # 누적 비율
-        cumsum = np.cumsum(sorted_counts)
-        lorenz_y = cumsum / cumsum[-1]
-        lorenz_x = np.arange(1, n + 1) / n
+        # 로렌츠 곡선 (하위 가문부터 누적 비율)
+        lorenz_x, lorenz_y = lorenz_curve(family_counts.values)
         
-        # 지니계수 계산 (사다리꼴 공식)
-        # Gini = 1 - 2 * (로렌츠 곡선 아래 면적)
-        area_under_lorenz = np.trapz(lorenz_y, lorenz_x)
-        gini = 1 - 2 * area_under_lorenz
+        # 지니계수 = 1 - 2 * (로렌츠 곡선 아래 면적)
+        gini = inequality(family_counts.values)['지니계수']
         
         print(f"지니계수 (Gini Coefficient): {gini:.4f}")
+        if self.bootstrap_options['n_boot'] > 0:
+            intervals = bootstrap_counts(family_counts.values, **self.bootstrap_options)
+            self.analysis_results['gini_interval'] = intervals
+            for name in ['지니계수', '상위10%점유']:
+                row = intervals.loc[name]
+                print(f"  {name} 95% 신뢰구간: [{row['하한']:.4f}, {row['상한']:.4f}] "
+                      f"(부트스트랩 {self.bootstrap_options['n_boot']}회)")
         print(f"\n해석:")
         print(f"  • 0.0 = 완전 평등 (모든 가문이 동일한 급제자 수)")
         print(f"  • 1.0 = 완전 불평등 (1개 가문이 모든 급제자 독점)")
@@ -249,116 +261,57 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         print("📊 분석 2: 세대 연속성 분석 (세과 & 음서)")
         print("="*70)
         
-        df = self.combined_df.copy()
-        df = df[df['시험년_int'].notna()]
-        
-        # 성관별 급제 이력 구축
-        family_history = defaultdict(list)
-        for _, row in df.iterrows():
-            family = row['성관']
-            year = row['시험년_int']
-            name = row['급제자']
-            family_history[family].append({
-                'year': year,
-                'name': name
-            })
-        
-        # 각 가문의 급제 이력을 시간순 정렬
-        for family in family_history:
-            family_history[family] = sorted(family_history[family], 
-                                           key=lambda x: x['year'])
+        # 전체를 (성관, 시험년)으로 한 번 정렬하여 모든 성관의 최장 연속 세대 계산
+        # (세대 간격 20-40년, 시험년이 있는 급제자가 1명 이상인 성관만)
+        runs = clan_runs(self.combined_df)
+        runs = runs[runs['연도확인수'] > 0]
+        n_families = len(runs)
         
         print("\n[세과(世科) 분류]")
         print("-" * 70)
         
-        # 세과 분류
-        categories = {
-            '1명 (단발성)': 0,
-            '2-4명 (소가문)': 0,
-            '5-9명 (중가문)': 0,
-            '10-19명 (대가문)': 0,
-            '20-49명 (명문가)': 0,
-            '50명+ (최상위 명문)': 0
-        }
-        
-        generation_continuity = {
-            '비연속 (단발 또는 간헐적)': 0,
-            '2대 연속 추정': 0,
-            '3대 연속 추정': 0,
-            '4대+ 연속 추정': 0
-        }
-        
-        continuous_families = []
-        
-        for family, history in family_history.items():
-            n_gwageo = len(history)
-            
-            # 가문 규모 분류
-            if n_gwageo == 1:
-                categories['1명 (단발성)'] += 1
-            elif n_gwageo <= 4:
-                categories['2-4명 (소가문)'] += 1
-            elif n_gwageo <= 9:
-                categories['5-9명 (중가문)'] += 1
-            elif n_gwageo <= 19:
-                categories['10-19명 (대가문)'] += 1
-            elif n_gwageo <= 49:
-                categories['20-49명 (명문가)'] += 1
-            else:
-                categories['50명+ (최상위 명문)'] += 1
-            
-            # 세대 연속성 추정 (25-35년을 1세대로 가정)
-            if n_gwageo >= 2:
-                years = [h['year'] for h in history]
-                max_continuity = 1
-                current_continuity = 1
-                
-                for i in range(1, len(years)):
-                    gap = years[i] - years[i-1]
-                    if 20 <= gap <= 40:  # 세대 간격으로 추정
-                        current_continuity += 1
-                        max_continuity = max(max_continuity, current_continuity)
-                    else:
-                        current_continuity = 1
-                
-                if max_continuity >= 4:
-                    generation_continuity['4대+ 연속 추정'] += 1
-                    continuous_families.append({
-                        '성관': family,
-                        '총급제자': n_gwageo,
-                        '최대연속세대': max_continuity,
-                        '기간': f"{int(years[0])}-{int(years[-1])}",
-                        '지속년수': int(years[-1] - years[0])
-                    })
-                elif max_continuity == 3:
-                    generation_continuity['3대 연속 추정'] += 1
-                    continuous_families.append({
-                        '성관': family,
-                        '총급제자': n_gwageo,
-                        '최대연속세대': max_continuity,
-                        '기간': f"{int(years[0])}-{int(years[-1])}",
-                        '지속년수': int(years[-1] - years[0])
-                    })
-                elif max_continuity == 2:
-                    generation_continuity['2대 연속 추정'] += 1
-                else:
-                    generation_continuity['비연속 (단발 또는 간헐적)'] += 1
-            else:
-                generation_continuity['비연속 (단발 또는 간헐적)'] += 1
+        # 가문 규모 분류 (구간 하한: 1, 2, 5, 10, 20, 50명)
+        size_labels = ['1명 (단발성)', '2-4명 (소가문)', '5-9명 (중가문)',
+                       '10-19명 (대가문)', '20-49명 (명문가)', '50명+ (최상위 명문)']
+        size_bins = np.searchsorted([1, 2, 5, 10, 20, 50], runs['연도확인수'], side='right') - 1
+        categories = dict(zip(size_labels,
+                              np.bincount(size_bins, minlength=len(size_labels)).tolist()))
+        
+        # 세대 연속성 분류 (최대 연속 1 → 비연속, 2, 3, 4+)
+        continuity_labels = ['비연속 (단발 또는 간헐적)', '2대 연속 추정',
+                             '3대 연속 추정', '4대+ 연속 추정']
+        continuity_bins = np.minimum(runs['최대연속세대'].to_numpy(), 4) - 1
+        generation_continuity = dict(zip(
+            continuity_labels,
+            np.bincount(continuity_bins, minlength=len(continuity_labels)).tolist()))
+        
+        # 3대 이상 연속 가문 (데이터에 처음 나타난 순서)
+        appearance = self.combined_df['성관'][self.context.dated].unique().dropna()
+        continuous = runs[runs['최대연속세대'] >= 3].reindex(appearance).dropna(
+            subset=['연도확인수'])
+        first_years = continuous['최초년도'].astype(np.int64).astype(str)
+        last_years = continuous['최종년도'].astype(np.int64).astype(str)
+        continuous_families = pd.DataFrame({
+            '성관': continuous.index.astype(object),
+            '총급제자': continuous['연도확인수'].astype(np.int64).to_numpy(),
+            '최대연속세대': continuous['최대연속세대'].astype(np.int64).to_numpy(),
+            '기간': (first_years + '-' + last_years).to_numpy(),
+            '지속년수': (continuous['최종년도'] - continuous['최초년도']).astype(np.int64).to_numpy()
+        })
         
         # 결과 출력
         print("\n가문 규모별 분포:")
         for cat, count in categories.items():
-            pct = (count / len(family_history)) * 100
+            pct = (count / n_families) * 100
             print(f"  {cat:25s}: {count:4d}개 ({pct:5.1f}%)")
         
         print("\n세대 연속성 분포:")
         for gen, count in generation_continuity.items():
-            pct = (count / len(family_history)) * 100
+            pct = (count / n_families) * 100
             print(f"  {gen:30s}: {count:4d}개 ({pct:5.1f}%)")
         
         # 최상위 세과 가문
-        continuous_df = pd.DataFrame(continuous_families)
+        continuous_df = continuous_families
         if not continuous_df.empty:
             continuous_df = continuous_df.sort_values('총급제자', ascending=False)
             
@@ -539,34 +492,18 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         print("📊 분석 3: 시기별 혈연 영향력 변화 (시계열 분석)")
         print("="*70)
         
-        df = self.combined_df.copy()
-        df = df[df['시험년_int'].notna()]
-        
-        # 시대 구분 (더 세밀하게)
-        def categorize_period_detailed(year):
-            if year < 1450:
-                return '조선 초기 (1392-1449)'
-            elif year < 1550:
-                return '조선 전기 (1450-1549)'
-            elif year < 1650:
-                return '조선 중기 (1550-1649)'
-            elif year < 1750:
-                return '조선 후기 전반 (1650-1749)'
-            elif year < 1850:
-                return '조선 후기 후반 (1750-1849)'
-            else:
-                return '조선 말기 (1850-1910)'
-        
-        df['시대_상세'] = df['시험년_int'].apply(categorize_period_detailed)
+        # 시대 구분 (더 세밀하게, '조선 초기 (1392-1449)' 형태 라벨, 시험년 미상은 제외)
+        periods = get_scheme('6-era').span_labels()
+        df = self.context.with_columns('시대_상세')
+        cube = self.context.cube('시대_상세', '성관')
         
-        periods = [
-            '조선 초기 (1392-1449)',
-            '조선 전기 (1450-1549)',
-            '조선 중기 (1550-1649)',
-            '조선 후기 전반 (1650-1749)',
-            '조선 후기 후반 (1750-1849)',
-            '조선 말기 (1850-1910)'
-        ]
+        # 모든 시대의 집중도 지표를 한 번에 계산
+        period_metrics = inequality_by(df, '시대_상세')
+        if self.bootstrap_options['n_boot'] > 0:
+            gini_intervals = bootstrap_by(df, '시대_상세', **self.bootstrap_options).xs(
+                '지니계수', level='지표')
+        else:
+            gini_intervals = None
         
         print("\n[시대별 집중도 변화]")
         print("-" * 70)
@@ -574,23 +511,17 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         period_stats = []
         
         for period in periods:
-            period_data = df[df['시대_상세'] == period]
-            
-            if len(period_data) > 0:
-                family_counts = period_data['성관'].value_counts()
+            if period in period_metrics.index:
+                family_counts = cube.slice(시대_상세=period).ranked('성관')
+                metrics = period_metrics.loc[period]
+                n_passers = cube.count(시대_상세=period)
                 
-                # 상위 10% 집중도
-                n_top = max(1, int(len(family_counts) * 0.1))
-                top_concentration = (family_counts.head(n_top).sum() / len(period_data)) * 100
+                # 상위 10% 집중도 (시대 전체 급제자 대비)
+                top_concentration = (metrics['상위10%점유'] * metrics['급제자수']
+                                     / n_passers) * 100
                 
                 # 지니계수
-                sorted_counts = np.sort(family_counts.values)
-                n = len(sorted_counts)
-                cumsum = np.cumsum(sorted_counts)
-                lorenz_y = cumsum / cumsum[-1]
-                lorenz_x = np.arange(1, n + 1) / n
-                area = np.trapz(lorenz_y, lorenz_x)
-                gini = 1 - 2 * area
+                gini = metrics['지니계수']
                 
                 # 상위 5개 가문
                 top5 = family_counts.head(5)
@@ -599,19 +530,25 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
                 
                 period_stats.append({
                     '시대': period,
-                    '급제자수': len(period_data),
+                    '급제자수': n_passers,
                     '가문수': len(family_counts),
-                    '평균급제자per가문': len(period_data) / len(family_counts),
+                    '평균급제자per가문': n_passers / len(family_counts),
                     '상위10%집중도': top_concentration,
                     '지니계수': gini,
                     '상위5개가문': top5_names
                 })
+                if gini_intervals is not None:
+                    period_stats[-1]['지니계수_95%하한'] = gini_intervals.loc[period, '하한']
+                    period_stats[-1]['지니계수_95%상한'] = gini_intervals.loc[period, '상한']
                 
                 print(f"\n{period}")
-                print(f"  급제자: {len(period_data):5d}명 | 가문: {len(family_counts):3d}개")
-                print(f"  평균: {len(period_data)/len(family_counts):5.2f}명/가문")
+                print(f"  급제자: {n_passers:5d}명 | 가문: {len(family_counts):3d}개")
+                print(f"  평균: {n_passers/len(family_counts):5.2f}명/가문")
                 print(f"  상위10% 집중도: {top_concentration:5.2f}%")
                 print(f"  지니계수: {gini:.4f}")
+                if gini_intervals is not None:
+                    print(f"  지니계수 95% 신뢰구간: [{period_stats[-1]['지니계수_95%하한']:.4f}, "
+                          f"{period_stats[-1]['지니계수_95%상한']:.4f}]")
         
         period_df = pd.DataFrame(period_stats)
         
@@ -633,7 +570,19 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
             else:
                 print(f"  → 불평등 감소 추세")
         
+        # 회차(시험명 + 시험년) 단위 집중도 - 회차마다 명단이 따로 있으므로 시대 안에서 평균
+        session_df = self.context.sessions().concentration()
+        session_means = session_df.groupby('시대_상세', observed=True)[
+            ['급제자수', '지니계수', '반복성관수', '상위50성관점유']].mean()
+        print(f"\n[회차별 집중도 - 시대 평균 (회차 {len(session_df)}개)]")
+        print("-" * 70)
+        for period, row in session_means.iterrows():
+            print(f"{period:24s} 회차당 급제자 {row['급제자수']:5.1f}명 | "
+                  f"지니계수 {row['지니계수']:.4f} | 반복성관 {row['반복성관수']:.2f}개 | "
+                  f"상위50성관 {row['상위50성관점유'] * 100:5.1f}%")
+        
         self.analysis_results['period_stats'] = period_df
+        self.analysis_results['session_stats'] = session_df
         
         return period_df
     
@@ -661,6 +610,9 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         ax2 = plt.subplot(2, 3, 2)
         ax2.plot(x_pos, period_df['지니계수'], marker='s', linewidth=2.5,
                 markersize=8, color='crimson', label='지니계수')
+        if '지니계수_95%하한' in period_df.columns:
+            ax2.fill_between(x_pos, period_df['지니계수_95%하한'], period_df['지니계수_95%상한'],
+                             alpha=0.2, color='crimson', label='95% 신뢰구간')
         ax2.axhline(y=0.5, color='orange', linestyle='--', linewidth=1.5,
                    alpha=0.5, label='중간 불평등 기준선')
         ax2.axhline(y=0.7, color='red', linestyle='--', linewidth=1.5,
@@ -763,6 +715,83 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         
         return fig
     
+    # =========================================================================
+    # 분석 4: 동방(同榜) 성관 관계망
+    # =========================================================================
+    
+    def analyze_clan_network(self):
+        """같은 회차 동반 급제로 본 성관 관계망 (중심성, 공동체)"""
+        print("\n" + "="*70)
+        print("📊 분석 4: 동방(同榜) 성관 관계망 (네트워크 분석)")
+        print("="*70)
+        
+        # 네 과거의 모든 회차를 합친 성관 × 성관 희소 그래프
+        exam_types = [exam_type for exam_type in EXAM_TYPES if exam_type in self.data]
+        network = clan_network(self.data, exam_types)
+        communities = network.communities()
+        node_df = network.node_table(communities)
+        
+        n_nodes = len(network)
+        density = network.n_edges / (n_nodes * (n_nodes - 1) / 2) if n_nodes > 1 else 0
+        covered = [t for t in exam_types if network.coverage.loc[t, '반영수'] > 0]
+        print(f"\n대상 과거: {', '.join(covered)}")
+        excluded = [t for t in exam_types if t not in covered]
+        if excluded:
+            print(f"  성관/회차를 확인할 수 없어 제외된 과거: {', '.join(excluded)}")
+        print(f"연결 밀도: {density:.4f}")
+        print(f"공동체 수: {communities.max() + 1}개, 모듈성: {network.modularity(communities):.4f}")
+        
+        node_df = node_df.sort_values('페이지랭크', ascending=False, kind='stable')
+        print("\n[페이지랭크 상위 10개 성관]")
+        print("-" * 70)
+        for i, row in enumerate(node_df.head(10).itertuples(), 1):
+            print(f"{i:2d}. {row.Index:12s} 급제자 {row.급제자수:4d}명  "
+                  f"연결 {row.연결성관수:5d}개  페이지랭크 {row.페이지랭크:.5f}  "
+                  f"공동체 {row.공동체}")
+        
+        community_sizes = node_df['공동체'].value_counts().sort_index()
+        print("\n[주요 공동체]")
+        print("-" * 70)
+        for community, size in community_sizes.head(5).items():
+            leaders = node_df.index[node_df['공동체'] == community][:3]
+            print(f"공동체 {community}: 성관 {size}개 (중심: {', '.join(leaders)})")
+        
+        node_df = node_df.reset_index()
+        self.analysis_results['network'] = node_df
+        return node_df, community_sizes
+    
+    def visualize_clan_network(self, node_df, community_sizes):
+        """관계망 중심성/공동체 시각화"""
+        print("\n시각화 생성 중...")
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+        
+        # 1. 페이지랭크 상위 성관
+        top = node_df.head(15)
+        ax1.barh(range(len(top)), top['페이지랭크'], color='teal', alpha=0.8)
+        ax1.set_yticks(range(len(top)))
+        ax1.set_yticklabels(top['성관'])
+        ax1.invert_yaxis()
+        ax1.set_xlabel('페이지랭크', fontsize=11)
+        ax1.set_title('동방 관계망 중심 성관 (상위 15)', fontsize=13, fontweight='bold', pad=15)
+        ax1.grid(axis='x', alpha=0.3)
+        
+        # 2. 공동체 규모
+        sizes = community_sizes.head(10)
+        ax2.bar(range(len(sizes)), sizes.values, color='slateblue', alpha=0.8)
+        ax2.set_xticks(range(len(sizes)))
+        ax2.set_xticklabels([f'공동체 {c}' for c in sizes.index], rotation=45, ha='right')
+        ax2.set_ylabel('성관 수', fontsize=11)
+        ax2.set_title('공동체별 성관 수 (상위 10)', fontsize=13, fontweight='bold', pad=15)
+        ax2.grid(axis='y', alpha=0.3)
+        
+        plt.tight_layout()
+        filename = 'analysis4_clan_network.png'
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        print(f"✅ 저장: {filename}")
+        
+        return fig
+    
     # =========================================================================
     # 종합 리포트 생성
     # =========================================================================
@@ -787,6 +816,10 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         period_df = self.analyze_temporal_changes()
         fig3 = self.visualize_temporal_changes(period_df)
         
+        # 분석 4: 동방 관계망
+        network_df, community_sizes = self.analyze_clan_network()
+        fig4 = self.visualize_clan_network(network_df, community_sizes)
+        
         # CSV 저장
         print("\n" + "="*70)
         print("📄 결과 파일 저장")
@@ -804,6 +837,13 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         period_df.to_csv('분석3_시기별통계.csv', encoding='utf-8-sig', index=False)
         print("✅ 분석3_시기별통계.csv")
         
+        self.analysis_results['session_stats'].to_csv('분석3_회차별집중도.csv',
+                                                      encoding='utf-8-sig', index=False)
+        print("✅ 분석3_회차별집중도.csv")
+        
+        network_df.to_csv('분석4_성관관계망.csv', encoding='utf-8-sig', index=False)
+        print("✅ 분석4_성관관계망.csv")
+        
         # 최종 요약
         print("\n" + "="*70)
         print("✨ 종합 분석 완료")
@@ -813,31 +853,44 @@ class ComprehensiveKinshipAnalyzer(KinshipAnalyzer):
         print("     - analysis1_concentration.png")
         print("     - analysis2_generational_continuity.png")
         print("     - analysis3_temporal_changes.png")
+        print("     - analysis4_clan_network.png")
         print("\n  📄 CSV:")
         print("     - 분석1_파레토분석.csv")
         print("     - 분석2_세과가문.csv")
         print("     - 분석3_시기별통계.csv")
+        print("     - 분석3_회차별집중도.csv")
+        print("     - 분석4_성관관계망.csv")
         
         return {
             'concentration': (family_counts, lorenz_x, lorenz_y, gini),
             'continuity': (categories, continuity, continuous_df),
-            'temporal': period_df
+            'temporal': period_df,
+            'network': network_df
         }
 
 
-def main():
+def main(argv=None):
     """메인 실행 함수"""
+    arg_parser = argparse.ArgumentParser(description="조선시대 과거제 급제자 혈연관계 종합 분석")
+    add_loader_arguments(arg_parser)
+    arg_parser.add_argument('--bootstrap', type=int, default=1000,
+                            help='지니계수 신뢰구간 부트스트랩 복제 수, 0이면 생략 (기본: %(default)s)')
+    arg_parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                            help='부트스트랩 난수 시드 (기본: %(default)s)')
+    args = arg_parser.parse_args(argv)
+    
     print("="*70)
     print("  조선시대 과거제 급제자 혈연관계 종합 분석")
-    print("  4대 분석: 집중도, 세대연속성, 시기별변화, 혼인망")
+    print("  4대 분석: 집중도, 세대연속성, 시기별변화, 관계망")
     print("="*70)
     
     # 데이터 로딩
-    parser = KwagwaDataParser(".")
-    data = parser.load_all_data()
+    parser = KwagwaDataParser.from_args(args)
+    data = parser.load_all_data(columns=ComprehensiveKinshipAnalyzer.REQUIRED_COLUMNS)
     
     # 종합 분석
-    analyzer = ComprehensiveKinshipAnalyzer(data)
+    analyzer = ComprehensiveKinshipAnalyzer(data, n_bootstrap=args.bootstrap, seed=args.seed,
+                                            workers=args.workers)
     results = analyzer.generate_comprehensive_report()
     
     print("\n" + "="*70)
@@ -0,0 +1,201 @@
+"""
+세과(世科) 연속 세대 탐지 (구간별 런 길이 계산)
+
+(구간 번호, 시험년) 순으로 정렬된 배열 전체에서 np.diff로 이웃 급제자의 연도 간격을 구하고,
+같은 구간 안에서 간격이 세대 간격(기본 20~40년)이면 앞 급제자와 이어진 것으로 본다.
+이어지지 않는 지점마다 새 런을 시작하므로 런 길이는 런 시작 위치의 np.diff 한 번으로,
+구간별 최대 런은 np.maximum.reduceat 한 번으로 얻는다. 구간은 성관 하나일 수도, (순열 복제, 성관) 쌍일 수도 있어
+여러 복제를 한 배열에 붙여 한 번에 계산할 수 있다.
+
+clan_runs는 전처리 DataFrame 전체를 (성관 코드, 시험년)으로 한 번 정렬하여
+모든 성관의 최대 연속 세대 수와 그 런의 시작/종료 연도를 한 번에 구한다.
+
+sweep_thresholds는 정렬과 연도 간격 계산을 한 번만 하고, (최소간격, 최대간격) 격자 칸마다
+연결 여부만 (칸 × 급제자) 불리언 행렬로 바꿔 모든 칸의 런을 한 배열에서 계산한다.
+최소 세대 수 기준은 칸별 최대 런 히스토그램의 누적합에서 바로 읽는다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes
+
+# 세대 간격으로 보는 연도 차 (양 끝 포함)
+GEN_GAP_MIN = 20
+GEN_GAP_MAX = 40
+
+# 민감도 분석 기본 격자 (20 × 20, 기본값 20/40 포함)
+GAP_MIN_GRID = range(10, 30)
+GAP_MAX_GRID = range(30, 50)
+
+# 민감도 분석에서 한 번에 처리하는 (격자 칸 × 급제자) 원소 수 상한
+SWEEP_BATCH_CELLS = 4_000_000
+
+
+def segment_max_runs(segments, years, n_segments=None,
+                     gap_min=GEN_GAP_MIN, gap_max=GEN_GAP_MAX):
+    """구간별 최대 연속 세대 수
+
+    Args:
+        segments: 구간 번호 배열 (오름차순 정렬)
+        years: 시험년 배열 (같은 구간 안에서 오름차순 정렬)
+        n_segments: 구간 수 (생략 시 max(segments) + 1)
+        gap_min, gap_max: 세대 간격으로 보는 연도 차
+
+    Returns:
+        길이 n_segments 정수 배열 (급제자가 없는 구간은 0, 있으면 1 이상)
+    """
+    segments = np.asarray(segments, dtype=np.int64)
+    if n_segments is None:
+        n_segments = int(segments.max()) + 1 if len(segments) else 0
+    max_runs = np.zeros(n_segments, dtype=np.int64)
+    if len(segments) == 0:
+        return max_runs
+
+    _, run_lengths, run_segments = _runs(segments, years, gap_min, gap_max)
+    _fill_max_runs(max_runs, run_lengths, run_segments)
+    return max_runs
+
+
+def _runs(segments, years, gap_min, gap_max):
+    """정렬된 (구간, 연도) 배열 → 런별 (시작 위치, 길이, 구간 번호)"""
+    gaps = np.diff(np.asarray(years, dtype=np.float64))
+    linked = np.zeros(len(segments), dtype=bool)
+    linked[1:] = (segments[1:] == segments[:-1]) & (gaps >= gap_min) & (gaps <= gap_max)
+    return _runs_from_links(linked, segments)
+
+
+def _runs_from_links(linked, segments):
+    """앞 원소와 이어졌는지 여부 배열 → 런별 (시작 위치, 길이, 구간 번호)"""
+    # 이어지지 않는 지점이 런의 시작
+    run_starts = np.flatnonzero(~linked)
+    run_lengths = np.diff(np.append(run_starts, len(segments)))
+    return run_starts, run_lengths, segments[run_starts]
+
+
+def _fill_max_runs(max_runs, run_lengths, run_segments):
+    """런도 구간 순으로 놓여 있으므로 구간 경계에서 reduceat으로 구간별 최대 런 길이"""
+    first = np.flatnonzero(np.r_[True, run_segments[1:] != run_segments[:-1]])
+    max_runs[run_segments[first]] = np.maximum.reduceat(run_lengths, first)
+
+
+def sorted_clan_years(df, family='성관', year_column='시험년_int'):
+    """성관 코드와 시험년이 모두 있는 행의 (성관 코드, 시험년) 배열, 그 순서로 정렬"""
+    clans = codes(df[family]).astype(np.int64)
+    years = df[year_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (clans >= 0) & ~np.isnan(years)
+    clans, years = clans[valid], years[valid]
+    order = np.lexsort((years, clans))
+    return clans[order], years[order]
+
+
+def clan_runs(df, family='성관', year_column='시험년_int',
+              gap_min=GEN_GAP_MIN, gap_max=GEN_GAP_MAX):
+    """성관별 급제 연속성 표 (성관 코드 순)
+
+    Returns:
+        DataFrame: 성관 인덱스, 컬럼
+            급제자수        - 전체 급제자 수 (시험년 미상 포함)
+            연도확인수      - 시험년이 있는 급제자 수
+            최초년도/최종년도 - 첫/마지막 급제 연도
+            최대연속세대     - 세대 간격으로 이어진 최장 런의 급제자 수
+            연속시작년도/연속종료년도 - 최장 런(같은 길이면 가장 이른 런)의 첫/마지막 연도
+        시험년이 있는 급제자가 없는 성관은 연도 컬럼이 NaN, 최대연속세대가 0이다.
+    """
+    labels = df[family].cat.categories
+    n_clans = len(labels)
+    family_codes = codes(df[family])
+    total = np.bincount(family_codes[family_codes >= 0], minlength=n_clans)
+
+    clans, years = sorted_clan_years(df, family, year_column)
+    dated = np.bincount(clans, minlength=n_clans)
+    first_year = np.full(n_clans, np.nan)
+    last_year = np.full(n_clans, np.nan)
+    run_first = np.full(n_clans, np.nan)
+    run_last = np.full(n_clans, np.nan)
+    max_runs = np.zeros(n_clans, dtype=np.int64)
+
+    if len(clans):
+        # 구간 경계: 정렬되어 있으므로 성관 첫 행/마지막 행이 최초/최종 연도
+        starts = np.flatnonzero(np.r_[True, clans[1:] != clans[:-1]])
+        ends = np.r_[starts[1:], len(clans)] - 1
+        first_year[clans[starts]] = years[starts]
+        last_year[clans[starts]] = years[ends]
+
+        run_starts, run_lengths, run_segments = _runs(clans, years, gap_min, gap_max)
+        _fill_max_runs(max_runs, run_lengths, run_segments)
+
+        # 성관별 최장 런 중 가장 이른 것
+        longest = np.flatnonzero(run_lengths == max_runs[run_segments])
+        _, pick = np.unique(run_segments[longest], return_index=True)
+        longest = longest[pick]
+        run_first[run_segments[longest]] = years[run_starts[longest]]
+        run_last[run_segments[longest]] = years[run_starts[longest] + run_lengths[longest] - 1]
+
+    return pd.DataFrame({
+        '급제자수': total,
+        '연도확인수': dated,
+        '최초년도': first_year,
+        '최종년도': last_year,
+        '최대연속세대': max_runs,
+        '연속시작년도': run_first,
+        '연속종료년도': run_last
+    }, index=pd.Index(labels, name=family))
+
+
+def sweep_thresholds(df, gap_mins=GAP_MIN_GRID, gap_maxs=GAP_MAX_GRID, min_generations=(2, 3, 4),
+                     family='성관', year_column='시험년_int'):
+    """세대 간격 기준 격자별 세과 가문 수 (민감도 분석)
+
+    Args:
+        df: 전처리 DataFrame
+        gap_mins, gap_maxs: 세대 간격 하한/상한 후보 (하한 > 상한인 조합은 제외)
+        min_generations: 세과로 볼 최소 연속 세대 수 후보
+
+    Returns:
+        DataFrame: 최소간격/최대간격/최소세대/세과가문수 컬럼 (격자 칸마다 한 행)
+    """
+    clans, years = sorted_clan_years(df, family, year_column)
+    _, clans = np.unique(clans, return_inverse=True)
+    n_clans = int(clans.max()) + 1 if len(clans) else 0
+
+    cells = np.array([(lo, hi) for lo in gap_mins for hi in gap_maxs if lo <= hi],
+                     dtype=np.float64).reshape(-1, 2)
+    generations = np.asarray(min_generations, dtype=np.int64)
+
+    # 어느 칸에서도 이어질 수 없는 급제자는 모든 칸에서 길이 1 런이므로 미리 제외하고,
+    # 가장 넓은 칸에서 앞/뒤와 이어질 수 있는 급제자만 남긴다 (성관 최소값 1은 나중에 반영)
+    gaps = np.r_[np.inf, np.diff(years)]
+    can_link = np.r_[False, clans[1:] == clans[:-1]]
+    if len(cells):
+        can_link &= (gaps >= cells[:, 0].min()) & (gaps <= cells[:, 1].max())
+    chain = can_link | np.r_[can_link[1:], False]
+    clans, gaps, can_link = clans[chain], gaps[chain], can_link[chain]
+    batch = max(1, SWEEP_BATCH_CELLS // max(len(clans), 1))
+
+    counts = []
+    for start in range(0, len(cells), batch):
+        lo, hi = cells[start:start + batch, :1], cells[start:start + batch, 1:]
+        n_cells = len(lo)
+        linked = can_link & (gaps >= lo) & (gaps <= hi)
+        segments = (np.arange(n_cells) * n_clans)[:, None] + clans
+
+        max_runs = np.ones(n_cells * n_clans, dtype=np.int64)
+        if len(clans):
+            _, run_lengths, run_segments = _runs_from_links(linked.ravel(), segments.ravel())
+            _fill_max_runs(max_runs, run_lengths, run_segments)
+
+        # 칸별 최대 런 히스토그램 → 뒤에서부터 누적하면 "최대 런 ≥ g인 성관 수"
+        width = max(int(max_runs.max(initial=0)), int(generations.max(initial=0))) + 1
+        offsets = np.repeat(np.arange(n_cells) * width, n_clans)
+        hist = np.bincount(max_runs + offsets, minlength=n_cells * width).reshape(n_cells, width)
+        at_least = np.cumsum(hist[:, ::-1], axis=1)[:, ::-1]
+        counts.append(at_least[:, generations])
+
+    counts = np.concatenate(counts) if counts else np.zeros((0, len(generations)), np.int64)
+    return pd.DataFrame({
+        '최소간격': np.repeat(cells[:, 0], len(generations)).astype(np.int64),
+        '최대간격': np.repeat(cells[:, 1], len(generations)).astype(np.int64),
+        '최소세대': np.tile(generations, len(cells)),
+        '세과가문수': counts.ravel()
+    })
@@ -0,0 +1,169 @@
+"""
+급제자 수 다차원 집계 큐브 (성관 × 시대 × 지역 × 등급 × 과거구분 등)
+
+인코딩(범주형) 차원들의 코드를 np.ravel_multi_index로 한 칸 번호로 묶고 np.bincount 한 번으로
+모든 칸의 급제자 수를 센다. 이후 보고서의 조각 조회는 전체 DataFrame을 다시 마스킹하지 않고
+배열 인덱싱/합계로 처리한다.
+
+- count  : 좌표 하나의 급제자 수
+- slice  : 일부 차원을 한 값으로 고정 (그 차원은 사라짐)
+- dice   : 일부 차원을 값 목록으로 제한 (목록 순서대로, 없는 값은 0)
+- rollup : 지정한 차원만 남기고 나머지를 합산
+- ranked : 한 차원의 값별 급제자 수 내림차순 (동률은 데이터에 처음 나타난 순서,
+           dictionary_encoding.count_codes와 같은 규칙)
+
+각 차원 끝에는 결측(코드 -1) 칸이 하나 더 있어, rollup으로 합산한 값은 다른 차원의 결측
+행까지 포함한 실제 행 수와 같다. 결측 칸은 라벨 조회/출력에는 나타나지 않는다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes
+
+
+class CountCube:
+    """인코딩된 차원별 급제자 수 N차원 배열"""
+
+    def __init__(self, counts, first_seen, axes):
+        """
+        Args:
+            counts: 칸별 급제자 수 (각 차원 길이 = 라벨 수 + 결측 칸 1)
+            first_seen: 칸별 처음 나타난 행 번호 (빈 칸은 그보다 큰 값)
+            axes: [(차원 이름, 라벨 Index), ...]
+        """
+        self.counts = counts
+        self.first_seen = first_seen
+        self.axes = list(axes)
+
+    @classmethod
+    def from_frame(cls, df, dims):
+        """DataFrame의 범주형(인코딩) 컬럼들로 큐브 생성
+
+        Args:
+            df: 전처리 DataFrame
+            dims: 차원으로 쓸 컬럼 이름 목록 (범주형이 아니면 범주형으로 변환)
+        """
+        axes = []
+        flat_codes = []
+        for dim in dims:
+            column = df[dim]
+            if not isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype('category')
+            labels = column.cat.categories
+            dim_codes = codes(column).astype(np.int64)
+            dim_codes[dim_codes < 0] = len(labels)
+            axes.append((dim, labels))
+            flat_codes.append(dim_codes)
+
+        shape = tuple(len(labels) + 1 for _, labels in axes)
+        size = int(np.prod(shape))
+        flat = np.ravel_multi_index(flat_codes, shape)
+        counts = np.bincount(flat, minlength=size).reshape(shape)
+
+        first_seen = np.full(size, len(df), dtype=np.int64)
+        cells, first_rows = np.unique(flat, return_index=True)
+        first_seen[cells] = first_rows
+        return cls(counts, first_seen.reshape(shape), axes)
+
+    @property
+    def dims(self):
+        return [name for name, _ in self.axes]
+
+    def labels(self, dim):
+        """차원의 라벨 Index"""
+        return self.axes[self._axis(dim)][1]
+
+    def _axis(self, dim):
+        return self.dims.index(dim)
+
+    def _position(self, dim, label):
+        position = self.labels(dim).get_indexer([label])[0]
+        if position < 0:
+            raise KeyError(f"{dim}에 {label!r} 값이 없습니다")
+        return position
+
+    def count(self, **coords):
+        """좌표의 급제자 수 (지정하지 않은 차원은 합산)"""
+        return int(self.slice(**coords).counts.sum())
+
+    def slice(self, **coords):
+        """지정 차원을 한 값으로 고정한 큐브 (고정한 차원은 제거)"""
+        index = [slice(None)] * len(self.axes)
+        for dim, label in coords.items():
+            index[self._axis(dim)] = self._position(dim, label)
+        index = tuple(index)
+        axes = [axis for axis in self.axes if axis[0] not in coords]
+        return CountCube(self.counts[index], self.first_seen[index], axes)
+
+    def dice(self, **subsets):
+        """지정 차원을 값 목록으로 제한한 큐브 (목록 순서, 없는 값과 결측 칸은 0)"""
+        counts, first_seen = self.counts, self.first_seen
+        axes = list(self.axes)
+        empty = np.iinfo(np.int64).max
+        for dim, values in subsets.items():
+            axis = self._axis(dim)
+            labels = self.labels(dim)
+            positions = labels.get_indexer(list(values))
+
+            # 끝에 0 칸을 하나 붙이고, 없는 값과 새 결측 칸은 그 칸을 가리킨다
+            pad = [(0, 0)] * counts.ndim
+            pad[axis] = (0, 1)
+            counts = np.pad(counts, pad)
+            first_seen = np.pad(first_seen, pad, constant_values=empty)
+            zero = counts.shape[axis] - 1
+            positions = np.append(np.where(positions < 0, zero, positions), zero)
+            counts = np.take(counts, positions, axis=axis)
+            first_seen = np.take(first_seen, positions, axis=axis)
+            axes[axis] = (dim, pd.Index(list(values), name=labels.name))
+        return CountCube(counts, first_seen, axes)
+
+    def rollup(self, *dims):
+        """지정한 차원만 남기고 나머지 차원(결측 칸 포함)을 합산한 큐브"""
+        drop = tuple(i for i, name in enumerate(self.dims) if name not in dims)
+        keep = [self._axis(dim) for dim in dims]
+        counts = self.counts.sum(axis=drop)
+        first_seen = self.first_seen.min(axis=drop, initial=np.iinfo(np.int64).max)
+
+        # 요청한 순서로 축 재배치
+        order = np.argsort(np.argsort(keep))
+        counts = np.transpose(counts, order)
+        first_seen = np.transpose(first_seen, order)
+        return CountCube(counts, first_seen, [self.axes[i] for i in keep])
+
+    @property
+    def array(self):
+        """결측 칸을 뺀 급제자 수 배열"""
+        return self.counts[tuple(slice(0, len(labels)) for _, labels in self.axes)]
+
+    def to_series(self, name='급제자수'):
+        """(라벨 MultiIndex) → 급제자 수 Series (결측 칸 제외, 0 포함)"""
+        if len(self.axes) == 1:
+            index = pd.Index(self.axes[0][1], name=self.axes[0][0])
+        else:
+            index = pd.MultiIndex.from_product([labels for _, labels in self.axes],
+                                               names=self.dims)
+        return pd.Series(self.array.ravel(), index=index, name=name)
+
+    def table(self, rows, columns):
+        """두 차원 교차표 DataFrame (나머지 차원 합산)"""
+        cube = self.rollup(rows, columns)
+        return pd.DataFrame(cube.array,
+                            index=pd.Index(cube.labels(rows), name=rows),
+                            columns=pd.Index(cube.labels(columns), name=columns))
+
+    def ranked(self, dim, exclude=(), name='count'):
+        """차원 값별 급제자 수 내림차순 Series (0 제외, 동률은 처음 나타난 순서)"""
+        cube = self.rollup(dim)
+        labels = cube.labels(dim)
+        counts = cube.array
+        first_seen = cube.first_seen[:len(labels)]
+        keep = (counts > 0) & ~labels.isin(list(exclude))
+        order = np.lexsort((first_seen[keep], -counts[keep]))
+        return pd.Series(counts[keep][order], index=pd.Index(labels[keep][order], name=dim),
+                         name=name)
+
+    def __repr__(self):
+        shape = ' × '.join(f"{dim}({len(labels)})" for dim, labels in self.axes)
+        return f"CountCube({shape}, 급제자 {int(self.counts.sum())}명)"
+
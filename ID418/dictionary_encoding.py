@@ -0,0 +1,90 @@
+"""
+성관/본관/거주지/성씨 사전 인코딩
+
+반복되는 문자열 컬럼을 조밀한 정수 코드 + 역변환 표(categories)로 표현하는 Categorical로 바꾸고,
+집계는 코드에 대한 np.bincount로, 필터는 코드 비교로 처리한다.
+문자열은 출력/저장할 때만 코드 표에서 꺼낸다.
+
+- encode_column: 값 → Categorical (코드 표는 값의 사전순, groupby 순서가 문자열 컬럼과 같음)
+- encode_pair  : 두 인코딩 컬럼의 조합(예: 성씨 + 본관 → 성관)을 코드 쌍으로 인코딩하고,
+                 조합 문자열은 고유 조합에 대해서만 만든다
+- count_codes  : value_counts 대체 (bincount, 동률은 데이터에 처음 나온 순서)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def codes(series):
+    """인코딩 컬럼의 int32 코드 배열 (결측은 -1)"""
+    return series.cat.codes.to_numpy().astype(np.int32, copy=False)
+
+
+def encode_column(values):
+    """값 → 사전순으로 코드를 매긴 Categorical
+
+    이미 Categorical이면 사용되지 않는 코드만 제거하고 기존 코드 순서를 유지한다.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.remove_unused_categories().array
+    value_codes, uniques = pd.factorize(values, sort=True, use_na_sentinel=True)
+    return pd.Categorical.from_codes(value_codes.astype(np.int32), uniques)
+
+
+def encode_pair(left, right, sep=' '):
+    """두 인코딩 컬럼의 조합 → Categorical (어느 한쪽이 결측이면 결측)
+
+    조합 키는 left_code * len(right 코드 표) + right_code 정수로 만들고,
+    'left{sep}right' 문자열은 실제로 나타난 고유 조합에 대해서만 생성한다.
+    """
+    left_codes = codes(left).astype(np.int64)
+    right_codes = codes(right).astype(np.int64)
+    n_right = len(right.cat.categories)
+
+    valid = (left_codes >= 0) & (right_codes >= 0)
+    keys = np.where(valid, left_codes * n_right + right_codes, -1)
+    pair_codes, uniques = pd.factorize(keys)
+    pair_codes = pair_codes.astype(np.int32)
+
+    # -1(결측) 키가 고유값에 끼어 있으면 제거하고 뒤 코드를 당김
+    missing = np.flatnonzero(uniques == -1)
+    if len(missing):
+        hole = missing[0]
+        uniques = np.delete(uniques, hole)
+        pair_codes = np.where(pair_codes == hole, -1,
+                              pair_codes - (pair_codes > hole)).astype(np.int32)
+
+    left_values = np.asarray(left.cat.categories, dtype=object)[uniques // n_right]
+    right_values = np.asarray(right.cat.categories, dtype=object)[uniques % n_right]
+    labels = left_values + sep + right_values
+
+    # 코드 표를 조합 문자열의 사전순으로 재배열
+    order = np.argsort(labels, kind='stable')
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    pair_codes = np.where(pair_codes >= 0, rank[pair_codes], -1).astype(np.int32)
+    labels = pd.Index(labels[order], dtype=left.cat.categories.dtype)
+    return pd.Categorical.from_codes(pair_codes, labels)
+
+
+def code_counts(series):
+    """코드별 개수 배열 (길이 = 코드 표 크기)"""
+    series_codes = codes(series)
+    return np.bincount(series_codes[series_codes >= 0],
+                       minlength=len(series.cat.categories))
+
+
+def count_codes(series, name='count'):
+    """value_counts 대체: 코드 bincount를 개수 내림차순으로 정렬하고 0개 항목은 제외
+
+    동률은 데이터에 처음 나온 순서로 정렬하므로 문자열 컬럼의 value_counts와 같은 순서가 된다.
+    """
+    series_codes = codes(series)
+    valid = np.flatnonzero(series_codes >= 0)
+    counts = np.bincount(series_codes[valid], minlength=len(series.cat.categories))
+    first = np.full(len(counts), len(series_codes), dtype=np.int64)
+    np.minimum.at(first, series_codes[valid], valid)
+    order = np.lexsort((first, -counts))
+    order = order[counts[order] > 0]
+    index = pd.Index(series.cat.categories.take(order), name=series.name)
+    return pd.Series(counts[order], index=index, name=name)
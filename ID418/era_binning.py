@@ -0,0 +1,110 @@
+"""
+시험년 → 시대 구분
+
+분석마다 따로 있던 연도 → 시대 분류 함수를 이름 있는 구분 방식(scheme) 하나로 통합한다.
+각 방식은 경계 연도(breaks)와 시대 이름(labels)으로 정의되고,
+np.searchsorted로 한 번에 분류하여 순서형 Categorical(시대 순서)로 돌려준다.
+
+- '3-era' : 조선 전기/중기/후기 (1494 성종 25년, 1608 선조 41년 기준)
+- '6-era' : 조선 초기 ~ 말기 (1450, 1550, 1650, 1750, 1850 기준)
+- 'reign' : 왕대 (즉위년 기준, 즉위년 전체를 새 왕대로 봄)
+- 'decade': 10년 단위
+- custom_scheme(breaks, labels): 임의 경계
+
+era_column(df, scheme)은 전처리 DataFrame별로 결과를 캐시하므로
+같은 방식의 시대 구분은 프로세스 안에서 한 번만 계산된다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prepared_store import derived_column
+
+# 조선 왕조 연도 범위 (상세 라벨용)
+JOSEON_START = 1392
+JOSEON_END = 1910
+
+# 왕대별 즉위년
+REIGNS = (
+    ('태조', 1392), ('정종', 1398), ('태종', 1400), ('세종', 1418), ('문종', 1450),
+    ('단종', 1452), ('세조', 1455), ('예종', 1468), ('성종', 1469), ('연산군', 1494),
+    ('중종', 1506), ('인종', 1544), ('명종', 1545), ('선조', 1567), ('광해군', 1608),
+    ('인조', 1623), ('효종', 1649), ('현종', 1659), ('숙종', 1674), ('경종', 1720),
+    ('영조', 1724), ('정조', 1776), ('순조', 1800), ('헌종', 1834), ('철종', 1849),
+    ('고종', 1863), ('순종', 1907)
+)
+
+
+class EraScheme:
+    """시대 구분 방식: labels[i]는 breaks[i-1] <= 연도 < breaks[i] 구간"""
+
+    def __init__(self, name, breaks, labels, start=JOSEON_START, end=JOSEON_END):
+        if len(labels) != len(breaks) + 1:
+            raise ValueError(f"시대 이름은 경계 수 + 1개여야 합니다: {name}")
+        self.name = name
+        self.breaks = np.asarray(breaks, dtype='float64')
+        self.labels = list(labels)
+        self.start = start
+        self.end = end
+
+    def bin(self, years, unknown=None):
+        """연도 배열 → 순서형 Categorical (연도 결측은 unknown, None이면 결측)"""
+        years = np.asarray(years, dtype='float64')
+        codes = np.searchsorted(self.breaks, years, side='right')
+        codes[np.isnan(years)] = -1
+        labels = self.labels
+        if unknown is not None:
+            labels = labels + [unknown]
+            codes[codes == -1] = len(labels) - 1
+        return pd.Categorical.from_codes(codes, labels, ordered=True)
+
+    def span_labels(self):
+        """'이름 (시작-끝)' 형태 라벨 (예: '조선 초기 (1392-1449)')"""
+        bounds = [self.start] + [int(b) for b in self.breaks] + [self.end + 1]
+        return [f"{label} ({lo}-{hi - 1})"
+                for label, lo, hi in zip(self.labels, bounds[:-1], bounds[1:])]
+
+    def __repr__(self):
+        return f"EraScheme({self.name}, {len(self.labels)}개 시대)"
+
+
+def custom_scheme(breaks, labels, name='custom'):
+    """임의 경계 연도로 시대 구분 방식 생성"""
+    return EraScheme(name, breaks, labels)
+
+
+def _decade_scheme():
+    decades = list(range(JOSEON_START // 10 * 10, JOSEON_END + 1, 10))
+    return EraScheme('decade', decades[1:], [f"{d}년대" for d in decades])
+
+
+SCHEMES = {
+    '3-era': EraScheme('3-era', [1494, 1608], ['조선 전기', '조선 중기', '조선 후기']),
+    '6-era': EraScheme('6-era', [1450, 1550, 1650, 1750, 1850],
+                       ['조선 초기', '조선 전기', '조선 중기',
+                        '조선 후기 전반', '조선 후기 후반', '조선 말기']),
+    'reign': EraScheme('reign', [year for _, year in REIGNS[1:]],
+                       [name for name, _ in REIGNS]),
+    'decade': _decade_scheme()
+}
+
+
+def get_scheme(scheme):
+    """이름 또는 EraScheme → EraScheme"""
+    if isinstance(scheme, EraScheme):
+        return scheme
+    if scheme not in SCHEMES:
+        raise ValueError(f"알 수 없는 시대 구분: {scheme} (사용 가능: {', '.join(SCHEMES)})")
+    return SCHEMES[scheme]
+
+
+def era_column(df, scheme='3-era', unknown=None, year_column='시험년_int'):
+    """전처리 DataFrame의 시대 구분 Series (DataFrame·방식별로 캐시)"""
+    scheme = get_scheme(scheme)
+
+    def build(frame):
+        eras = scheme.bin(frame[year_column].to_numpy(dtype='float64', na_value=np.nan),
+                          unknown)
+        return pd.Series(eras, index=frame.index, name='시대')
+
+    return derived_column(df, ('era', scheme.name, id(scheme), unknown, year_column), build)
@@ -0,0 +1,116 @@
+"""
+과거 종류별 XML 필드 스키마
+
+각 필드는 (컬럼명, XML 태그, 목표 dtype)으로 정의한다.
+- 'Int32'   : 시험년/생년/등위처럼 숫자로 쓰이는 필드 (빈 값 → <NA>)
+- 'category': 본관/거주지/왕대/등급처럼 반복 값이 많은 필드
+- 'string'  : 이름/자/호처럼 대부분 고유한 필드
+문자열/범주 필드의 빈 값은 기존 파서와 같이 "" 로 유지한다.
+
+태그명과 컬럼명이 다른 경우 field(..., tag='원본태그')로 별칭을 지정한다.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+FieldSpec = namedtuple('FieldSpec', ['name', 'tag', 'dtype'])
+
+INT = 'Int32'
+CATEGORY = 'category'
+STRING = 'string'
+
+
+def field(name, dtype=STRING, tag=None):
+    """스키마 필드 정의 (tag 생략 시 컬럼명과 동일)"""
+    return FieldSpec(name, tag or name, dtype)
+
+
+MUNGWA_SCHEMA = (
+    field('ID'),
+    field('시험명', CATEGORY),
+    field('왕대', CATEGORY),
+    field('왕력', CATEGORY),
+    field('간지', CATEGORY),
+    field('시험년', INT),
+    field('급제자'),
+    field('자'),
+    field('호'),
+    field('시호'),
+    field('생년', INT),
+    field('졸년', INT),
+    field('본관', CATEGORY),
+    field('등급', CATEGORY),
+    field('등위', INT),
+    field('거주지', CATEGORY),
+    field('시험유형', CATEGORY),
+)
+
+# 무과 데이터는 값이 한 칸씩 앞 태그에 들어 있다
+# (시험년 태그 → 이름, 본관 태그 → 등급, 등급 태그 → 등위, 등위 태그 → 거주지 등 모두 같은 규칙)
+# 각 필드를 실제 값이 들어 있는 태그에 별칭으로 연결하여 다른 과거와 같은 컬럼명으로 읽는다.
+# 시험구분 태그에는 왕대가 들어 있으므로 무과에는 시험구분(회차 종류) 컬럼이 없다.
+MUGWA_SCHEMA = (
+    field('왕대', CATEGORY, tag='시험구분'),
+    field('왕년', CATEGORY, tag='왕대'),
+    field('시험년', INT, tag='왕년'),
+    field('급제자', tag='시험년'),
+    field('호', tag='급제자'),
+    field('생년', INT, tag='호'),
+    field('몰년', INT, tag='생년'),
+    field('본관', CATEGORY, tag='몰년'),
+    field('등급', CATEGORY, tag='본관'),
+    field('등위', INT, tag='등급'),
+    field('거주지', CATEGORY, tag='등위'),
+    field('전력', tag='거주지'),
+    field('부명', tag='전력'),
+)
+
+SAMASI_SCHEMA = tuple(f for f in MUNGWA_SCHEMA if f.name != '시호')
+
+JAPGWA_SCHEMA = SAMASI_SCHEMA
+
+EXAM_SCHEMAS = {
+    '문과': MUNGWA_SCHEMA,
+    '무과': MUGWA_SCHEMA,
+    '사마시': SAMASI_SCHEMA,
+    '잡과': JAPGWA_SCHEMA
+}
+
+
+def schema_tags(schema):
+    """스키마가 읽어야 하는 XML 태그 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(f.tag for f in schema))
+
+
+def project_schema(schema, columns=None):
+    """필요한 컬럼만 남긴 스키마 (columns가 None이면 전체, 스키마에 없는 컬럼은 무시)"""
+    if columns is None:
+        return schema
+    wanted = set(columns)
+    return tuple(f for f in schema if f.name in wanted)
+
+
+def schema_signature(schema):
+    """캐시 호환성 판정용 문자열"""
+    return '|'.join(f"{f.name}:{f.tag}:{f.dtype}" for f in schema)
+
+
+def _convert(values, dtype):
+    """태그 텍스트 리스트 → 목표 dtype 배열"""
+    if dtype == INT:
+        numbers = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+        numbers = numbers.where(numbers == np.floor(numbers))
+        return numbers.astype(INT).array
+    if dtype == CATEGORY:
+        return pd.Categorical(values)
+    return pd.array(values, dtype=dtype)
+
+
+def build_frame(schema, columns, exam_type):
+    """태그별 컬럼 버퍼 → 스키마 dtype이 적용된 DataFrame"""
+    data = {f.name: _convert(columns[f.tag], f.dtype) for f in schema}
+    n_rows = len(next(iter(data.values()))) if data else 0
+    data['과거구분'] = pd.Categorical.from_codes(np.zeros(n_rows, dtype=np.int8), [exam_type])
+    return pd.DataFrame(data)
@@ -0,0 +1,144 @@
+"""
+파싱된 과거 DataFrame의 영구 컬럼 캐시
+
+원본 XML(배포판별 덤프)은 실행 간에 바뀌지 않으므로 한 번 파싱한 결과를
+컬럼별 .npy 파일(frame_codec의 배열 쌍)로 저장해 두고, 이후에는 요청된 컬럼의 파일만 읽는다.
+(읽은 배열은 unpack_frame이 Categorical/IntegerArray로 바꾸므로 memory-map은 쓰지 않는다.)
+
+캐시 항목은 원본 파일의 경로, 크기, 수정 시각(mtime), 내용 해시(SHA-256)로 식별한다.
+크기와 mtime이 그대로면 저장된 해시를 신뢰하고, mtime만 바뀐 경우(touch 등)에는
+내용 해시를 다시 계산해 실제로 내용이 같을 때만 캐시를 재사용한다.
+원본 파일이 없으면(이전 배포판 XML을 지운 경우 등) 저장된 meta를 그대로 신뢰한다.
+
+컬럼 투영 파싱 결과를 저장할 때는 같은 원본의 유효한 항목에 있던 다른 컬럼을 합쳐 기록하므로,
+서로 다른 컬럼 조합을 요청하는 호출이 번갈아 와도 캐시 항목을 서로 밀어내지 않는다.
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from frame_codec import pack_frame, unpack_frame
+
+# 캐시 형식이나 파서 출력이 바뀌면 올려서 기존 캐시를 모두 무효화
+CACHE_VERSION = 2
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FrameCache:
+    """과거 종류별 파싱 결과 캐시"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _entry_dir(self, exam_type, source_path):
+        """원본 경로별 캐시 디렉터리 (같은 과거라도 경로가 다르면 별도 항목)"""
+        resolved = str(Path(source_path).resolve())
+        path_key = hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:12]
+        return self.cache_dir / f"{exam_type}-{path_key}"
+
+    def _read_meta(self, entry):
+        meta_path = entry / 'meta.json'
+        if not meta_path.exists():
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, entry, meta):
+        with open(entry / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def load(self, exam_type, source_path, variant, columns=None):
+        """유효한 캐시가 있으면 DataFrame 반환, 없으면 None
+        
+        columns를 주면 해당 컬럼 파일만 columns 순서로 읽는다. 캐시에 없는 컬럼이 하나라도 있으면 None.
+        """
+        entry = self._entry_dir(exam_type, source_path)
+        meta = self._read_meta(entry)
+        if meta is None:
+            return None
+        if meta['version'] != CACHE_VERSION or meta['variant'] != variant:
+            return None
+        cached_names = [name for name, _, _ in meta['columns']]
+        if columns is not None and not set(columns) <= set(cached_names):
+            return None
+
+        source_path = Path(source_path)
+        if source_path.exists():
+            stat = source_path.stat()
+            if meta['size'] != stat.st_size:
+                return None
+            if meta['mtime_ns'] != stat.st_mtime_ns:
+                # 수정 시각만 바뀐 경우: 내용이 같으면 캐시 유지
+                if file_sha256(source_path) != meta['sha256']:
+                    return None
+                meta['mtime_ns'] = stat.st_mtime_ns
+                self._write_meta(entry, meta)
+        # 원본이 지워졌으면 (이전 배포판 등) 비교할 대상이 없으므로 저장된 meta를 신뢰
+
+        encoded = []
+        for i, (name, kind, dtype) in enumerate(meta['columns']):
+            if columns is not None and name not in columns:
+                continue
+            a = np.load(entry / f"{i}.a.npy")
+            b = np.load(entry / f"{i}.b.npy")
+            encoded.append((name, kind, dtype, a, b))
+        if columns is not None:
+            # 합쳐 저장된 항목은 컬럼 순서가 요청과 다를 수 있으므로 요청 순서로 맞춤
+            position = {name: i for i, name in enumerate(columns)}
+            encoded.sort(key=lambda column: position[column[0]])
+        return unpack_frame({'length': meta['length'], 'columns': encoded})
+
+    def store(self, exam_type, source_path, variant, df):
+        """파싱 결과를 캐시에 기록 (임시 디렉터리에 쓴 뒤 교체)
+        
+        같은 원본·형식의 유효한 항목이 있으면 그 항목에만 있는 컬럼을 보존하여 합친다.
+        """
+        entry = self._entry_dir(exam_type, source_path)
+        existing = self.load(exam_type, source_path, variant)
+        if existing is not None and len(existing) == len(df):
+            df = existing.assign(**{name: df[name] for name in df.columns})
+        stat = Path(source_path).stat()
+        packed = pack_frame(df)
+
+        tmp = entry.with_name(entry.name + f".tmp-{time.time_ns()}")
+        tmp.mkdir(parents=True)
+        for i, (name, kind, dtype, a, b) in enumerate(packed['columns']):
+            np.save(tmp / f"{i}.a.npy", a)
+            np.save(tmp / f"{i}.b.npy", b)
+        self._write_meta(tmp, {
+            'version': CACHE_VERSION,
+            'exam_type': exam_type,
+            'path': str(Path(source_path).resolve()),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(source_path),
+            'variant': variant,
+            'length': packed['length'],
+            'columns': [[name, kind, dtype] for name, kind, dtype, _, _ in packed['columns']]
+        })
+
+        if entry.exists():
+            shutil.rmtree(entry)
+        tmp.rename(entry)
+
+    def invalidate(self, exam_type=None):
+        """캐시 삭제 (exam_type이 없으면 전체)"""
+        if not self.cache_dir.exists():
+            return
+        pattern = f"{exam_type}-*" if exam_type else "*"
+        for entry in self.cache_dir.glob(pattern):
+            if entry.is_dir():
+                shutil.rmtree(entry)
@@ -0,0 +1,47 @@
+"""
+파싱된 과거 DataFrame의 컬럼 단위 직렬화
+
+프로세스 간 전달이나 디스크 캐시에서 레코드(dict) 리스트를 피클링하는 대신
+각 컬럼을 dtype에 맞는 두 개의 numpy 배열로 표현한다.
+- category / 문자열: (정수 코드, 고유값) - 반복 값은 고유값으로 한 번만 저장
+- nullable 정수(Int32 등): (값, 결측 마스크)
+numpy 배열은 피클 프로토콜 5에서 버퍼 그대로 복사되고, .npy 파일로 그대로 저장된다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _pack_column(series):
+    """Series → (인코딩 방식, dtype 이름, 배열 a, 배열 b)"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int32)
+        return 'category', 'category', codes, np.asarray(dtype.categories, dtype=str)
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in 'iu':
+        values = series.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+        return 'masked', dtype.name, values, series.isna().to_numpy()
+    codes, uniques = pd.factorize(series)
+    return 'coded', str(dtype), codes.astype(np.int32), np.asarray(uniques, dtype=str)
+
+
+def _unpack_column(kind, dtype, a, b):
+    """_pack_column의 역변환 (코드 -1은 결측값)"""
+    if kind == 'category':
+        return pd.Categorical.from_codes(a, b)
+    if kind == 'masked':
+        return pd.arrays.IntegerArray(np.array(a), np.array(b))
+    values = np.asarray(pd.Categorical.from_codes(a, b), dtype=object)
+    return pd.array(values, dtype=dtype)
+
+
+def pack_frame(df):
+    """DataFrame → 컬럼별 (이름, 인코딩 방식, dtype, 배열 a, 배열 b) 묶음"""
+    columns = [(name,) + _pack_column(df[name]) for name in df.columns]
+    return {'length': len(df), 'columns': columns}
+
+
+def unpack_frame(packed):
+    """pack_frame 결과 → DataFrame"""
+    data = {name: _unpack_column(*encoded) for name, *encoded in packed['columns']}
+    return pd.DataFrame(data, index=pd.RangeIndex(packed['length']))
@@ -0,0 +1,186 @@
+"""
+가문 분포 불평등 지표 (그룹 일괄 계산)
+
+가문별 급제자 수를 임의의 그룹(시대, 10년 단위, 지역, 과거 종류, 시험 회차 등)별로 나눈
+개수 표에서 모든 그룹의 지표를 한 번에 계산한다.
+(그룹, 개수)를 함께 정렬한 뒤 그룹 경계 기준 누적합/np.bincount로 구간별 합을 구하므로
+그룹이 수천 개여도 Python 반복 없이 처리된다.
+
+지표 (그룹 안에서 급제자가 1명 이상인 가문만 대상)
+- 지니계수   : 2·Σ i·x(i) / (n·S) − (n+1)/n   (x(i)는 오름차순 i번째 가문의 급제자 수)
+- 상위10%점유: 상위 max(1, ⌊n × 10%⌋)개 가문의 급제자 비율
+- HHI       : Σ p²   (p = 가문 점유율)
+- 엔트로피   : −Σ p·ln p
+- 타일지수   : ln n − 엔트로피
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes
+
+METRIC_COLUMNS = ['가문수', '급제자수', '지니계수', '상위10%점유', 'HHI', '타일지수', '엔트로피']
+
+
+def segmented_inequality(groups, counts, n_groups=None, top_fraction=0.1):
+    """그룹 번호 배열과 가문별 개수 배열 → 그룹별 지표 배열 dict
+
+    Args:
+        groups: 각 (그룹, 가문) 칸의 그룹 번호 (0 ~ n_groups-1)
+        counts: 각 칸의 급제자 수 (0인 칸은 무시)
+        n_groups: 그룹 수 (생략 시 max(groups) + 1)
+        top_fraction: 상위 점유율 계산 비율
+
+    Returns:
+        dict: METRIC_COLUMNS 이름 → 길이 n_groups 배열 (빈 그룹은 NaN)
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.float64)
+    if n_groups is None:
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+
+    positive = counts > 0
+    groups, counts = groups[positive], counts[positive]
+
+    # 그룹별 오름차순 정렬 후 그룹 안 순위 (1부터)
+    order = np.lexsort((counts, groups))
+    groups, counts = groups[order], counts[order]
+    n = np.bincount(groups, minlength=n_groups)
+    total = np.bincount(groups, weights=counts, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+    rank = np.arange(len(counts)) - starts[groups] + 1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weighted = np.bincount(groups, weights=rank * counts, minlength=n_groups)
+        gini = 2 * weighted / (n * total) - (n + 1) / n
+
+        # 오름차순이므로 그룹 안 마지막 k개가 상위 가문
+        k = np.maximum(1, np.floor(n * top_fraction)).astype(np.int64)
+        is_top = rank > (n - k)[groups]
+        top_share = np.bincount(groups, weights=counts * is_top, minlength=n_groups) / total
+
+        share = counts / total[groups]
+        hhi = np.bincount(groups, weights=share ** 2, minlength=n_groups)
+        entropy = -np.bincount(groups, weights=share * np.log(share), minlength=n_groups)
+        theil = np.log(n) - entropy
+
+    empty = n == 0
+    metrics = {
+        '가문수': n,
+        '급제자수': total.astype(np.int64),
+        '지니계수': gini,
+        '상위10%점유': top_share,
+        'HHI': hhi,
+        '타일지수': theil,
+        '엔트로피': entropy
+    }
+    for name in METRIC_COLUMNS[2:]:
+        # 칸이 하나도 없으면 np.bincount가 정수 배열을 돌려주므로 실수형으로 맞춤
+        metrics[name] = metrics[name].astype(np.float64)
+        metrics[name][empty] = np.nan
+    return metrics
+
+
+def histogram_inequality(hist, top_fraction=0.1):
+    """값 히스토그램 행렬 → 행별 지표 dict (부트스트랩 복제 행렬용)
+
+    hist[r, v]는 r번째 분포에서 급제자 수가 v인 가문 수이다(v = 0 열은 무시).
+    급제자 수는 작은 정수이므로 가문을 정렬하는 대신 값 v의 가문들이 차지하는
+    순위 구간 (C(v-1), C(v)]으로 순위 합을 구한다 (C는 히스토그램 누적합).
+    """
+    hist = np.asarray(hist, dtype=np.float64)[:, 1:]
+    values = np.arange(1, hist.shape[1] + 1, dtype=np.float64)
+    n = hist.sum(axis=1)
+    total = hist @ values
+    upto = np.cumsum(hist, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 값 v 구간의 순위 합 = h·(C(v-1) + C(v) + 1) / 2
+        rank_sum = ((upto - hist + upto + 1) * hist) @ values / 2
+        gini = 2 * rank_sum / (n * total) - (n + 1) / n
+
+        # 큰 값부터 k개: 값 v에서 가져가는 가문 수 = clip(k - (v보다 큰 가문 수), 0, h)
+        k = np.maximum(1, np.floor(n * top_fraction))
+        above = n[:, None] - upto
+        taken = np.clip(k[:, None] - above, 0, hist)
+        top_share = taken @ values / total
+
+        share = values / total[:, None]
+        hhi = (hist * share ** 2).sum(axis=1)
+        entropy = -(hist * share * np.log(share)).sum(axis=1)
+        theil = np.log(n) - entropy
+
+    return {
+        '가문수': n.astype(np.int64),
+        '급제자수': total.astype(np.int64),
+        '지니계수': gini,
+        '상위10%점유': top_share,
+        'HHI': hhi,
+        '타일지수': theil,
+        '엔트로피': entropy
+    }
+
+
+def row_inequality(matrix, top_fraction=0.1):
+    """행마다 분포 하나인 정수 개수 행렬 → 행별 지표 dict
+
+    행마다 값 히스토그램을 한 번의 np.bincount(행 번호 오프셋)로 만든 뒤
+    histogram_inequality로 계산한다.
+    """
+    matrix = np.asarray(matrix, dtype=np.int64)
+    n_rows = matrix.shape[0]
+    width = int(matrix.max(initial=0)) + 1
+    offsets = (np.arange(n_rows, dtype=np.int64) * width)[:, None]
+    hist = np.bincount((matrix + offsets).ravel(), minlength=n_rows * width)
+    return histogram_inequality(hist.reshape(n_rows, width), top_fraction)
+
+
+def family_cells(df, by, family='성관'):
+    """by 컬럼(범주형)별 가문 개수 칸 → (그룹 라벨, 칸의 그룹 번호, 칸의 개수)
+
+    (그룹 코드, 가문 코드) 쌍을 정수 키로 묶어 개수를 세므로 문자열 groupby가 필요 없다.
+    """
+    group_col = df[by] if isinstance(by, str) else by
+    if not isinstance(group_col.dtype, pd.CategoricalDtype):
+        group_col = group_col.astype('category')
+    group_codes = codes(group_col).astype(np.int64)
+    family_codes = codes(df[family]).astype(np.int64)
+    n_families = len(df[family].cat.categories)
+
+    valid = (group_codes >= 0) & (family_codes >= 0)
+    keys, cell_counts = np.unique(group_codes[valid] * n_families + family_codes[valid],
+                                  return_counts=True)
+    labels = pd.Index(group_col.cat.categories, name=group_col.name)
+    return labels, keys // n_families, cell_counts
+
+
+def inequality_by(df, by, family='성관', top_fraction=0.1):
+    """전처리 DataFrame을 by 컬럼(인코딩/범주형)별로 나눈 가문 불평등 지표 표"""
+    labels, groups, cell_counts = family_cells(df, by, family)
+    metrics = segmented_inequality(groups, cell_counts, len(labels), top_fraction)
+    table = pd.DataFrame(metrics, index=labels)
+    return table[table['가문수'] > 0]
+
+
+def inequality_table(table, top_fraction=0.1):
+    """그룹 × 가문 개수 표(DataFrame, 예: pd.crosstab 결과) → 그룹별 지표 표"""
+    values = table.to_numpy(dtype=np.float64)
+    groups = np.repeat(np.arange(values.shape[0]), values.shape[1])
+    metrics = segmented_inequality(groups, values.ravel(), values.shape[0], top_fraction)
+    return pd.DataFrame(metrics, index=table.index)
+
+
+def inequality(counts, top_fraction=0.1):
+    """단일 분포(가문별 급제자 수) → 지표 dict"""
+    counts = np.asarray(counts, dtype=np.float64)
+    metrics = segmented_inequality(np.zeros(len(counts), dtype=np.int64), counts, 1,
+                                   top_fraction)
+    return {name: values[0].item() for name, values in metrics.items()}
+
+
+def lorenz_curve(counts):
+    """로렌츠 곡선 좌표 (가문 누적 비율 x, 급제자 누적 비율 y; 하위 가문부터)"""
+    sorted_counts = np.sort(np.asarray(counts, dtype=np.float64))
+    n = len(sorted_counts)
+    cumsum = np.cumsum(sorted_counts)
+    return np.arange(1, n + 1) / n, cumsum / cumsum[-1]
@@ -5,63 +5,42 @@ DIKW 프레임워크 기반 종합 인포그래픽 생성
 산업디자인학과 데이터 분석 수업 최종 결과물
 """
 
+import argparse
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, Circle, FancyArrowPatch
 import seaborn as sns
-from kinship_analysis import KwagwaDataParser
+from kinship_analysis import add_loader_arguments, KwagwaDataParser
+from prepared_store import prepared_frame
+from region_gazetteer import default_gazetteer
+from dictionary_encoding import count_codes
+from analysis_context import AnalysisContext
+from era_binning import get_scheme
+from inequality import inequality, lorenz_curve
+from window_inequality import FIRST_YEAR, LAST_YEAR, sliding_inequality
 
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'AppleGothic'
 plt.rcParams['axes.unicode_minus'] = False
 plt.rcParams['font.size'] = 10
 
+
 class IntegratedVisualization:
     """혈연 + 지연 통합 시각화"""
     
+    # 분석에 필요한 원본 컬럼 (로더가 이 태그만 추출하도록 전달)
+    REQUIRED_COLUMNS = ('급제자', '본관', '시험년', '생년', '등위', '거주지')
+    
     def __init__(self, data_dict):
         self.data = data_dict
         self.df = self.prepare_data()
+        self.context = AnalysisContext(self.df)
         
     def prepare_data(self):
-        """데이터 전처리"""
-        df = self.data['문과'].copy()
-        df['시험년_int'] = pd.to_numeric(df['시험년'], errors='coerce')
-        df['생년_int'] = pd.to_numeric(df['생년'], errors='coerce')
-        df['등위_int'] = pd.to_numeric(df['등위'], errors='coerce')
-        df = df.dropna(subset=['급제자', '본관'])
-        df['성씨'] = df['급제자'].str[0]
-        df['성관'] = df['성씨'] + ' ' + df['본관']
-        
-        # 지역 매핑 (간단 버전)
-        def map_region(geo):
-            if pd.isna(geo) or geo == '' or '미상' in str(geo):
-                return '미상'
-            geo = str(geo)
-            if '한성' in geo or '경' in geo or '京' in geo:
-                return '경기/한양'
-            elif '평양' in geo or '평안' in geo or '안주' in geo or '정주' in geo:
-                return '평안'
-            elif '전주' in geo or '전라' in geo or '나주' in geo or '남원' in geo:
-                return '전라'
-            elif '함흥' in geo or '함경' in geo or '북청' in geo:
-                return '함경'
-            elif '강릉' in geo or '강원' in geo or '원주' in geo or '춘천' in geo:
-                return '강원'
-            elif '황해' in geo or '해주' in geo:
-                return '황해'
-            elif '충청' in geo or '충주' in geo or '청주' in geo or '공주' in geo:
-                return '충청'
-            elif '제주' in geo:
-                return '제주'
-            else:
-                return '기타'
-        
-        df['지역'] = df['거주지'].apply(map_region)
-        
-        return df
+        """데이터 전처리 (기본 전처리는 다른 분석기와 공유하고 등위/지역만 추가)"""
+        return prepared_frame(self.data['문과'], numeric=('시험년', '생년', '등위'),
+                              regions=default_gazetteer())
     
     def create_master_infographic(self):
         """마스터 인포그래픽: 이중 불평등 구조"""
@@ -88,9 +67,13 @@ class IntegratedVisualization:
         ax3 = plt.subplot(2, 3, 3)
         self.plot_double_filter(ax3)
         
-        # ========== 섹션 4: 시대별 변화 (하단 왼쪽) ==========
-        ax4 = plt.subplot(2, 3, 4)
+        # ========== 섹션 4: 시대별 변화 + 지역 지니 추이 (하단 왼쪽, 위아래 2칸) ==========
+        section4 = fig.add_gridspec(2, 3)[1, 0].subgridspec(2, 1, height_ratios=[2, 1],
+                                                            hspace=0.5)
+        ax4 = fig.add_subplot(section4[0])
         self.plot_temporal_changes(ax4)
+        ax4b = fig.add_subplot(section4[1])
+        self.plot_regional_gini_trend(ax4b)
         
         # ========== 섹션 5: 교차 분석 (하단 중앙) ==========
         ax5 = plt.subplot(2, 3, 5)
@@ -116,7 +99,7 @@ class IntegratedVisualization:
     def plot_regional_inequality(self, ax):
         """지연 불평등 시각화"""
         # 지역별 통계
-        region_counts = self.df[self.df['지역'] != '미상']['지역'].value_counts()
+        region_counts = self.context.cube('성관', '지역').ranked('지역', exclude=['미상'])
         
         # RI 계산 (간단 버전 - 실제로는 인구 데이터 필요)
         # 여기서는 예시 RI 사용
@@ -166,17 +149,11 @@ class IntegratedVisualization:
     
     def plot_kinship_inequality(self, ax):
         """혈연 불평등 시각화 - 로렌츠 곡선"""
-        family_counts = self.df['성관'].value_counts()
-        sorted_counts = np.sort(family_counts.values)
-        n = len(sorted_counts)
-        
-        cumsum = np.cumsum(sorted_counts)
-        lorenz_y = cumsum / cumsum[-1]
-        lorenz_x = np.arange(1, n + 1) / n
+        family_counts = count_codes(self.df['성관'])
+        lorenz_x, lorenz_y = lorenz_curve(family_counts.values)
         
         # 지니계수
-        area_under_lorenz = np.trapz(lorenz_y, lorenz_x)
-        gini = 1 - 2 * area_under_lorenz
+        gini = inequality(family_counts.values)['지니계수']
         
         # 플롯
         ax.plot([0, 1], [0, 1], 'k--', linewidth=2, label='완전 평등선', alpha=0.5)
@@ -290,51 +267,33 @@ class IntegratedVisualization:
                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.7))
     
     def plot_temporal_changes(self, ax):
-        """시대별 변화: 지연은 완화, 혈연은 악화"""
-        # 시대 구분
-        def categorize(year):
-            if year < 1450:
-                return '조선 초기'
-            elif year < 1550:
-                return '조선 전기'
-            elif year < 1650:
-                return '조선 중기'
-            elif year < 1750:
-                return '조선 후기 전반'
-            elif year < 1850:
-                return '조선 후기 후반'
-            else:
-                return '조선 말기'
-        
-        df_temp = self.df[self.df['시험년_int'].notna()].copy()
-        df_temp['시대'] = df_temp['시험년_int'].apply(categorize)
+        """시대별 변화: 지연은 완화, 혈연은 악화 (가문 지니는 30년 이동창, 1년 간격)"""
+        # 시대 구분 (조선 초기 ~ 말기 6구분)
+        scheme = get_scheme('6-era')
+        centers = self._era_centers(scheme)
         
-        periods = ['조선 초기', '조선 전기', '조선 중기', 
-                  '조선 후기 전반', '조선 후기 후반', '조선 말기']
+        # 지연 RI (시대별, 예시 데이터 - 인구 데이터가 있어야 계산 가능)
+        ri_trend = [10, 8, 6, 5, 4, 4]
         
-        # 예시 데이터 (실제로는 계산 필요)
-        ri_trend = [10, 8, 6, 5, 4, 4]  # 지연 RI (감소)
-        gini_trend = [0.49, 0.55, 0.65, 0.69, 0.72, 0.68]  # 혈연 지니 (증가)
-        
-        x = range(len(periods))
+        # 혈연 (가문 지니, 이동창)
+        kinship_trend = sliding_inequality(self.df, window=30)
+        years = kinship_trend['중심년']
         
         # 듀얼 축
         ax_twin = ax.twinx()
         
         # 지연 (RI)
-        line1 = ax.plot(x, ri_trend, 'o-', linewidth=3, markersize=10,
+        line1 = ax.plot(centers, ri_trend, 'o-', linewidth=3, markersize=10,
                        color='steelblue', label='지연 불평등 (RI)')
-        ax.fill_between(x, ri_trend, alpha=0.3, color='steelblue')
+        ax.fill_between(centers, ri_trend, alpha=0.3, color='steelblue')
         
         # 혈연 (지니)
-        line2 = ax_twin.plot(x, gini_trend, 's-', linewidth=3, markersize=10,
-                            color='crimson', label='혈연 불평등 (지니)')
-        ax_twin.fill_between(x, gini_trend, alpha=0.3, color='crimson')
+        line2 = ax_twin.plot(years, kinship_trend['지니계수'], '-', linewidth=3,
+                            color='crimson', label='혈연 불평등 (가문 지니, 30년 이동창)')
+        ax_twin.fill_between(years, kinship_trend['지니계수'], alpha=0.3, color='crimson')
         
-        ax.set_xticks(x)
-        ax.set_xticklabels([p.replace(' ', '\n') for p in periods], 
-                          fontsize=9, rotation=0)
-        ax.set_ylabel('지역 RI (높을수록 불평등)', fontsize=11, 
+        self._era_axis(ax, scheme)
+        ax.set_ylabel('지역 RI (높을수록 불평등)', fontsize=11,
                      fontweight='bold', color='steelblue')
         ax_twin.set_ylabel('가문 지니계수 (높을수록 불평등)', fontsize=11,
                           fontweight='bold', color='crimson')
@@ -352,33 +311,64 @@ class IntegratedVisualization:
         ax_twin.set_ylim(0, 1)
         
         # 주석
-        ax.annotate('초기 수도 독점\n(건국 귀족)', xy=(0, 10), xytext=(0.5, 11),
+        ax.annotate('초기 수도 독점\n(건국 귀족)', xy=(centers[0], ri_trend[0]),
+                   xytext=(centers[0] + 40, 11),
                    arrowprops=dict(arrowstyle='->', color='gray'),
                    fontsize=9, ha='center')
         
-        ax.annotate('문벌 사회\n고착화', xy=(4, gini_trend[4]), xytext=(4.5, 0.8),
-                   arrowprops=dict(arrowstyle='->', color='red'),
-                   fontsize=9, ha='center', color='red')
+        # 가문 지니가 가장 높은 창
+        peak = kinship_trend['지니계수'].idxmax()
+        if not pd.isna(peak):
+            ax_twin.annotate('문벌 사회\n고착화',
+                            xy=(years[peak], kinship_trend.at[peak, '지니계수']),
+                            xytext=(years[peak], 0.9),
+                            arrowprops=dict(arrowstyle='->', color='red'),
+                            fontsize=9, ha='center', color='red')
+    
+    def plot_regional_gini_trend(self, ax):
+        """지역 지니계수 추이 (30년 이동창, 1년 간격, 거주지 미상 제외)"""
+        region_trend = sliding_inequality(self.df, window=30, family='지역', exclude=['미상'])
+        ax.plot(region_trend['중심년'], region_trend['지니계수'], '-', linewidth=2,
+                color='steelblue', label='지역 지니 (30년 이동창)')
+        ax.fill_between(region_trend['중심년'], region_trend['지니계수'],
+                        alpha=0.3, color='steelblue')
+        
+        self._era_axis(ax, get_scheme('6-era'))
+        ax.set_ylabel('지역 지니계수', fontsize=10, fontweight='bold')
+        ax.set_ylim(0, 1)
+        ax.set_title('지역별 급제자 분포의 지니계수 추이 (거주지 미상 제외)',
+                    fontsize=11, fontweight='bold')
+        ax.legend(loc='upper right', fontsize=9)
+        ax.grid(alpha=0.3)
+    
+    @staticmethod
+    def _era_centers(scheme):
+        """시대별 중앙 연도 (첫 시대는 FIRST_YEAR, 마지막 시대는 LAST_YEAR까지)"""
+        edges = [FIRST_YEAR] + list(scheme.breaks) + [LAST_YEAR]
+        return [(lo + hi) / 2 for lo, hi in zip(edges[:-1], edges[1:])]
+    
+    @classmethod
+    def _era_axis(cls, ax, scheme):
+        """연도 축에 시대 경계선과 시대 이름 눈금 표시"""
+        for boundary in scheme.breaks:
+            ax.axvline(boundary, color='gray', linestyle=':', linewidth=1)
+        ax.set_xticks(cls._era_centers(scheme))
+        ax.set_xticklabels([p.replace(' ', '\n') for p in scheme.labels],
+                          fontsize=9, rotation=0)
+        ax.set_xlim(FIRST_YEAR, LAST_YEAR)
     
     def plot_intersection(self, ax):
         """혈연 × 지연 교차 분석 - 히트맵"""
+        cube = self.context.cube('성관', '지역')
+        
         # 상위 10개 가문
-        top_families = self.df['성관'].value_counts().head(10).index
+        top_families = cube.ranked('성관').head(10).index
         
         # 지역
         regions = ['경기/한양', '평안', '충청', '전라', '강원', '황해', '함경']
         
-        # 교차표 생성
-        matrix = []
-        for family in top_families:
-            row = []
-            for region in regions:
-                count = len(self.df[(self.df['성관'] == family) & 
-                                   (self.df['지역'] == region)])
-                row.append(count)
-            matrix.append(row)
-        
-        matrix = np.array(matrix)
+        # 교차표 생성 (성관 × 지역 큐브에서 바로 조회)
+        matrix = cube.dice(성관=top_families, 지역=regions).rollup('성관', '지역').array
         
         # 히트맵
         im = ax.imshow(matrix, cmap='YlOrRd', aspect='auto')
@@ -482,16 +472,19 @@ class IntegratedVisualization:
                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
 
-def main():
+def main(argv=None):
     """메인 실행"""
+    arg_parser = argparse.ArgumentParser(description="혈연 + 지연 통합 인포그래픽 생성")
+    args = add_loader_arguments(arg_parser).parse_args(argv)
+    
     print("="*70)
     print("  혈연 + 지연 통합 인포그래픽 생성")
     print("  DIKW 프레임워크 기반 시각화")
     print("="*70)
     
     # 데이터 로딩
-    parser = KwagwaDataParser(".")
-    data = parser.load_all_data()
+    parser = KwagwaDataParser.from_args(args)
+    data = parser.load_all_data(columns=IntegratedVisualization.REQUIRED_COLUMNS)
     
     # 시각화
     viz = IntegratedVisualization(data)
@@ -10,13 +10,26 @@
 3. 분석 및 해석 (통계 분석, 시각화)
 """
 
-import xml.etree.ElementTree as ET
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from collections import defaultdict, Counter
+from collections.abc import Mapping
 import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+from frame_codec import pack_frame, unpack_frame
+from frame_cache import FrameCache
+from xml_backends import get_backend
+from prepared_store import prepared_frame
+from dictionary_encoding import count_codes
+from era_binning import get_scheme
+from analysis_context import AnalysisContext
+from continuity import GAP_MAX_GRID, GAP_MIN_GRID, clan_runs, sweep_thresholds
+from lineage import LINEAGE_COLUMNS, LineageGraph
+from record_linkage import DEFAULT_EXAMS, LINKAGE_COLUMNS, link_exams, progression_counts
+from exam_schema import (EXAM_SCHEMAS, build_frame, project_schema, schema_signature,
+                         schema_tags)
 
 # 한글 폰트 설정 (matplotlib)
 plt.rcParams['font.family'] = 'AppleGothic'  # macOS용
@@ -25,204 +38,327 @@ plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
 class KwagwaDataParser:
     """과거 급제자 데이터 파싱 클래스"""
     
-    def __init__(self, base_path="."):
+    # 급제자 레코드 태그 (이름 필드도 같은 태그를 쓰므로 최상위 요소만 레코드로 취급)
+    RECORD_TAG = '급제자'
+    
+    # 과거 종류별 필드 스키마 (태그, dtype) - exam_schema.py 참고
+    EXAM_SCHEMAS = EXAM_SCHEMAS
+    
+    # 과거 종류별 원본 파일명 ({release}: 배포일자)과 파서
+    EXAM_FILES = {
+        '문과': '한국학중앙연구원_조선조문과급제자_{release}.xml',
+        '무과': '한국학중앙연구원_조선조 무과급제자 정보_{release}.xml',
+        '사마시': '한국학중앙연구원_조선조사마시급제자_{release}.xml',
+        '잡과': '한국학중앙연구원_조선조잡과급제자_{release}.xml'
+    }
+    
+    # 기본 데이터 배포판 (한국학중앙연구원 공개일자)
+    DEFAULT_RELEASE = '20200929'
+    
+    PARSE_METHODS = {
+        '문과': 'parse_mungwa',
+        '무과': 'parse_mugwa',
+        '사마시': 'parse_samasi',
+        '잡과': 'parse_japgwa'
+    }
+    
+    # 파싱 결과 캐시 디렉터리 (base_path 기준)
+    CACHE_DIR = '.kwagwa_cache'
+    
+    def __init__(self, base_path=".", streaming=False, workers=1, use_cache=True,
+                 cache_dir=None, backend='auto', release=None):
         self.base_path = Path(base_path)
+        self.release = release or self.DEFAULT_RELEASE
+        self.streaming = streaming
+        self.backend = get_backend(backend)
+        self.workers = workers
+        self.cache = None
+        if use_cache:
+            self.cache = FrameCache(cache_dir or self.base_path / self.CACHE_DIR)
         self.data = {}
-        
-    def parse_mungwa(self, filepath):
+        self.parse_stats = {}
+    
+    @classmethod
+    def from_args(cls, args):
+        """add_loader_arguments로 받은 명령행 옵션으로 파서 생성"""
+        parser = cls(args.data_dir, streaming=args.streaming, workers=args.workers,
+                     use_cache=not args.no_cache, backend=args.xml_backend,
+                     release=args.release)
+        if args.clear_cache and parser.cache is not None:
+            parser.cache.invalidate()
+        return parser
+        
+    def parse_mungwa(self, filepath, columns=None):
         """문과 급제자 데이터 파싱"""
-        print(f"문과 데이터 파싱 중: {filepath}")
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        records = []
-        for item in root.findall('.//급제자'):
-            record = {
-                'ID': self._get_text(item, 'ID'),
-                '시험명': self._get_text(item, '시험명'),
-                '왕대': self._get_text(item, '왕대'),
-                '왕력': self._get_text(item, '왕력'),
-                '간지': self._get_text(item, '간지'),
-                '시험년': self._get_text(item, '시험년'),
-                '급제자': self._get_text(item, '급제자'),
-                '자': self._get_text(item, '자'),
-                '호': self._get_text(item, '호'),
-                '시호': self._get_text(item, '시호'),
-                '생년': self._get_text(item, '생년'),
-                '졸년': self._get_text(item, '졸년'),
-                '본관': self._get_text(item, '본관'),
-                '등급': self._get_text(item, '등급'),
-                '등위': self._get_text(item, '등위'),
-                '거주지': self._get_text(item, '거주지'),
-                '시험유형': self._get_text(item, '시험유형'),
-                '과거구분': '문과'
-            }
-            records.append(record)
-        
-        df = pd.DataFrame(records)
-        print(f"  → {len(df)}명의 문과 급제자 데이터 로드 완료")
-        return df
+        return self._parse_exam(filepath, '문과', columns)
     
-    def parse_mugwa(self, filepath):
+    def parse_mugwa(self, filepath, columns=None):
         """무과 급제자 데이터 파싱"""
-        print(f"무과 데이터 파싱 중: {filepath}")
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        records = []
-        for item in root.findall('.//급제자'):
-            # 무과 데이터는 필드 구조가 다름
-            record = {
-                '시험구분': self._get_text(item, '시험구분'),
-                '왕대': self._get_text(item, '왕대'),
-                '왕년': self._get_text(item, '왕년'),
-                '시험년': self._get_text(item, '시험년'),  # 실제로는 이름
-                '급제자': self._get_text(item, '급제자'),
-                '호': self._get_text(item, '호'),
-                '생년': self._get_text(item, '생년'),
-                '몰년': self._get_text(item, '몰년'),
-                '본관': self._get_text(item, '본관'),  # 실제로는 등급
-                '등급': self._get_text(item, '등급'),  # 실제로는 등위
-                '등위': self._get_text(item, '등위'),  # 실제로는 거주지
-                '거주지': self._get_text(item, '거주지'),
-                '전력': self._get_text(item, '전력'),
-                '부명': self._get_text(item, '부명'),
-                '과거구분': '무과'
-            }
-            records.append(record)
-        
-        df = pd.DataFrame(records)
-        print(f"  → {len(df)}명의 무과 급제자 데이터 로드 완료")
-        return df
+        return self._parse_exam(filepath, '무과', columns)
     
-    def parse_samasi(self, filepath):
+    def parse_samasi(self, filepath, columns=None):
         """사마시 급제자 데이터 파싱"""
-        print(f"사마시 데이터 파싱 중: {filepath}")
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        records = []
-        for item in root.findall('.//급제자'):
-            record = {
-                'ID': self._get_text(item, 'ID'),
-                '시험명': self._get_text(item, '시험명'),
-                '왕대': self._get_text(item, '왕대'),
-                '왕력': self._get_text(item, '왕력'),
-                '간지': self._get_text(item, '간지'),
-                '시험년': self._get_text(item, '시험년'),
-                '급제자': self._get_text(item, '급제자'),
-                '자': self._get_text(item, '자'),
-                '호': self._get_text(item, '호'),
-                '생년': self._get_text(item, '생년'),
-                '졸년': self._get_text(item, '졸년'),
-                '본관': self._get_text(item, '본관'),
-                '등급': self._get_text(item, '등급'),
-                '등위': self._get_text(item, '등위'),
-                '거주지': self._get_text(item, '거주지'),
-                '시험유형': self._get_text(item, '시험유형'),
-                '과거구분': '사마시'
-            }
-            records.append(record)
-        
-        df = pd.DataFrame(records)
-        print(f"  → {len(df)}명의 사마시 급제자 데이터 로드 완료")
-        return df
+        return self._parse_exam(filepath, '사마시', columns)
     
-    def parse_japgwa(self, filepath):
+    def parse_japgwa(self, filepath, columns=None):
         """잡과 급제자 데이터 파싱"""
-        print(f"잡과 데이터 파싱 중: {filepath}")
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-        
-        records = []
-        for item in root.findall('.//급제자'):
-            record = {
-                'ID': self._get_text(item, 'ID'),
-                '시험명': self._get_text(item, '시험명'),
-                '왕대': self._get_text(item, '왕대'),
-                '왕력': self._get_text(item, '왕력'),
-                '간지': self._get_text(item, '간지'),
-                '시험년': self._get_text(item, '시험년'),
-                '급제자': self._get_text(item, '급제자'),
-                '자': self._get_text(item, '자'),
-                '호': self._get_text(item, '호'),
-                '생년': self._get_text(item, '생년'),
-                '졸년': self._get_text(item, '졸년'),
-                '본관': self._get_text(item, '본관'),
-                '등급': self._get_text(item, '등급'),
-                '등위': self._get_text(item, '등위'),
-                '거주지': self._get_text(item, '거주지'),
-                '시험유형': self._get_text(item, '시험유형'),
-                '과거구분': '잡과'
-            }
-            records.append(record)
+        return self._parse_exam(filepath, '잡과', columns)
+    
+    def _parse_exam(self, filepath, exam_type, columns=None):
+        """과거 XML 한 개를 스키마에 따라 파싱하여 타입이 지정된 DataFrame으로 변환
+        
+        columns를 주면 해당 컬럼의 태그만 추출한다 (스키마에 없는 컬럼은 무시).
+        """
+        mode = ("스트리밍" if self.streaming else "전체 트리") + f", {self.backend.name}"
+        print(f"{exam_type} 데이터 파싱 중 ({mode}): {filepath}")
+        
+        schema = project_schema(self.EXAM_SCHEMAS[exam_type], columns)
+        tags = schema_tags(schema)
         
-        df = pd.DataFrame(records)
-        print(f"  → {len(df)}명의 잡과 급제자 데이터 로드 완료")
+        start = time.perf_counter()
+        if self.streaming:
+            columns = self._stream_columns(filepath, tags)
+        else:
+            columns = self._tree_columns(filepath, tags)
+        df = build_frame(schema, columns, exam_type)
+        elapsed = time.perf_counter() - start
+        
+        rate = len(df) / elapsed if elapsed > 0 else float('inf')
+        self.parse_stats[exam_type] = {
+            'records': len(df),
+            'seconds': elapsed,
+            'records_per_sec': rate
+        }
+        print(f"  → {len(df)}명의 {exam_type} 급제자 데이터 로드 완료 "
+              f"({elapsed:.2f}초, {rate:,.0f} records/s)")
+        return df
+    
+    def _tree_columns(self, filepath, tags):
+        """전체 트리를 올린 뒤 태그별 컬럼 버퍼 구성"""
+        return self._collect_columns(
+            self.backend.tree_values(filepath, self.RECORD_TAG, tags), tags)
+    
+    def _stream_columns(self, filepath, tags):
+        """iterparse 기반 스트리밍 파싱
+        
+        레코드 요소를 읽는 즉시 컬럼 버퍼에 적재하고, 백엔드가 읽은 레코드를 해제하므로
+        메모리 사용량이 파일 크기와 무관하게 레코드 하나 수준으로 유지된다.
+        """
+        return self._collect_columns(
+            self.backend.stream_values(filepath, self.RECORD_TAG, tags), tags)
+    
+    def _collect_columns(self, records, tags):
+        """백엔드가 돌려준 레코드별 {태그: 텍스트}를 태그별 컬럼 버퍼로 적재 (없는 값은 "")"""
+        columns = {tag: [] for tag in tags}
+        appenders = [(tag, columns[tag].append) for tag in tags]
+        for values in records:
+            for tag, append in appenders:
+                append(values.get(tag) or "")
+        return columns
+    
+    def exam_path(self, exam_type):
+        """과거 종류별 원본 XML 경로"""
+        return self.base_path / self.EXAM_FILES[exam_type].format(release=self.release)
+    
+    def parse(self, exam_type, columns=None):
+        """과거 종류 이름으로 해당 파서 실행"""
+        parse_method = getattr(self, self.PARSE_METHODS[exam_type])
+        return parse_method(self.exam_path(exam_type), columns)
+    
+    def cache_variant(self, exam_type):
+        """캐시 호환성 키: 스키마(필드/태그/dtype)가 바뀌면 기존 캐시를 쓰지 않음"""
+        return schema_signature(self.EXAM_SCHEMAS[exam_type])
+    
+    def _load_cached(self, exam_type, columns=None):
+        if self.cache is None:
+            return None
+        start = time.perf_counter()
+        df = self.cache.load(exam_type, self.exam_path(exam_type),
+                             self.cache_variant(exam_type),
+                             self._projected_names(exam_type, columns))
+        if df is not None:
+            elapsed = time.perf_counter() - start
+            print(f"{exam_type} 데이터 캐시 로드: {len(df)}명 ({elapsed * 1000:.1f}ms)")
         return df
     
-    def _get_text(self, element, tag):
-        """XML 요소에서 텍스트 추출"""
-        child = element.find(tag)
-        return child.text if child is not None and child.text else ""
+    def _store_cached(self, exam_type, df):
+        if self.cache is not None:
+            self.cache.store(exam_type, self.exam_path(exam_type),
+                             self.cache_variant(exam_type), df)
     
-    def load_all_data(self):
-        """모든 과거 데이터 로드"""
+    def _projected_names(self, exam_type, columns):
+        """컬럼 투영을 적용했을 때 결과 DataFrame의 컬럼 목록 (투영 없으면 스키마 전체)
+        
+        투영 파싱으로 저장된 캐시를 전체 컬럼 요청에 잘못 돌려주지 않도록 항상 목록으로 확인한다.
+        """
+        schema = project_schema(self.EXAM_SCHEMAS[exam_type], columns)
+        return [f.name for f in schema] + ['과거구분']
+    
+    def load_exam(self, exam_type, columns=None):
+        """과거 한 종류 로드: 캐시를 우선 사용하고, 없으면 파싱 후 캐시에 기록"""
+        df = self._load_cached(exam_type, columns)
+        if df is None:
+            df = self.parse(exam_type, columns)
+            self._store_cached(exam_type, df)
+        return df
+    
+    def load_all_data(self, lazy=None, columns=None):
+        """모든 과거 데이터 로드
+        
+        기본(lazy)은 LazyExamData를 반환하여 각 과거를 처음 접근할 때만 로드한다.
+        workers > 1이면 기본값이 즉시 로드가 되어 캐시에 없는 파일을 병렬 파싱한다.
+        columns를 주면 (예: KinshipAnalyzer.REQUIRED_COLUMNS) 그 컬럼만 추출한다.
+        """
+        if lazy is None:
+            lazy = self.workers <= 1
+        
         print("=" * 60)
-        print("과거 급제자 데이터 로딩 시작")
+        print("과거 급제자 데이터 로딩 시작" + (" (지연 로딩: 처음 접근 시 파싱)" if lazy else ""))
         print("=" * 60)
         
-        # 파일 경로
-        files = {
-            '문과': self.base_path / '한국학중앙연구원_조선조문과급제자_20200929.xml',
-            '무과': self.base_path / '한국학중앙연구원_조선조 무과급제자 정보_20200929.xml',
-            '사마시': self.base_path / '한국학중앙연구원_조선조사마시급제자_20200929.xml',
-            '잡과': self.base_path / '한국학중앙연구원_조선조잡과급제자_20200929.xml'
-        }
+        self.data = LazyExamData(lambda exam_type: self.load_exam(exam_type, columns),
+                                 self.EXAM_FILES)
+        if lazy:
+            return self.data
+        
+        # 각 과거별 데이터 파싱 (캐시에 없는 것만)
+        frames = {}
+        missing = []
+        for exam_type in self.EXAM_FILES:
+            df = self._load_cached(exam_type, columns)
+            if df is None:
+                missing.append(exam_type)
+            else:
+                frames[exam_type] = df
         
-        # 각 과거별 데이터 파싱
-        self.data['문과'] = self.parse_mungwa(files['문과'])
-        self.data['무과'] = self.parse_mugwa(files['무과'])
-        self.data['사마시'] = self.parse_samasi(files['사마시'])
-        self.data['잡과'] = self.parse_japgwa(files['잡과'])
+        if self.workers > 1 and len(missing) > 1:
+            frames.update(self._load_parallel(missing, columns))
+        else:
+            for exam_type in missing:
+                frames[exam_type] = self.parse(exam_type, columns)
+        for exam_type in missing:
+            self._store_cached(exam_type, frames[exam_type])
+        self.data.update(frames)
         
         print("\n" + "=" * 60)
         print("데이터 로딩 완료")
         print("=" * 60)
         
         return self.data
+    
+    def _load_parallel(self, exam_types, columns=None):
+        """프로세스 풀에서 과거별 XML을 동시에 파싱"""
+        # 큰 파일부터 제출해야 전체 소요 시간이 가장 큰 파일 하나에 수렴
+        exam_types = sorted(exam_types, key=lambda t: self.exam_path(t).stat().st_size,
+                            reverse=True)
+        n_workers = min(self.workers, len(exam_types))
+        print(f"병렬 파싱: {len(exam_types)}개 파일, 워커 {n_workers}개")
+        
+        frames = {}
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {
+                exam_type: pool.submit(_parse_exam_worker, str(self.base_path),
+                                       self.streaming, self.backend.name, self.release,
+                                       exam_type, columns)
+                for exam_type in exam_types
+            }
+            for exam_type in self.EXAM_FILES:
+                if exam_type not in futures:
+                    continue
+                packed, stats = futures[exam_type].result()
+                frames[exam_type] = unpack_frame(packed)
+                self.parse_stats[exam_type] = stats
+        return frames
+
+
+class LazyExamData(Mapping):
+    """과거 종류별 DataFrame 매핑 - 각 과거는 처음 접근할 때 한 번만 로드"""
+    
+    def __init__(self, loader, exam_types):
+        self._loader = loader
+        self._exam_types = tuple(exam_types)
+        self._frames = {}
+    
+    def __getitem__(self, exam_type):
+        if exam_type not in self._frames:
+            if exam_type not in self._exam_types:
+                raise KeyError(exam_type)
+            self._frames[exam_type] = self._loader(exam_type)
+        return self._frames[exam_type]
+    
+    def __contains__(self, exam_type):
+        # Mapping 기본 구현은 __getitem__을 호출하므로 로드 없이 판정
+        return exam_type in self._exam_types
+    
+    def __iter__(self):
+        return iter(self._exam_types)
+    
+    def __len__(self):
+        return len(self._exam_types)
+    
+    def update(self, frames):
+        """이미 로드된 DataFrame 등록"""
+        for exam_type, df in frames.items():
+            if exam_type not in self._exam_types:
+                raise KeyError(exam_type)
+            self._frames[exam_type] = df
+    
+    def is_loaded(self, exam_type):
+        return exam_type in self._frames
+    
+    def __repr__(self):
+        status = ', '.join(f"{t}{'' if t in self._frames else '(미로드)'}"
+                           for t in self._exam_types)
+        return f"LazyExamData({status})"
+
+
+def add_loader_arguments(arg_parser):
+    """데이터 로딩 관련 명령행 옵션 등록 (각 분석 스크립트 공통)"""
+    arg_parser.add_argument('--data-dir', default='.',
+                            help='원본 XML 파일이 있는 디렉터리 (기본: 현재 디렉터리)')
+    arg_parser.add_argument('--release', default=KwagwaDataParser.DEFAULT_RELEASE,
+                            help='데이터 배포일자 (파일명의 날짜 부분, 기본: %(default)s)')
+    arg_parser.add_argument('--workers', type=int, default=1,
+                            help='XML 병렬 파싱 프로세스 수 (기본: 1, 순차 파싱)')
+    arg_parser.add_argument('--streaming', action='store_true',
+                            help='iterparse 스트리밍 파싱 사용 (메모리 절약)')
+    arg_parser.add_argument('--xml-backend', default='auto', choices=['auto', 'lxml', 'stdlib'],
+                            help='XML 파서 백엔드 (기본 auto: lxml이 있으면 lxml)')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='파싱 결과 캐시를 읽지도 쓰지도 않음')
+    arg_parser.add_argument('--clear-cache', action='store_true',
+                            help='시작 전에 기존 파싱 캐시 삭제')
+    return arg_parser
+
+
+def _parse_exam_worker(base_path, streaming, backend, release, exam_type, columns=None):
+    """프로세스 풀 작업 단위: 파싱 결과를 컬럼 코드 배열로 묶어 반환"""
+    parser = KwagwaDataParser(base_path, streaming=streaming, use_cache=False,
+                              backend=backend, release=release)
+    df = parser.parse(exam_type, columns)
+    return pack_frame(df), parser.parse_stats[exam_type]
 
 
 class KinshipAnalyzer:
     """혈연관계 분석 클래스"""
     
+    # 분석에 필요한 원본 컬럼 (로더가 이 태그만 추출하도록 전달)
+    REQUIRED_COLUMNS = ('급제자', '본관', '시험년', '생년', '거주지')
+    
     def __init__(self, data_dict):
         self.data = data_dict
         self.combined_df = None
         self.prepare_data()
     
     def prepare_data(self):
-        """분석을 위한 데이터 전처리"""
+        """분석을 위한 데이터 전처리 (같은 원본이면 다른 분석기와 결과 공유)"""
         print("\n데이터 전처리 중...")
         
         # 문과 데이터를 기준으로 분석 (가장 중요한 과거)
-        df = self.data['문과'].copy()
-        
-        # 시험년을 숫자로 변환
-        df['시험년_int'] = pd.to_numeric(df['시험년'], errors='coerce')
-        df['생년_int'] = pd.to_numeric(df['생년'], errors='coerce')
-        
-        # 결측치 처리
-        df = df.dropna(subset=['급제자', '본관'])
+        self.combined_df = prepared_frame(self.data['문과'])
         
-        # 성씨 추출 (급제자명의 첫 글자)
-        df['성씨'] = df['급제자'].str[0]
-        
-        # 성관(본관) 조합
-        df['성관'] = df['성씨'] + ' ' + df['본관']
-        
-        self.combined_df = df
-        print(f"전처리 완료: {len(df)}개 레코드")
+        # 분석 메서드는 복사 대신 문맥의 캐시된 파생 컬럼/큐브를 사용
+        self.context = AnalysisContext(self.combined_df)
     
     def analyze_bongwan_concentration(self):
         """본관별 급제자 집중도 분석"""
@@ -230,7 +366,7 @@ class KinshipAnalyzer:
         print("-" * 60)
         
         # 성관별 급제자 수 계산
-        bongwan_counts = self.combined_df['성관'].value_counts()
+        bongwan_counts = count_codes(self.combined_df['성관'])
         
         print(f"\n총 {len(bongwan_counts)}개의 성관")
         print(f"총 급제자 수: {len(self.combined_df)}명")
@@ -251,31 +387,20 @@ class KinshipAnalyzer:
         print(f"\n[2] 세과(世科) 가문 분석 (최소 {min_generations}대 연속)")
         print("-" * 60)
         
-        # 성관별로 그룹화하여 시간순 정렬
-        grouped = self.combined_df.groupby('성관')
-        
-        seogwa_families = []
-        
-        for name, group in grouped:
-            if len(group) >= min_generations:
-                # 시험년 기준으로 정렬
-                sorted_group = group.sort_values('시험년_int')
-                
-                # 연속 급제 여부 확인 (세대 간격을 25-35년으로 가정)
-                years = sorted_group['시험년_int'].dropna().values
-                if len(years) >= min_generations:
-                    consecutive = self._check_consecutive_generations(years)
-                    if consecutive >= min_generations:
-                        seogwa_families.append({
-                            '성관': name,
-                            '총급제자수': len(group),
-                            '연속세대': consecutive,
-                            '시작년도': int(years[0]),
-                            '종료년도': int(years[-1]),
-                            '기간': int(years[-1] - years[0])
-                        })
-        
-        seogwa_df = pd.DataFrame(seogwa_families)
+        # 전체를 (성관, 시험년)으로 한 번 정렬하여 모든 성관의 최장 연속 세대 계산
+        runs = clan_runs(self.combined_df)
+        found = runs[(runs['급제자수'] >= min_generations)
+                     & (runs['연도확인수'] >= min_generations)
+                     & (runs['최대연속세대'] >= min_generations)]
+        
+        seogwa_df = pd.DataFrame({
+            '성관': found.index.astype(object),
+            '총급제자수': found['급제자수'].to_numpy(),
+            '연속세대': found['최대연속세대'].to_numpy(),
+            '시작년도': found['최초년도'].to_numpy(dtype=np.int64),
+            '종료년도': found['최종년도'].to_numpy(dtype=np.int64),
+            '기간': (found['최종년도'] - found['최초년도']).to_numpy(dtype=np.int64)
+        })
         if not seogwa_df.empty:
             seogwa_df = seogwa_df.sort_values('총급제자수', ascending=False)
             print(f"\n세과 가문 {len(seogwa_df)}개 발견")
@@ -285,46 +410,34 @@ class KinshipAnalyzer:
         
         return seogwa_df
     
-    def _check_consecutive_generations(self, years, gen_gap_min=20, gen_gap_max=40):
-        """연속 세대 확인 (세대 간격 20-40년)"""
-        if len(years) < 2:
-            return 1
+    def analyze_seogwa_sensitivity(self, gap_mins=GAP_MIN_GRID, gap_maxs=GAP_MAX_GRID,
+                                   min_generations=(2, 3, 4)):
+        """세과 판정 기준(세대 간격 하한/상한, 최소 연속 세대) 민감도 분석"""
+        print("\n[세과 기준 민감도 분석]")
+        print("-" * 60)
         
-        consecutive = 1
-        max_consecutive = 1
+        sweep = sweep_thresholds(self.combined_df, gap_mins, gap_maxs, min_generations)
+        print(f"격자 {len(sweep)}칸 (간격 하한 {len(gap_mins)}개 × 상한 {len(gap_maxs)}개 "
+              f"× 최소 세대 {len(min_generations)}개)")
         
-        for i in range(1, len(years)):
-            gap = years[i] - years[i-1]
-            if gen_gap_min <= gap <= gen_gap_max:
-                consecutive += 1
-                max_consecutive = max(max_consecutive, consecutive)
-            else:
-                consecutive = 1
+        for generations, table in sweep.groupby('최소세대'):
+            print(f"\n최소 {generations}대 연속 세과 가문 수 (행: 간격 하한, 열: 간격 상한)")
+            print(table.pivot(index='최소간격', columns='최대간격', values='세과가문수').to_string())
         
-        return max_consecutive
+        return sweep
     
     def analyze_period_changes(self):
         """시대별 변화 분석"""
         print("\n[3] 시대별 급제 패턴 변화 분석")
         print("-" * 60)
         
-        df = self.combined_df.copy()
-        
-        # 시대 구분
-        def categorize_period(year):
-            if pd.isna(year):
-                return '미상'
-            if year < 1494:  # 성종 25년
-                return '조선 전기'
-            elif year < 1608:  # 선조 41년
-                return '조선 중기'
-            else:
-                return '조선 후기'
-        
-        df['시대'] = df['시험년_int'].apply(categorize_period)
+        # 시대 구분 (조선 전기/중기/후기, 시험년 미상은 '미상')
+        scheme = get_scheme('3-era')
+        df = self.context.with_columns(시대=self.context.era(scheme, unknown='미상'))
+        by_period = df.groupby('시대', observed=True)
         
         # 시대별 통계
-        period_stats = df.groupby('시대').agg({
+        period_stats = by_period.agg({
             '급제자': 'count',
             '성관': 'nunique'
         }).rename(columns={'급제자': '급제자수', '성관': '성관수'})
@@ -337,11 +450,11 @@ class KinshipAnalyzer:
         
         # 시대별 상위 성관
         print("\n시대별 상위 5개 성관:")
-        for period in ['조선 전기', '조선 중기', '조선 후기']:
-            period_data = df[df['시대'] == period]
-            if not period_data.empty:
+        for period in scheme.labels:
+            if period in by_period.groups:
+                period_data = by_period.get_group(period)
                 print(f"\n{period}:")
-                top_families = period_data['성관'].value_counts().head(5)
+                top_families = count_codes(period_data['성관']).head(5)
                 for family, count in top_families.items():
                     print(f"  {family}: {count}명")
         
@@ -352,11 +465,8 @@ class KinshipAnalyzer:
         print("\n[4] 거주지별 급제자 분포 분석")
         print("-" * 60)
         
-        # 거주지 정보가 있는 데이터
-        df = self.combined_df[self.combined_df['거주지'] != ''].copy()
-        
-        # 거주지별 통계
-        geo_stats = df['거주지'].value_counts().head(20)
+        # 거주지별 통계 (거주지 정보가 없는 행 제외)
+        geo_stats = self.context.cube('거주지').ranked('거주지', exclude=['']).head(20)
         
         print(f"\n상위 20개 거주지:")
         print(geo_stats)
@@ -446,14 +556,24 @@ class KinshipAnalyzer:
         return fig
 
 
-def main():
+def main(argv=None):
     """메인 실행 함수"""
+    arg_parser = argparse.ArgumentParser(description="조선시대 과거제 급제자 혈연관계 분석")
+    add_loader_arguments(arg_parser)
+    arg_parser.add_argument('--sweep', action='store_true',
+                            help='세과 판정 기준 격자 민감도 분석 실행 (세과_민감도.csv)')
+    arg_parser.add_argument('--link', action='store_true',
+                            help='사마시·문과·무과 동일 인물 연결 (인물_연결표.csv)')
+    arg_parser.add_argument('--lineage', action='store_true',
+                            help='무과 부명으로 부자 계보 구성 (무과_부자계보.csv)')
+    args = arg_parser.parse_args(argv)
+    
     print("조선시대 과거제 급제자 혈연관계 분석 프로그램")
     print("=" * 60)
     
     # 1단계: 데이터 파싱
-    parser = KwagwaDataParser(".")
-    data = parser.load_all_data()
+    parser = KwagwaDataParser.from_args(args)
+    data = parser.load_all_data(columns=KinshipAnalyzer.REQUIRED_COLUMNS)
     
     # 2단계: 혈연관계 분석
     analyzer = KinshipAnalyzer(data)
@@ -477,6 +597,33 @@ def main():
         results['period'].to_csv('시대별_통계.csv', encoding='utf-8-sig')
         print("  → 시대별_통계.csv 저장 완료")
     
+    if args.sweep:
+        sweep = analyzer.analyze_seogwa_sensitivity()
+        sweep.to_csv('세과_민감도.csv', encoding='utf-8-sig', index=False)
+        print("  → 세과_민감도.csv 저장 완료")
+    
+    if args.link:
+        linkage_data = {exam_type: parser.load_exam(exam_type, LINKAGE_COLUMNS)
+                        for exam_type in DEFAULT_EXAMS}
+        crosswalk = link_exams(linkage_data)
+        print("\n급제 과거 조합별 인원:")
+        print(progression_counts(crosswalk).to_string())
+        crosswalk.to_csv('인물_연결표.csv', encoding='utf-8-sig', index=False)
+        print("  → 인물_연결표.csv 저장 완료")
+    
+    if args.lineage:
+        graph = LineageGraph.from_frame(parser.load_exam('무과', LINEAGE_COLUMNS))
+        clans = graph.clan_table()
+        lineage = clans[clans['부자급제수'] > 0].sort_values(
+            ['부자연속세대', '부자급제수'], ascending=False, kind='stable')
+        print(f"\n무과 부자 계보: 급제자 {len(graph)}명 중 아버지도 급제한 {graph.n_edges}명")
+        for generations in (2, 3):
+            print(f"  {generations}대 이상 성관 - 부자 계보: "
+                  f"{(clans['부자연속세대'] >= generations).sum()}개, "
+                  f"세대 간격 추정: {(clans['간격추정세대'] >= generations).sum()}개")
+        lineage.to_csv('무과_부자계보.csv', encoding='utf-8-sig')
+        print("  → 무과_부자계보.csv 저장 완료")
+    
     print("\n모든 분석 완료!")
 
 
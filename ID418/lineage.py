@@ -0,0 +1,177 @@
+"""
+무과 부명(父名) 기반 부자(父子) 계보 그래프
+
+급제자의 부명을 같은 성관 안에서 먼저 급제한 급제자 이름과 맞춰 아버지 행을 찾는다.
+(성관, 이름) 키를 한 사전으로 인코딩하고 (키, 시험년)으로 정렬한 배열에 np.searchsorted를 한 번
+적용하여, 모든 급제자에 대해 "같은 성관·같은 이름 중 자신보다 먼저 급제한 가장 최근 급제자"를
+한꺼번에 구한다.
+
+그래프는 행마다 아버지 행 번호(parent, 없으면 -1)와, 아버지별 자식 목록을 CSR 형태
+(child_ptr 시작 위치 + children 행 번호)로 저장한다. 조상 조회는 parent 포인터를 따라가고,
+후손 조회는 CSR 구간을 세대 단위로 펼치므로 DataFrame을 다시 훑지 않는다.
+
+세대 깊이(뿌리 조상으로부터 몇 대째인지)는 모든 행의 포인터를 한 세대씩 동시에 따라가
+최대 깊이만큼의 반복으로 구하고, 이를 성관별로 모아 실제 부자 연속 급제 세대 수를 얻는다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from continuity import segment_max_runs
+
+# 계보 구성에 필요한 원본 컬럼
+LINEAGE_COLUMNS = ('급제자', '본관', '시험년', '부명')
+
+
+def _expand(ptr, indices, nodes):
+    """CSR 구간 펼치기: nodes 각각의 indices[ptr[v]:ptr[v+1]]을 이어 붙인 배열"""
+    starts = ptr[nodes]
+    sizes = ptr[nodes + 1] - starts
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return indices[np.repeat(starts, sizes) + offsets]
+
+
+class LineageGraph:
+    """급제자 부자 관계 그래프 (행 번호가 노드)"""
+
+    def __init__(self, parent, clans, clan_labels, years):
+        """
+        Args:
+            parent: 행별 아버지 행 번호 (없으면 -1)
+            clans: 행별 성관 코드 (결측 -1)
+            clan_labels: 성관 코드 → 성관 Index
+            years: 행별 시험년 (미상은 NaN)
+        """
+        self.parent = parent
+        self.clans = clans
+        self.clan_labels = clan_labels
+        self.years = years
+
+        # 아버지별 자식 목록 (CSR, 자식은 행 순)
+        has_parent = np.flatnonzero(parent >= 0)
+        order = np.argsort(parent[has_parent], kind='stable')
+        self.children = has_parent[order]
+        self.child_ptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(parent[has_parent], minlength=len(parent)))])
+        self._depth = None
+
+    @classmethod
+    def from_frame(cls, df, name_column='급제자', father_column='부명', year_column='시험년'):
+        """무과 원본 DataFrame에서 그래프 생성
+
+        부명은 같은 성관(급제자 성씨 + 본관)에서 자신보다 먼저 급제한 같은 이름의 급제자로 연결하며,
+        후보가 여럿이면 가장 최근에 급제한 사람을 아버지로 본다.
+        """
+        names = df[name_column].astype('string').str.strip()
+        fathers = df[father_column].astype('string').str.strip()
+        clan_text = names.str[0] + ' ' + df['본관'].astype('string').str.strip()
+        clans, clan_labels = pd.factorize(clan_text.mask(clan_text.str.len() < 3), sort=True)
+        years = pd.to_numeric(df[year_column], errors='coerce').to_numpy(
+            dtype=np.float64, na_value=np.nan)
+        if not ((clans >= 0) & ~np.isnan(years)).any():
+            raise ValueError("성관과 시험년이 모두 있는 급제자가 없습니다 "
+                             "(무과 태그 배치는 exam_schema.MUGWA_SCHEMA 참고)")
+
+        # (성관, 이름)과 (성관, 부명)을 한 사전으로 인코딩
+        keys = pd.concat([clan_text + '|' + names, clan_text + '|' + fathers], ignore_index=True)
+        key_codes, _ = pd.factorize(keys)
+        own, wanted = key_codes[:len(df)], key_codes[len(df):]
+        own[clans < 0] = -1
+
+        # 급제자를 (이름 키, 시험년)으로 정렬해 두고, 아들마다 (부명 키, 자기 시험년) 바로 앞 위치를 찾는다
+        dated = np.flatnonzero((own >= 0) & ~np.isnan(years))
+        stride = np.nanmax(years, initial=0) + 1
+        sorted_keys = own[dated] * stride + years[dated]
+        order = np.argsort(sorted_keys, kind='stable')
+        sorted_keys, dated = sorted_keys[order], dated[order]
+
+        parent = np.full(len(df), -1, dtype=np.int64)
+        sons = np.flatnonzero((wanted >= 0) & (clans >= 0) & ~np.isnan(years))
+        position = np.searchsorted(sorted_keys, wanted[sons] * stride + years[sons],
+                                   side='left') - 1
+        found = position >= 0
+        candidate = dated[np.maximum(position, 0)]
+        found &= own[candidate] == wanted[sons]
+        parent[sons[found]] = candidate[found]
+
+        return cls(parent, clans.astype(np.int64), pd.Index(clan_labels, name='성관'), years)
+
+    def __len__(self):
+        return len(self.parent)
+
+    @property
+    def n_edges(self):
+        return int((self.parent >= 0).sum())
+
+    def ancestors(self, node, max_generations=None):
+        """아버지, 할아버지, ... 순서의 조상 행 번호 배열"""
+        lineage = []
+        current = self.parent[node]
+        while current >= 0 and (max_generations is None or len(lineage) < max_generations):
+            lineage.append(current)
+            current = self.parent[current]
+        return np.asarray(lineage, dtype=np.int64)
+
+    def descendants(self, node, max_generations=None):
+        """자식, 손자, ... 세대 순서의 후손 행 번호 배열"""
+        levels = []
+        frontier = np.array([node], dtype=np.int64)
+        while len(frontier) and (max_generations is None or len(levels) < max_generations):
+            frontier = _expand(self.child_ptr, self.children, frontier)
+            levels.append(frontier)
+        return np.concatenate(levels) if levels else np.zeros(0, dtype=np.int64)
+
+    @property
+    def depth(self):
+        """행별 세대 깊이 (계보상 조상이 없으면 0, 아버지만 있으면 1, ...)"""
+        if self._depth is None:
+            depth = np.zeros(len(self.parent), dtype=np.int64)
+            current = self.parent.copy()
+            while True:
+                linked = current >= 0
+                if not linked.any():
+                    break
+                depth += linked
+                current[linked] = self.parent[current[linked]]
+            self._depth = depth
+        return self._depth
+
+    def chains(self, generations):
+        """generations대 부자 연속 급제 사슬 전체
+
+        Returns:
+            (사슬 수 × generations) 행 번호 행렬, 각 행은 윗대부터 아랫대 순
+        """
+        ends = np.flatnonzero(self.depth >= generations - 1)
+        columns = [ends]
+        for _ in range(generations - 1):
+            columns.append(self.parent[columns[-1]])
+        return np.column_stack(columns[::-1]) if len(ends) else np.zeros((0, generations),
+                                                                            dtype=np.int64)
+
+    def clan_table(self):
+        """성관별 부자 연속 급제 세대 수와 세대 간격 추정치 비교표
+
+        Returns:
+            DataFrame: 성관 인덱스, 급제자수/부자급제수/부자연속세대/간격추정세대 컬럼
+                       (간격추정세대는 continuity의 20~40년 간격 휴리스틱)
+        """
+        n_clans = len(self.clan_labels)
+        valid = self.clans >= 0
+        clans = self.clans[valid]
+
+        total = np.bincount(clans, minlength=n_clans)
+        edges = np.bincount(clans[self.parent[valid] >= 0], minlength=n_clans)
+        chain = np.zeros(n_clans, dtype=np.int64)
+        np.maximum.at(chain, clans, self.depth[valid] + 1)
+
+        dated = valid & ~np.isnan(self.years)
+        order = np.lexsort((self.years[dated], self.clans[dated]))
+        heuristic = segment_max_runs(self.clans[dated][order], self.years[dated][order], n_clans)
+
+        return pd.DataFrame({
+            '급제자수': total,
+            '부자급제수': edges,
+            '부자연속세대': chain,
+            '간격추정세대': heuristic
+        }, index=self.clan_labels)
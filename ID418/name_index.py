@@ -0,0 +1,146 @@
+"""
+급제자 이름 글자 위치 색인 (항렬자 분석용)
+
+급제자명의 1·2·3번째 글자를 하나의 글자 사전으로 인코딩한 정수 코드 행렬(급제자 × 위치)과,
+(성관, 위치, 글자) 키 → 행 번호 목록의 역색인을 만든다. 외자 성씨가 대부분이므로 1번째 글자는
+성씨, 2·3번째 글자가 이름이며 항렬자는 보통 2번째(또는 3번째) 글자에 온다.
+
+역색인은 키를 안정 정렬한 행 번호 배열과 키별 시작 위치(CSR 형태)로 저장하므로,
+키 하나의 급제자 목록은 searchsorted 한 번으로, 모든 (성관, 위치, 글자)의 사용 횟수와
+사용 연도 범위는 구간 경계의 reduceat 한 번으로 구한다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes
+from prepared_store import derived_column
+
+# 색인하는 글자 위치 (1부터)
+POSITIONS = (1, 2, 3)
+
+# 항렬자 후보 위치 (이름 첫 글자/둘째 글자)
+GENERATION_POSITIONS = (2, 3)
+
+
+class NameIndex:
+    """급제자명 글자 코드 행렬과 (성관, 위치, 글자) 역색인"""
+
+    def __init__(self, syllables, characters, clans, clan_labels, years):
+        """
+        Args:
+            syllables: (급제자 × 위치) 글자 코드 행렬 (글자가 없으면 -1)
+            characters: 글자 사전 (코드 → 글자 Index)
+            clans: 행별 성관 코드 (결측 -1)
+            clan_labels: 성관 코드 → 성관 Index
+            years: 행별 시험년 (미상은 NaN)
+        """
+        self.syllables = syllables
+        self.characters = characters
+        self.clans = clans
+        self.clan_labels = clan_labels
+        self.years = years
+
+        # 역색인: 키 = (성관 × 위치 수 + 위치) × 글자 수 + 글자, 키 순(같은 키는 행 순)으로 행 번호
+        n_positions = syllables.shape[1]
+        keys = ((clans[:, None] * n_positions + np.arange(n_positions)) * len(characters)
+                + syllables)
+        valid = (clans[:, None] >= 0) & (syllables >= 0)
+        rows = np.broadcast_to(np.arange(len(clans))[:, None], keys.shape)[valid]
+        keys = keys[valid]
+        order = np.argsort(keys, kind='stable')
+        self.rows_by_key = rows[order]
+        self.keys, starts = np.unique(keys[order], return_index=True)
+        self.key_starts = np.append(starts, len(order))
+
+    @classmethod
+    def from_frame(cls, df, family='성관', name_column='급제자', year_column='시험년_int'):
+        """전처리 DataFrame에서 색인 생성 (family 컬럼은 인코딩/범주형)"""
+        names = df[name_column]
+        # 세 위치의 글자를 한 사전으로 인코딩 (사전은 글자 순 정렬)
+        letters = pd.concat([names.str[p - 1] for p in POSITIONS], ignore_index=True)
+        letter_codes, characters = pd.factorize(letters, sort=True)
+        syllables = letter_codes.reshape(len(POSITIONS), len(df)).T.copy()
+
+        return cls(syllables, pd.Index(characters, name='글자'),
+                   codes(df[family]).astype(np.int64), df[family].cat.categories,
+                   df[year_column].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def syllable(self, position):
+        """position번째 글자의 코드 배열 (글자가 없으면 -1)"""
+        return self.syllables[:, POSITIONS.index(position)]
+
+    def _key(self, clan, position, char):
+        clan_code = self.clan_labels.get_loc(clan)
+        char_code = self.characters.get_loc(char)
+        return ((clan_code * len(POSITIONS) + POSITIONS.index(position)) * len(self.characters)
+                + char_code)
+
+    def rows(self, clan, position, char):
+        """성관 clan에서 position번째 글자가 char인 급제자의 행 번호 (행 순)"""
+        try:
+            key = self._key(clan, position, char)
+        except KeyError:
+            return np.zeros(0, dtype=np.int64)
+        i = np.searchsorted(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return np.zeros(0, dtype=np.int64)
+        return self.rows_by_key[self.key_starts[i]:self.key_starts[i + 1]]
+
+    def shared_characters(self, positions=GENERATION_POSITIONS, min_count=3, min_family=5):
+        """성관별로 여러 급제자가 같은 위치에 쓴 글자(항렬자 후보)와 사용 연도 범위
+
+        Args:
+            positions: 볼 글자 위치
+            min_count: 같은 글자를 쓴 최소 급제자 수
+            min_family: 성관의 최소 급제자 수
+
+        Returns:
+            DataFrame: 성관/위치/항렬자/사용횟수/성관급제자수/최초년도/최종년도/연도확인수 컬럼,
+                       성관 코드·위치 순, 성관·위치 안에서는 사용횟수 내림차순
+                       (동률은 데이터에 처음 나타난 순서)
+        """
+        starts, ends = self.key_starts[:-1], self.key_starts[1:]
+        counts = ends - starts
+        n_chars = len(self.characters)
+        char_codes = self.keys % n_chars
+        position_codes = (self.keys // n_chars) % len(POSITIONS)
+        clan_codes = self.keys // (n_chars * len(POSITIONS))
+
+        clan_totals = np.bincount(self.clans[self.clans >= 0], minlength=len(self.clan_labels))
+        wanted = [POSITIONS.index(p) for p in positions]
+        keep = ((counts >= min_count) & (clan_totals[clan_codes] >= min_family)
+                & np.isin(position_codes, wanted))
+
+        # 키 구간별 연도 범위 (NaN 무시)
+        years = self.years[self.rows_by_key]
+        first_year = np.full(len(self.keys), np.nan)
+        last_year = np.full(len(self.keys), np.nan)
+        dated = np.zeros(len(self.keys), dtype=np.int64)
+        if len(self.keys):
+            first_year = np.fmin.reduceat(years, starts)
+            last_year = np.fmax.reduceat(years, starts)
+            dated = np.add.reduceat(~np.isnan(years), starts)
+
+        # 안정 정렬이므로 구간 첫 행이 그 글자를 처음 쓴 급제자
+        first_row = self.rows_by_key[starts]
+        order = np.lexsort((first_row[keep], -counts[keep], position_codes[keep],
+                            clan_codes[keep]))
+        selected = np.flatnonzero(keep)[order]
+        return pd.DataFrame({
+            '성관': self.clan_labels[clan_codes[selected]],
+            '위치': np.asarray(POSITIONS)[position_codes[selected]],
+            '항렬자': self.characters[char_codes[selected]],
+            '사용횟수': counts[selected],
+            '성관급제자수': clan_totals[clan_codes[selected]],
+            '최초년도': first_year[selected],
+            '최종년도': last_year[selected],
+            '연도확인수': dated[selected]
+        })
+
+
+def name_index(df, family='성관', name_column='급제자', year_column='시험년_int'):
+    """전처리 DataFrame의 이름 글자 색인 (DataFrame별로 캐시)"""
+    return derived_column(df, ('name_index', family, name_column, year_column),
+                          lambda frame: NameIndex.from_frame(frame, family, name_column,
+                                                             year_column))
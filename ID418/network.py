@@ -0,0 +1,234 @@
+"""
+동방(同榜) 성관 관계망 - 같은 회차 시험에 함께 급제한 성관끼리의 희소 네트워크
+
+과거 종류마다 (과거구분, 시험명, 시험년)을 한 회차로 보고 (시험명이 없는 무과는 (과거구분, 시험년)이라
+같은 해의 무과가 한 회차로 합쳐져 무과 연결이 부풀려진다),
+회차 × 성관 급제자 수 희소 행렬 B를
+scipy.sparse로 만든 뒤 W = Bᵀ B (대각 제거)를 성관 × 성관 가중 인접 행렬로 쓴다.
+W[a, b]는 같은 회차에서 함께 급제한 (a 성관 급제자, b 성관 급제자) 쌍의 수이다.
+네 과거의 모든 회차를 합쳐도 밀집 행렬은 만들지 않는다. 과거별로 성관과 회차가 모두 확인되어
+그래프에 반영된 급제자 수(coverage)를 함께 기록하여, 빠진 과거가 조용히 사라지지 않게 한다.
+
+- weighted_degree : 가중 연결도 (W 행 합)
+- pagerank        : 희소 행렬-벡터 곱 반복(power iteration)으로 구한 PageRank 중심성
+- communities     : 모듈성 행렬 B = W - k kᵀ / 2m을 곱셈 연산자(LinearOperator)로만 다루는
+                    Newman 선도 고유벡터 분할 (scipy.sparse.linalg.eigsh)을 반복 적용한 공동체
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from prepared_store import clan_columns
+
+# 관계망 구성에 필요한 원본 컬럼 (무과에는 시험명이 없어 시험년으로만 회차를 구분)
+SESSION_COLUMNS = ('급제자', '본관', '시험명', '시험년')
+
+# 기본 대상 과거
+EXAM_TYPES = ('문과', '사마시', '잡과', '무과')
+
+DAMPING = 0.85
+
+# 분할을 계속하는 최소 모듈성 증가량
+MIN_MODULARITY_GAIN = 1e-6
+
+# 이 크기 이하의 부분 그래프는 모듈성 행렬을 직접 만들어 고유값 분해
+DENSE_SPLIT_SIZE = 64
+
+
+def session_members(df, exam_type):
+    """과거 원본 DataFrame → (성관 문자열, 회차 문자열) Series 쌍 (결측은 NA)
+
+    성관은 분석용 전처리와 같은 키(prepared_store.clan_columns)이다. 다만 본관이 빈 급제자는
+    같은 성씨끼리 '김 ' 같은 한 노드로 묶여 가짜 허브가 되므로 관계망에서는 뺀다.
+
+    무과에는 시험명이 없어 같은 해의 급제자를 모두 한 회차로 본다. 같은 해에 여러 번 치른
+    시험이 하나로 합쳐지므로 무과 회차는 실제보다 크고, 무과 동방 연결(가중치)도 부풀려진다.
+    """
+    clans = pd.Series(clan_columns(df)['성관'], index=df.index).astype('string')
+    clans = clans.mask(df['본관'].astype('string').str.strip() == '')
+
+    years = pd.to_numeric(df['시험년'], errors='coerce').astype('Int64').astype('string')
+    if '시험명' in df.columns:
+        sessions = exam_type + '|' + df['시험명'].astype('string') + '|' + years
+    else:
+        # 무과: 연도만으로 회차 구분 (위 설명 참고)
+        sessions = exam_type + '|' + years
+    return clans, sessions
+
+
+class ClanNetwork:
+    """성관 × 성관 동방 가중 희소 그래프"""
+
+    def __init__(self, adjacency, clan_labels, passers, n_sessions, coverage=None):
+        """
+        Args:
+            adjacency: 대칭 CSR 가중 인접 행렬 (대각 0)
+            clan_labels: 노드 번호 → 성관 Index
+            passers: 성관별 (회차가 확인된) 급제자 수
+            n_sessions: 회차 수
+            coverage: 과거구분 인덱스, 급제자수/반영수 컬럼 DataFrame (from_exams가 채움)
+        """
+        self.adjacency = adjacency
+        self.clan_labels = clan_labels
+        self.passers = passers
+        self.n_sessions = n_sessions
+        self.coverage = coverage
+
+    @classmethod
+    def from_exams(cls, data, exam_types=EXAM_TYPES):
+        """과거구분 → 원본 DataFrame 딕셔너리에서 관계망 생성"""
+        members = [session_members(data[exam_type], exam_type) for exam_type in exam_types]
+        clans = pd.concat([m[0] for m in members], ignore_index=True)
+        sessions = pd.concat([m[1] for m in members], ignore_index=True)
+
+        clan_codes, clan_labels = pd.factorize(clans, sort=True)
+        session_codes, session_labels = pd.factorize(sessions)
+        valid = (clan_codes >= 0) & (session_codes >= 0)
+        clan_codes, session_codes = clan_codes[valid], session_codes[valid]
+
+        # 과거별 전체 급제자 수와 그래프에 반영된 급제자 수
+        exam_codes = np.repeat(np.arange(len(exam_types)), [len(m[0]) for m in members])
+        coverage = pd.DataFrame({
+            '급제자수': [len(m[0]) for m in members],
+            '반영수': np.bincount(exam_codes[valid], minlength=len(exam_types))
+        }, index=pd.Index(list(exam_types), name='과거구분'))
+
+        # 회차 × 성관 급제자 수 (중복 좌표는 합산됨)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(clan_codes)), (session_codes, clan_codes)),
+            shape=(len(session_labels), len(clan_labels)))
+        adjacency = (incidence.T @ incidence).tocsr()
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+
+        passers = np.bincount(clan_codes, minlength=len(clan_labels))
+        return cls(adjacency, pd.Index(clan_labels, name='성관'), passers, len(session_labels),
+                   coverage)
+
+    def __len__(self):
+        return self.adjacency.shape[0]
+
+    @property
+    def n_edges(self):
+        return self.adjacency.nnz // 2
+
+    def weighted_degree(self):
+        """성관별 가중 연결도"""
+        return np.asarray(self.adjacency.sum(axis=1)).ravel()
+
+    def pagerank(self, damping=DAMPING, tol=1e-10, max_iter=200):
+        """PageRank 중심성 (합 1, 연결이 없는 성관의 몫은 전체에 고르게 분배)"""
+        n = len(self)
+        strength = self.weighted_degree()
+        inverse = np.divide(1.0, strength, out=np.zeros(n), where=strength > 0)
+        dangling = strength == 0
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            # 인접 행렬이 대칭이므로 전이 행렬의 전치 곱은 W @ (rank / strength)
+            updated = damping * (self.adjacency @ (rank * inverse) + rank[dangling].sum() / n)
+            updated += (1 - damping) / n
+            converged = np.abs(updated - rank).sum() < tol
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def communities(self):
+        """모듈성 선도 고유벡터 반복 분할 공동체 번호 (0이 가장 큰 공동체)"""
+        n = len(self)
+        strength = self.weighted_degree()
+        two_m = strength.sum()
+        labels = np.zeros(n, dtype=np.int64)
+        if two_m == 0:
+            return np.arange(n)
+
+        # 연결 요소부터 나누고, 각 요소를 모듈성이 늘어나는 동안 이분할
+        _, components = connected_components(self.adjacency, directed=False)
+        pending = [np.flatnonzero(components == c) for c in range(components.max() + 1)]
+        groups = []
+        while pending:
+            nodes = pending.pop()
+            halves = self._bisect(nodes, strength, two_m)
+            if halves is None:
+                groups.append(nodes)
+            else:
+                pending.extend(halves)
+
+        # 크기 내림차순 (같으면 가장 앞 노드 순)으로 번호
+        groups.sort(key=lambda g: (-len(g), g.min()))
+        for number, nodes in enumerate(groups):
+            labels[nodes] = number
+        return labels
+
+    def _bisect(self, nodes, strength, two_m):
+        """부분 그래프 모듈성 행렬의 선도 고유벡터 부호로 이분할 (이득이 없으면 None)"""
+        size = len(nodes)
+        if size < 2:
+            return None
+        sub = self.adjacency[nodes][:, nodes]
+        k = strength[nodes]
+        # 부분 그래프 모듈성 행렬 B(g) = A_g - k kᵀ/2m - diag(A_g 행 합 - k_i Σk/2m)
+        diagonal = np.asarray(sub.sum(axis=1)).ravel() - k * k.sum() / two_m
+
+        def matvec(x):
+            x = np.ravel(x)
+            return sub @ x - k * (k @ x) / two_m - diagonal * x
+
+        if size <= DENSE_SPLIT_SIZE:
+            values, vectors = np.linalg.eigh(np.column_stack([matvec(e) for e in np.eye(size)]))
+            value, vector = values[-1], vectors[:, -1]
+        else:
+            operator = LinearOperator((size, size), matvec=matvec, dtype=np.float64)
+            start = np.random.default_rng(0).random(size)
+            values, vectors = eigsh(operator, k=1, which='LA', v0=start)
+            value, vector = values[0], vectors[:, 0]
+        if value <= MIN_MODULARITY_GAIN:
+            return None
+
+        side = vector > 0
+        signs = np.where(side, 1.0, -1.0)
+        gain = signs @ matvec(signs) / (2 * two_m)
+        if gain <= MIN_MODULARITY_GAIN or side.all() or not side.any():
+            return None
+        return nodes[side], nodes[~side]
+
+    def modularity(self, labels):
+        """공동체 번호 배열의 모듈성 Q"""
+        strength = self.weighted_degree()
+        two_m = strength.sum()
+        if two_m == 0:
+            return 0.0
+        edges = self.adjacency.tocoo()
+        inside = edges.data[labels[edges.row] == labels[edges.col]].sum() / two_m
+        totals = np.bincount(labels, weights=strength) / two_m
+        return float(inside - (totals ** 2).sum())
+
+    def node_table(self, labels=None):
+        """성관별 급제자수/연결성관수/가중연결도/페이지랭크/공동체 표 (성관 순)"""
+        if labels is None:
+            labels = self.communities()
+        return pd.DataFrame({
+            '급제자수': self.passers,
+            '연결성관수': np.diff(self.adjacency.indptr),
+            '가중연결도': self.weighted_degree(),
+            '페이지랭크': self.pagerank(),
+            '공동체': labels
+        }, index=self.clan_labels)
+
+
+def clan_network(data, exam_types=EXAM_TYPES):
+    """관계망 생성 (소요 시간 출력)"""
+    start = time.perf_counter()
+    network = ClanNetwork.from_exams(data, exam_types)
+    elapsed = time.perf_counter() - start
+    print(f"동방 관계망: 회차 {network.n_sessions}개, 성관 {len(network)}개, "
+          f"연결 {network.n_edges}개 ({elapsed * 1000:.1f}ms)")
+    for exam_type, row in network.coverage.iterrows():
+        print(f"  {exam_type}: {row['급제자수']}명 중 {row['반영수']}명 반영")
+    return network
@@ -0,0 +1,132 @@
+"""
+귀무모형 몬테카를로 검정 - "이 집중도가 우연보다 큰가?"
+
+관측 지표를 무작위 배정으로 만든 귀무분포와 비교하여 경험적 p값
+(1 + 귀무값 ≥ 관측값인 복제 수) / (1 + 복제 수)를 구한다 (한쪽 검정).
+
+귀무모형은 연도순열이다. 성관별 급제자 수와 시험년별 급제자 수를 모두 고정하고
+급제자의 시험년을 섞는다 (성관을 섞는 것과 같은 모형).
+- 시대별 집중도: 시대마다 성관별 급제자 수로 구한 지니계수/상위10%점유.
+  성관 규모와 시대별 급제자 수는 그대로이므로, 한 시대 안의 집중이 성관 규모만으로
+  설명되는지(특정 시기에 몰려 급제했는지)를 검정한다.
+- 세과 가문 수: 세대 간격으로 이어진 연속 급제 세대 수가 기준 이상인 성관 수.
+
+복제는 배치 단위로 rng.permuted로 섞은 (복제 × 급제자) 연도 행렬 하나에서 두 지표를 함께 구한다.
+집중도는 (복제, 시대, 성관) 키의 np.bincount와 inequality.row_inequality로,
+세과 가문 수는 (성관, 연도) 키로 행마다 정렬한 뒤 continuity.segment_max_runs 한 번으로 계산한다.
+시드 분할과 프로세스 풀 실행은 resampling과 같은 방식이다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from continuity import GEN_GAP_MAX, GEN_GAP_MIN, segment_max_runs, sorted_clan_years
+from era_binning import get_scheme
+from inequality import row_inequality
+from resampling import DEFAULT_SEED, chunk_sizes, run_chunks
+
+# 배치 하나가 처리하는 복제 수 (행렬 크기 = 복제 수 × 급제자 수)
+BATCH_SIZE = 200
+
+# 시대별로 검정하는 집중도 지표
+CONCENTRATION_METRICS = ['지니계수', '상위10%점유']
+
+
+def seogwa_label(generations):
+    """세과 가문 수 지표 이름"""
+    return f'세과가문수({generations}대+)'
+
+
+def era_concentration(clans, eras, n_clans, n_eras, top_fraction):
+    """(복제 × 급제자) 성관/시대 코드 행렬 → 지표별 (복제 × 시대) 집중도 배열"""
+    n_reps = clans.shape[0]
+    keys = ((np.arange(n_reps) * n_eras)[:, None] + eras) * n_clans + clans
+    counts = np.bincount(keys.ravel(), minlength=n_reps * n_eras * n_clans)
+    metrics = row_inequality(counts.reshape(n_reps * n_eras, n_clans), top_fraction)
+    return {name: metrics[name].reshape(n_reps, n_eras) for name in CONCENTRATION_METRICS}
+
+
+def _permutation_batch(clans, years, year_eras, era_labels, n_clans, n_reps, seed,
+                       generations, gap_range, top_fraction):
+    """연도순열 복제 n_reps개의 시대별 집중도와 세과 가문 수 배열
+
+    clans는 오름차순 정렬된 성관 코드, years는 0부터 시작하는 정수 연도,
+    year_eras는 정수 연도 → 시대 코드 표이다.
+    """
+    rng = np.random.default_rng(seed)
+    span = int(years.max()) + 1
+    shuffled = rng.permuted(np.broadcast_to(years, (n_reps, len(years))), axis=1)
+
+    concentration = era_concentration(np.broadcast_to(clans, shuffled.shape),
+                                      year_eras[shuffled], n_clans, len(era_labels),
+                                      top_fraction)
+    batch = {f'{name}({era})': values[:, i]
+             for name, values in concentration.items() for i, era in enumerate(era_labels)}
+
+    # 행마다 (성관, 연도) 순 정렬: 성관 순서는 그대로이고 성관 안에서만 연도가 정렬된다
+    keys = np.sort(clans * span + shuffled, axis=1)
+    segments = (np.arange(n_reps) * n_clans)[:, None] + keys // span
+    max_runs = segment_max_runs(segments.ravel(), (keys % span).ravel(),
+                                n_reps * n_clans, *gap_range).reshape(n_reps, n_clans)
+    batch.update({seogwa_label(g): (max_runs >= g).sum(axis=1) for g in generations})
+    return batch
+
+
+def null_model_test(df, family='성관', year_column='시험년_int', n_permutations=1000,
+                    seed=DEFAULT_SEED, workers=1, generations=(2, 3), scheme='3-era',
+                    top_fraction=0.1, gap_range=(GEN_GAP_MIN, GEN_GAP_MAX)):
+    """전처리 DataFrame의 시대별 집중도/세과 지표에 대한 연도순열 귀무모형 검정
+
+    Args:
+        df: 전처리 DataFrame (family 컬럼은 인코딩/범주형)
+        n_permutations: 복제 수
+        seed: 재현용 시드 (워커 수와 관계없이 같은 결과)
+        workers: 프로세스 수
+        generations: 세과 가문 수를 셀 최소 연속 세대 수 목록
+        scheme: 집중도를 나눠 볼 시대 구분 (era_binning 방식 이름 또는 EraScheme)
+
+    Returns:
+        DataFrame: 지표 인덱스('지니계수(조선 전기)' 등 시대별 집중도 + 세과 가문 수),
+                   귀무모형/관측값/귀무평균/귀무표준편차/p값 컬럼
+    """
+    clan_codes, years = sorted_clan_years(df, family, year_column)
+    first_year = years.min()
+    years = (years - first_year).astype(np.int64)
+
+    # 관측된 성관만 0..K-1로 다시 번호 (정렬 순서는 유지됨)
+    observed_clans, clans = np.unique(clan_codes, return_inverse=True)
+    n_clans = len(observed_clans)
+
+    # 정수 연도 → 시대 코드 표 (급제자가 있는 시대만 다시 번호)
+    scheme = get_scheme(scheme)
+    all_eras = np.asarray(scheme.bin(first_year + np.arange(years.max() + 1)).codes)
+    present = np.unique(all_eras[years])
+    year_eras = np.searchsorted(present, all_eras)
+    era_labels = [scheme.labels[code] for code in present]
+
+    concentration = era_concentration(clans[None, :], year_eras[years][None, :], n_clans,
+                                      len(era_labels), top_fraction)
+    observed = {f'{name}({era})': values[0, i]
+                for name, values in concentration.items() for i, era in enumerate(era_labels)}
+    observed_runs = segment_max_runs(clans, years, n_clans, *gap_range)
+    observed.update({seogwa_label(g): (observed_runs >= g).sum() for g in generations})
+
+    sizes = chunk_sizes(n_permutations, BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    batches = run_chunks(_permutation_batch, [
+        (clans, years, year_eras, era_labels, n_clans, n_reps, batch_seed,
+         generations, gap_range, top_fraction)
+        for n_reps, batch_seed in zip(sizes, seeds)], workers)
+
+    rows = []
+    for name in batches[0]:
+        null = np.concatenate([batch[name] for batch in batches])
+        rows.append({
+            '지표': name,
+            '귀무모형': '연도순열',
+            '관측값': observed[name],
+            '귀무평균': null.mean(),
+            '귀무표준편차': null.std(ddof=1),
+            'p값': (1 + np.sum(null >= observed[name])) / (1 + len(null))
+        })
+    return pd.DataFrame(rows).set_index('지표')
@@ -0,0 +1,129 @@
+"""
+분석용 전처리 DataFrame 공유 저장소
+
+KinshipAnalyzer, AdvancedKinshipAnalyzer, IntegratedVisualization 등이 각자
+prepare_data에서 같은 전처리(숫자 변환, 결측 제거, 성씨 추출, 성관 조합)를 반복하지 않도록
+(원본 DataFrame의 identity, 전처리 옵션)을 키로 결과를 한 번만 만들어 공유한다.
+성씨/본관/거주지/성관은 정수 코드 Categorical로 인코딩된다 (dictionary_encoding 참고).
+
+반환되는 DataFrame은 여러 분석기가 함께 쓰므로 읽기 전용으로 취급해야 한다.
+컬럼을 더하거나 바꿀 때는 df.assign(...) 등으로 새 DataFrame을 만든다
+(pandas Copy-on-Write로 기존 컬럼은 복사되지 않는다).
+
+Copy-on-Write는 pandas 3부터 항상 켜져 있다. pandas 2.x에서는 이 모듈을 불러올 때
+pd.options.mode.copy_on_write를 켜서 같은 동작을 보장한다 (켜지 않으면 assign 등이 컬럼을
+복사하거나, 공유 DataFrame의 열 뷰를 고친 값이 다른 분석기에 새어 나갈 수 있다).
+"""
+
+import time
+
+import pandas as pd
+
+from dictionary_encoding import encode_column, encode_pair
+
+# 저장소가 공유하는 DataFrame은 Copy-on-Write 전제 (pandas 3에서는 기본값이라 옵션이 폐지 예정)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# 기본 전처리에서 실수형(<이름>_int)으로 변환하는 컬럼
+BASE_NUMERIC = ('시험년', '생년')
+
+
+def clan_columns(df):
+    """성씨/본관/성관 인코딩 컬럼 dict
+
+    성씨는 급제자명의 첫 글자, 성관은 (성씨, 본관) 코드 쌍의 조합 '성씨 본관'이다
+    (어느 한쪽이 결측이면 결측). 전처리, 배포판 집계, 관계망이 모두 이 함수로 성관 키를 만든다.
+    """
+    surname = pd.Series(encode_column(df['급제자'].str[0]), index=df.index)
+    bongwan = pd.Series(encode_column(df['본관']), index=df.index)
+    return {'성씨': surname.array, '본관': bongwan.array, '성관': encode_pair(surname, bongwan)}
+
+
+class PreparedFrameStore:
+    """(원본 identity, 옵션) → 전처리 DataFrame 메모이즈 저장소"""
+
+    def __init__(self):
+        self._entries = {}
+        self._derived = {}
+
+    def get(self, source, numeric=BASE_NUMERIC, regions=None):
+        """전처리 DataFrame 반환 (같은 원본/옵션이면 이전 결과를 그대로 반환)
+
+        Args:
+            source: 과거 DataFrame (예: data['문과'])
+            numeric: <이름>_int 실수형 컬럼을 만들 원본 컬럼들
+            regions: 거주지 → 지역 분류 RegionGazetteer (주면 '지역' 컬럼 추가)
+        """
+        numeric = tuple(numeric)
+        key = (id(source), numeric, regions)
+        entry = self._entries.get(key)
+        # id는 원본이 해제되면 재사용될 수 있으므로 원본 객체 자체도 확인
+        if entry is not None and entry[0] is source:
+            return entry[1]
+
+        start = time.perf_counter()
+        if numeric == BASE_NUMERIC and regions is None:
+            df = self._prepare_base(source)
+        else:
+            # 기본 전처리 결과에 추가 컬럼만 덧붙임
+            base = self.get(source)
+            extra = {f'{col}_int': base[col].astype('float64')
+                     for col in numeric if col not in BASE_NUMERIC}
+            if regions is not None:
+                extra['지역'] = regions.classify(base['거주지'])
+            df = base.assign(**extra)
+        elapsed = time.perf_counter() - start
+
+        self._entries[key] = (source, df)
+        print(f"전처리 완료: {len(df)}개 레코드 ({elapsed * 1000:.1f}ms)")
+        return df
+
+    def _prepare_base(self, source):
+        """기본 전처리: 시험년/생년 실수형 변환, 결측 제거, 성씨/성관 컬럼"""
+        # 시험년/생년은 파서가 Int32로 읽어 오므로 실수형으로만 변환 (결측 → NaN)
+        df = source.assign(**{f'{col}_int': source[col].astype('float64')
+                              for col in BASE_NUMERIC})
+
+        # 결측치 처리
+        df = df.dropna(subset=['급제자', '본관'])
+
+        # 성씨/본관/성관/거주지 사전 인코딩
+        encoded = clan_columns(df)
+        if '거주지' in df.columns:
+            encoded['거주지'] = encode_column(df['거주지'])
+        return df.assign(**encoded)
+
+    def derived(self, frame, key, build):
+        """전처리 DataFrame에 딸린 파생 컬럼 캐시 (예: 시대 구분)
+
+        같은 DataFrame 객체와 key로 다시 요청하면 build(frame)를 다시 실행하지 않는다.
+        """
+        cache_key = (id(frame), key)
+        entry = self._derived.get(cache_key)
+        if entry is not None and entry[0] is frame:
+            return entry[1]
+        value = build(frame)
+        self._derived[cache_key] = (frame, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._derived.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# 프로세스 전체에서 공유하는 저장소
+STORE = PreparedFrameStore()
+
+
+def prepared_frame(source, numeric=BASE_NUMERIC, regions=None):
+    """공유 저장소에서 전처리 DataFrame 조회 (없으면 생성)"""
+    return STORE.get(source, numeric, regions)
+
+
+def derived_column(frame, key, build):
+    """공유 저장소에서 파생 컬럼 조회 (없으면 build(frame)로 생성)"""
+    return STORE.derived(frame, key, build)
@@ -0,0 +1,214 @@
+"""
+과거 종류 간 동일 인물 연결 (사마시 → 문과 → 무과 진출 추적)
+
+이름만으로 모든 행 쌍을 비교하면 (사마시 4만 × 문과 수만) 제곱 비용이 들므로,
+(성관, 생년)으로 정렬한 키 배열 위에서 생년 ± 허용오차 창(sorted neighborhood) 안의 행만
+후보로 삼는다. 창 경계는 np.searchsorted 두 번으로 모든 행에 대해 한 번에 구하고,
+후보 쌍은 np.repeat로 펼친다.
+
+후보 쌍의 점수는 필드별 일치/불일치 가중치(이름, 자, 호, 거주지)와 생년 차이로 매기며,
+빈 필드는 점수에 반영하지 않는다. 기준 점수 이상인 쌍 가운데 양쪽 모두에게 최고 점수인 쌍만
+남겨 1:1로 연결하고, 여러 과거의 연결 쌍을 연결 요소(scipy.sparse.csgraph)로 묶어 인물 ID를 붙인다.
+
+생년이 없는 행은 창을 정할 수 없으므로 연결하지 않고 혼자 한 인물이 된다.
+무과는 태그가 한 칸씩 어긋나 있지만 exam_schema.MUGWA_SCHEMA가 실제 값이 든 태그를 같은 컬럼명
+(급제자/본관/생년/거주지/시험년)으로 읽으므로 그대로 비교한다. 무과에 없는 ID/자 필드는 빈 값으로 본다.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# 연결에 필요한 원본 컬럼 (로더가 이 태그만 추출하도록 전달)
+LINKAGE_COLUMNS = ('ID', '급제자', '자', '호', '생년', '본관', '거주지', '시험년')
+
+# 기본 연결 대상 (진출 순서)
+DEFAULT_EXAMS = ('사마시', '문과', '무과')
+
+# 생년 허용오차 (년)
+BIRTH_TOLERANCE = 2
+
+# 필드별 (일치 가중치, 불일치 가중치)
+FIELD_WEIGHTS = {
+    '급제자': (6.0, -6.0),
+    '자': (4.0, -3.0),
+    '호': (4.0, -3.0),
+    '거주지': (2.0, -1.0)
+}
+
+# 생년 일치 가중치, 1년 차이마다 감점
+BIRTH_MATCH_WEIGHT = 2.0
+BIRTH_GAP_PENALTY = 1.0
+
+# 같은 인물로 보는 최소 점수 (이름 + 생년 일치, 또는 이름 + 자/호 일치)
+MATCH_THRESHOLD = 7.0
+
+
+def _field_codes(left, right, column):
+    """두 표의 같은 필드를 한 사전으로 인코딩 (빈 값/결측 → -1)"""
+    values = pd.concat([_text(left, column), _text(right, column)], ignore_index=True)
+    values = values.mask(values == '')
+    field_codes, _ = pd.factorize(values)
+    return field_codes[:len(left)], field_codes[len(left):]
+
+
+def _text(df, column):
+    """컬럼을 문자열 Series로 (컬럼이 없으면 모두 결측)"""
+    if column not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype='string')
+    return df[column].astype('string').str.strip()
+
+
+def _clan_text(df):
+    """성관 문자열 (급제자명 첫 글자 + 본관)"""
+    return _text(df, '급제자').str[0] + ' ' + _text(df, '본관')
+
+
+def _years(df, column):
+    """연도 컬럼 → 실수 배열 (문자열/결측 → NaN)"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def candidate_pairs(left_clans, left_births, right_clans, right_births, tolerance=BIRTH_TOLERANCE):
+    """(성관, 생년 ± tolerance) 창 안의 후보 쌍
+
+    Returns:
+        (왼쪽 행 번호 배열, 오른쪽 행 번호 배열)
+    """
+    left_valid = np.flatnonzero((left_clans >= 0) & ~np.isnan(left_births))
+    right_valid = np.flatnonzero((right_clans >= 0) & ~np.isnan(right_births))
+
+    # 성관마다 생년 범위가 겹치지 않도록 키 간격을 둔다
+    stride = 4 * (tolerance + 1) + max(
+        np.nanmax(left_births, initial=0), np.nanmax(right_births, initial=0))
+    left_keys = left_clans[left_valid] * stride + left_births[left_valid]
+    right_keys = right_clans[right_valid] * stride + right_births[right_valid]
+    order = np.argsort(right_keys, kind='stable')
+    right_keys, right_valid = right_keys[order], right_valid[order]
+
+    lo = np.searchsorted(right_keys, left_keys - tolerance, side='left')
+    hi = np.searchsorted(right_keys, left_keys + tolerance, side='right')
+    sizes = hi - lo
+    left_rows = np.repeat(left_valid, sizes)
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    right_rows = right_valid[np.repeat(lo, sizes) + offsets]
+    return left_rows, right_rows
+
+
+def link_pair(left, right, tolerance=BIRTH_TOLERANCE, threshold=MATCH_THRESHOLD):
+    """두 과거 표의 1:1 동일 인물 쌍
+
+    Args:
+        left, right: 과거 원본 DataFrame (LINKAGE_COLUMNS 일부 포함)
+        tolerance: 생년 허용오차 (년)
+        threshold: 연결 최소 점수
+
+    Returns:
+        DataFrame: 왼쪽행/오른쪽행(각 표의 행 위치)/점수 컬럼, 왼쪽행 순
+    """
+    left_clans, right_clans = _field_codes(left.assign(성관=_clan_text(left)),
+                                           right.assign(성관=_clan_text(right)), '성관')
+    left_births, right_births = _years(left, '생년'), _years(right, '생년')
+    left_rows, right_rows = candidate_pairs(left_clans, left_births, right_clans, right_births,
+                                            tolerance)
+
+    # 필드별 일치/불일치 가중치 합 (한쪽이라도 비어 있으면 0)
+    scores = BIRTH_MATCH_WEIGHT - BIRTH_GAP_PENALTY * np.abs(
+        left_births[left_rows] - right_births[right_rows])
+    for column, (agree, disagree) in FIELD_WEIGHTS.items():
+        left_codes, right_codes = _field_codes(left, right, column)
+        a, b = left_codes[left_rows], right_codes[right_rows]
+        scores += np.where((a < 0) | (b < 0), 0.0, np.where(a == b, agree, disagree))
+
+    keep = scores >= threshold
+    left_rows, right_rows, scores = left_rows[keep], right_rows[keep], scores[keep]
+
+    # 점수 내림차순으로 왼쪽/오른쪽 각각 처음 나온 쌍 → 양쪽 모두의 최고 점수 쌍만 남김
+    order = np.lexsort((right_rows, left_rows, -scores))
+    left_rows, right_rows, scores = left_rows[order], right_rows[order], scores[order]
+    _, best_left = np.unique(left_rows, return_index=True)
+    best = np.zeros(len(scores), dtype=bool)
+    best[best_left] = True
+    _, best_right = np.unique(right_rows, return_index=True)
+    mutual = np.zeros(len(scores), dtype=bool)
+    mutual[best_right] = True
+    mutual &= best
+
+    pairs = pd.DataFrame({'왼쪽행': left_rows[mutual], '오른쪽행': right_rows[mutual],
+                          '점수': scores[mutual]})
+    return pairs.sort_values('왼쪽행', ignore_index=True)
+
+
+def link_exams(data, exam_types=DEFAULT_EXAMS, tolerance=BIRTH_TOLERANCE,
+               threshold=MATCH_THRESHOLD):
+    """여러 과거 표를 연결한 인물 ID 대응표
+
+    Args:
+        data: 과거구분 → 원본 DataFrame 딕셔너리 (KwagwaDataParser.load_all_data 결과)
+        exam_types: 연결할 과거 (모든 두 표 조합을 연결)
+
+    Returns:
+        DataFrame: 과거구분/행번호/ID/급제자/본관/생년/시험년/인물ID 컬럼, 과거 표 순서대로 전체 행
+                   (인물ID는 처음 나타난 순서로 0부터, 연결된 행끼리 같은 값)
+    """
+    print(f"\n과거 간 인물 연결 ({' · '.join(exam_types)}, 생년 ±{tolerance}년)")
+    start = time.perf_counter()
+
+    frames = [data[exam_type] for exam_type in exam_types]
+    offsets = np.cumsum([0] + [len(df) for df in frames])
+
+    edges = []
+    for i in range(len(frames)):
+        for j in range(i + 1, len(frames)):
+            pairs = link_pair(frames[i], frames[j], tolerance, threshold)
+            print(f"  {exam_types[i]} ↔ {exam_types[j]}: {len(pairs)}쌍")
+            edges.append((pairs['왼쪽행'].to_numpy() + offsets[i],
+                          pairs['오른쪽행'].to_numpy() + offsets[j]))
+
+    n_records = int(offsets[-1])
+    heads = np.concatenate([e[0] for e in edges]) if edges else np.zeros(0, dtype=np.int64)
+    tails = np.concatenate([e[1] for e in edges]) if edges else np.zeros(0, dtype=np.int64)
+    graph = coo_matrix((np.ones(len(heads)), (heads, tails)), shape=(n_records, n_records))
+    _, components = connected_components(graph, directed=False)
+
+    # 연결 요소 번호를 처음 나타난 순서로 다시 매김
+    _, first, person = np.unique(components, return_index=True, return_inverse=True)
+    person = np.argsort(np.argsort(first))[person]
+
+    crosswalk = pd.concat([pd.DataFrame({
+        '과거구분': exam_type,
+        '행번호': np.arange(len(df)),
+        'ID': _text(df, 'ID').to_numpy(),
+        '급제자': _text(df, '급제자').to_numpy(),
+        '본관': _text(df, '본관').to_numpy(),
+        '생년': _years(df, '생년'),
+        '시험년': _years(df, '시험년')
+    }) for exam_type, df in zip(exam_types, frames)], ignore_index=True)
+    crosswalk['인물ID'] = person
+
+    elapsed = time.perf_counter() - start
+    n_linked = int((np.bincount(person) > 1).sum())
+    print(f"  {n_records}행 → {int(person.max()) + 1 if n_records else 0}명 "
+          f"(여러 과거에 걸친 인물 {n_linked}명, {elapsed:.2f}초)")
+    return crosswalk
+
+
+def progression_counts(crosswalk, exam_types=DEFAULT_EXAMS):
+    """인물별로 급제한 과거 조합(예: 사마시+문과)의 인원 수, 많은 순"""
+    exam_codes = pd.Categorical(crosswalk['과거구분'], categories=list(exam_types)).codes
+    person = crosswalk['인물ID'].to_numpy()
+    valid = exam_codes >= 0
+
+    # 인물별 급제 과거를 비트 집합으로 모은 뒤 조합별 인원 수
+    passed = np.zeros(int(person.max()) + 1 if len(person) else 0, dtype=np.int64)
+    np.bitwise_or.at(passed, person[valid], 1 << exam_codes[valid].astype(np.int64))
+    combo_counts = np.bincount(passed, minlength=1 << len(exam_types))
+    combos = np.flatnonzero(combo_counts[1:]) + 1
+    labels = ['+'.join(e for k, e in enumerate(exam_types) if combo >> k & 1) for combo in combos]
+    counts = pd.Series(combo_counts[combos], index=pd.Index(labels, name='급제과거'), name='인원수')
+    return counts.sort_values(ascending=False, kind='stable')
@@ -0,0 +1,80 @@
+"""
+거주지 → 지역 분류 지명 사전 (gazetteer)
+
+분류 규칙은 코드의 if/elif 대신 데이터 표(region_gazetteer.csv)에 둔다.
+표의 각 행은 (지역, 패턴)이며, 거주지 문자열에 패턴이 포함되면 그 지역으로 분류한다.
+여러 지역의 패턴이 동시에 맞으면 표에서 먼저 나온 지역이 우선한다.
+빈 거주지는 '미상', 어느 패턴에도 맞지 않으면 '기타'.
+
+분류는 거주지의 고유값에 대해서만 수행하고 (지역별로 패턴을 하나의 정규식으로 묶어
+벡터화된 str.contains 한 번), 결과는 Categorical 코드로 전체 행에 펼친다.
+따라서 비용은 행 수가 아니라 서로 다른 거주지 수에 비례한다.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 기본 규칙 표 (모듈과 같은 디렉터리)
+DEFAULT_TABLE = Path(__file__).with_name('region_gazetteer.csv')
+
+
+class RegionGazetteer:
+    """지역 분류 규칙 (우선순위 순서의 (지역, 패턴 목록))"""
+
+    def __init__(self, rules, unknown='미상', default='기타'):
+        self.rules = [(region, tuple(patterns)) for region, patterns in rules]
+        self.unknown = unknown
+        self.default = default
+        self._matchers = [(region, re.compile('|'.join(map(re.escape, patterns))))
+                          for region, patterns in self.rules if patterns]
+        self.regions = list(dict.fromkeys(
+            [unknown] + [region for region, _ in self.rules] + [default]))
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        """'지역', '패턴' 컬럼의 표에서 규칙 로드 (행 순서 = 우선순위)"""
+        table = pd.read_csv(path, encoding='utf-8-sig', dtype=str).dropna()
+        rules = {}
+        for region, pattern in zip(table['지역'], table['패턴']):
+            rules.setdefault(region, []).append(pattern)
+        return cls(rules.items(), **kwargs)
+
+    def classify_values(self, values):
+        """고유 거주지 문자열 배열 → 지역 코드 배열 (self.regions 기준)"""
+        values = pd.Series(values, dtype='string')
+        codes = np.full(len(values), -1, dtype=np.int32)
+        blank = (values.isna() | (values == '')).to_numpy(dtype=bool)
+        codes[blank] = self.regions.index(self.unknown)
+
+        for region, matcher in self._matchers:
+            pending = codes == -1
+            if not pending.any():
+                break
+            matched = values[pending].str.contains(matcher, na=False).to_numpy()
+            codes[np.flatnonzero(pending)[matched]] = self.regions.index(region)
+
+        codes[codes == -1] = self.regions.index(self.default)
+        return codes
+
+    def classify(self, residence):
+        """거주지 Series → 지역 Categorical (고유값만 분류 후 코드로 펼침)"""
+        if isinstance(residence.dtype, pd.CategoricalDtype):
+            value_codes = residence.cat.codes.to_numpy()
+            uniques = residence.cat.categories
+        else:
+            value_codes, uniques = pd.factorize(residence)
+
+        # 결측(-1)은 마지막 칸의 '미상'으로 보냄
+        unique_regions = np.append(self.classify_values(np.asarray(uniques, dtype=object)),
+                                   self.regions.index(self.unknown))
+        return pd.Categorical.from_codes(unique_regions[value_codes], self.regions)
+
+
+@lru_cache(maxsize=None)
+def default_gazetteer():
+    """기본 규칙 표로 만든 gazetteer (프로세스당 하나, 전처리 저장소 키로 사용)"""
+    return RegionGazetteer.from_csv(DEFAULT_TABLE)
@@ -0,0 +1,279 @@
+"""
+새 데이터 배포판 증분 반영 (레코드 단위 비교)
+
+한국학중앙연구원이 수정 배포판을 내면 이전 배포판(캐시)과 레코드 단위로 비교하여
+추가/삭제/변경된 레코드만 골라내고, 그 레코드가 건드리는 집계만 갱신한다.
+
+- 레코드 식별: ID 필드 (무과처럼 ID가 없는 과거는 전체 필드 조합을 키로 사용하므로
+  변경은 '삭제 + 추가'로 나타난다)
+- 변경 판정: 공통 ID의 행 해시를 비교한 뒤, 해시가 다른 행만 컬럼 단위로 비교
+- 집계: 과거 × 성관 × 시대 급제자 수. 이전 배포판 집계에
+  (추가 + 변경 후) - (삭제 + 변경 전) 증분만 더하므로 갱신 비용은 변경 규모에 비례한다
+
+새 배포판 XML 자체는 한 번 파싱해야 하며(파일 크기에 비례), 파싱 결과는 캐시에 저장되어
+다음 배포판과 비교할 때 이전 배포판으로 쓰인다. 이전 배포판 XML을 지운 뒤에도 캐시만으로 비교할 수
+있다 (캐시에 남아 있는 컬럼만 비교).
+
+    python release_ingest.py --data-dir <XML 디렉터리> --previous 20200929 --release 20210315
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from era_binning import get_scheme
+from kinship_analysis import KwagwaDataParser, add_loader_arguments
+from prepared_store import clan_columns
+
+# 집계 테이블 키 (과거구분 × 성관 × 시대)
+AGGREGATE_KEYS = ['과거구분', '성관', '시대']
+
+# 집계용 시대 구분 (KinshipAnalyzer.analyze_period_changes와 같은 3구분)
+PERIODS = get_scheme('3-era')
+
+# 성관 집계 대상 과거 (무과 태그 배치는 exam_schema.MUGWA_SCHEMA가 바로잡음)
+AGGREGATE_EXAMS = tuple(KwagwaDataParser.EXAM_FILES)
+
+# 집계 범위나 성관 규칙이 바뀌면 올려서 저장된 집계 파일을 모두 무시
+AGGREGATE_VERSION = 2
+
+
+def record_keys(df):
+    """레코드 식별 키 Series
+
+    ID 컬럼이 있으면 ID를, 없으면 전체 필드의 행 해시에 같은 행의 출현 순번을 붙여 사용한다.
+    """
+    if 'ID' in df.columns and not df['ID'].duplicated().any():
+        return df['ID'].astype(object)
+
+    row_hash = pd.util.hash_pandas_object(df, index=False)
+    occurrence = row_hash.groupby(row_hash.to_numpy()).cumcount()
+    return row_hash.astype(str) + '#' + occurrence.astype(str)
+
+
+def diff_records(old_df, new_df):
+    """두 배포판의 같은 과거 DataFrame 비교
+
+    Returns:
+        dict: added(새 배포판 행), removed(이전 배포판 행),
+              changed(ID, 컬럼, 이전값, 새값 - 변경된 칸마다 한 행),
+              changed_old / changed_new(변경된 레코드의 이전/새 행 전체)
+    """
+    columns = [c for c in new_df.columns if c in old_df.columns]
+    old_keys = record_keys(old_df[columns])
+    new_keys = record_keys(new_df[columns])
+
+    in_new = old_keys.isin(new_keys).to_numpy()
+    in_old = new_keys.isin(old_keys).to_numpy()
+    removed = old_df[~in_new]
+    added = new_df[~in_old]
+
+    # 공통 키: 행 해시가 다른 것만 변경 후보
+    old_common = old_df[in_new].set_axis(old_keys[in_new].to_numpy())
+    new_common = new_df[in_old].set_axis(new_keys[in_old].to_numpy())
+    new_common = new_common.loc[old_common.index]
+    old_hash = pd.util.hash_pandas_object(old_common[columns], index=False).to_numpy()
+    new_hash = pd.util.hash_pandas_object(new_common[columns], index=False).to_numpy()
+    touched = old_hash != new_hash
+
+    changed_old = old_common[touched]
+    changed_new = new_common[touched]
+
+    cells = []
+    for col in columns:
+        before = changed_old[col].astype(object)
+        after = changed_new[col].astype(object)
+        differs = ~((before == after) | (before.isna() & after.isna()))
+        if differs.any():
+            cells.append(pd.DataFrame({
+                'ID': before.index[differs.to_numpy()],
+                '컬럼': col,
+                '이전값': before[differs].to_numpy(),
+                '새값': after[differs].to_numpy()
+            }))
+    if cells:
+        changed = pd.concat(cells, ignore_index=True)
+    else:
+        changed = pd.DataFrame(columns=['ID', '컬럼', '이전값', '새값'])
+
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'changed_old': changed_old.reset_index(drop=True),
+        'changed_new': changed_new.reset_index(drop=True)
+    }
+
+
+def clan_period_counts(df):
+    """과거구분 × 성관 × 시대 급제자 수 (성관을 알 수 없는 행은 제외)
+
+    성관은 분석용 전처리와 같은 규칙(prepared_store.clan_columns)으로 만든다.
+    """
+    if df.empty:
+        return pd.Series(0, index=pd.MultiIndex.from_tuples([], names=AGGREGATE_KEYS),
+                         dtype='int64')
+    keys = pd.DataFrame({
+        '과거구분': df['과거구분'].astype(str).to_numpy(),
+        '성관': np.asarray(clan_columns(df)['성관'], dtype=object),
+        '시대': np.asarray(PERIODS.bin(df['시험년'].to_numpy(dtype='float64', na_value=np.nan),
+                                       unknown='미상'), dtype=object)
+    }).dropna()
+    return keys.value_counts().sort_index().astype('int64')
+
+
+class AggregateStore:
+    """배포판별 성관 집계 테이블 (파싱 캐시 디렉터리에 CSV로 저장)"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, release):
+        return self.cache_dir / f"aggregates-v{AGGREGATE_VERSION}-{release}.csv"
+
+    def load(self, release):
+        path = self._path(release)
+        if not path.exists():
+            return None
+        table = pd.read_csv(path, encoding='utf-8-sig', dtype={'성관': str})
+        return table.set_index(AGGREGATE_KEYS)['급제자수'].astype('int64')
+
+    def store(self, release, counts):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        counts.rename('급제자수').to_csv(self._path(release), encoding='utf-8-sig')
+
+
+def apply_delta(counts, removed_rows, added_rows):
+    """기존 집계에 삭제/추가 행의 증분만 반영 (0이 된 항목은 제거)"""
+    delta = clan_period_counts(added_rows).sub(clan_period_counts(removed_rows), fill_value=0)
+    delta = delta[delta != 0]
+    updated = counts.add(delta, fill_value=0).astype('int64')
+    return updated[updated != 0].sort_index()
+
+
+class ReleaseIngestor:
+    """이전 배포판 대비 새 배포판 증분 반영"""
+
+    def __init__(self, base_path, previous, release, **parser_options):
+        self.old_parser = KwagwaDataParser(base_path, release=previous, **parser_options)
+        self.new_parser = KwagwaDataParser(base_path, release=release, **parser_options)
+        cache_dir = self.new_parser.cache.cache_dir if self.new_parser.cache else \
+            Path(base_path) / KwagwaDataParser.CACHE_DIR
+        self.aggregates = AggregateStore(cache_dir)
+        self.diffs = {}
+
+    def load_previous(self, exam_type):
+        """이전 배포판 과거 DataFrame
+
+        원본 XML이 남아 있으면 일반 로드(캐시 우선)와 같고, 지워졌으면 캐시에 남은 컬럼을 그대로 쓴다.
+        """
+        parser = self.old_parser
+        path = parser.exam_path(exam_type)
+        if path.exists() or parser.cache is None:
+            return parser.load_exam(exam_type)
+        df = parser.cache.load(exam_type, path, parser.cache_variant(exam_type))
+        if df is None:
+            raise FileNotFoundError(
+                f"이전 배포판({parser.release}) {exam_type} 원본과 캐시가 모두 없습니다: {path}")
+        print(f"{exam_type} 이전 배포판 캐시 로드 (원본 없음): {len(df)}명")
+        return df
+
+    def previous_aggregates(self):
+        """이전 배포판 집계 (없으면 이전 배포판 전체로 한 번 계산)"""
+        counts = self.aggregates.load(self.old_parser.release)
+        if counts is None:
+            print(f"이전 배포판({self.old_parser.release}) 집계가 없어 전체 데이터로 계산합니다")
+            frames = [self.load_previous(t) for t in AGGREGATE_EXAMS]
+            counts = clan_period_counts(pd.concat(frames, ignore_index=True))
+            self.aggregates.store(self.old_parser.release, counts)
+        return counts
+
+    def ingest(self):
+        """과거별 레코드 비교 후 집계 증분 갱신"""
+        print("=" * 60)
+        print(f"배포판 증분 반영: {self.old_parser.release} → {self.new_parser.release}")
+        print("=" * 60)
+
+        counts = self.previous_aggregates()
+
+        removed_rows = []
+        added_rows = []
+        for exam_type in KwagwaDataParser.EXAM_FILES:
+            old_df = self.load_previous(exam_type)
+            new_df = self.new_parser.load_exam(exam_type)
+
+            start = time.perf_counter()
+            diff = diff_records(old_df, new_df)
+            self.diffs[exam_type] = diff
+            elapsed = time.perf_counter() - start
+            print(f"  {exam_type}: 추가 {len(diff['added'])}건, 삭제 {len(diff['removed'])}건, "
+                  f"변경 {len(diff['changed_new'])}건 ({elapsed * 1000:.1f}ms)")
+
+            if exam_type in AGGREGATE_EXAMS:
+                removed_rows += [diff['removed'], diff['changed_old']]
+                added_rows += [diff['added'], diff['changed_new']]
+
+        start = time.perf_counter()
+        removed = pd.concat(removed_rows, ignore_index=True)
+        added = pd.concat(added_rows, ignore_index=True)
+        updated = apply_delta(counts, removed, added)
+        self.aggregates.store(self.new_parser.release, updated)
+        elapsed = time.perf_counter() - start
+        print(f"\n집계 증분 갱신: 반영 행 {len(removed) + len(added)}건 ({elapsed * 1000:.1f}ms)")
+
+        return updated
+
+    def verify(self, updated):
+        """증분 갱신한 집계가 새 배포판 전체로 다시 계산한 집계와 같은지 확인"""
+        frames = [self.new_parser.load_exam(t) for t in AGGREGATE_EXAMS]
+        expected = clan_period_counts(pd.concat(frames, ignore_index=True))
+        pd.testing.assert_series_equal(updated.sort_index(), expected.sort_index(),
+                                       check_names=False)
+        print("✅ 증분 집계가 전체 재계산 결과와 동일합니다")
+
+    def save_diffs(self, output_dir):
+        """과거별 추가/삭제/변경 레코드를 CSV로 저장"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for exam_type, diff in self.diffs.items():
+            diff['added'].to_csv(output_dir / f"{exam_type}_추가.csv",
+                                 encoding='utf-8-sig', index=False)
+            diff['removed'].to_csv(output_dir / f"{exam_type}_삭제.csv",
+                                   encoding='utf-8-sig', index=False)
+            diff['changed'].to_csv(output_dir / f"{exam_type}_변경.csv",
+                                   encoding='utf-8-sig', index=False)
+        print(f"  → 비교 결과 저장 완료: {output_dir}")
+
+
+def main(argv=None):
+    """새 배포판 증분 반영 실행"""
+    arg_parser = argparse.ArgumentParser(description="과거 급제자 데이터 새 배포판 증분 반영")
+    add_loader_arguments(arg_parser)
+    arg_parser.add_argument('--previous', default=KwagwaDataParser.DEFAULT_RELEASE,
+                            help='비교 기준이 되는 이전 배포일자 (기본: %(default)s)')
+    arg_parser.add_argument('--output-dir', default=None,
+                            help='추가/삭제/변경 레코드 CSV 저장 위치 (기본: 릴리스비교_<이전>_<새>)')
+    arg_parser.add_argument('--verify', action='store_true',
+                            help='증분 집계를 전체 재계산 결과와 비교')
+    args = arg_parser.parse_args(argv)
+
+    if args.release == args.previous:
+        arg_parser.error("--release와 --previous가 같습니다")
+    if args.no_cache:
+        arg_parser.error("증분 반영은 이전 배포판 캐시가 필요하므로 --no-cache와 함께 쓸 수 없습니다")
+
+    ingestor = ReleaseIngestor(args.data_dir, args.previous, args.release,
+                               streaming=args.streaming, backend=args.xml_backend)
+    if args.clear_cache:
+        ingestor.new_parser.cache.invalidate()
+    updated = ingestor.ingest()
+    ingestor.save_diffs(args.output_dir or f"릴리스비교_{args.previous}_{args.release}")
+    if args.verify:
+        ingestor.verify(updated)
+
+
+if __name__ == "__main__":
+    main()
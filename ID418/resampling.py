@@ -0,0 +1,136 @@
+"""
+불평등 지표의 부트스트랩 신뢰구간
+
+그룹(시대 등)마다 급제자를 복원추출하여 가문별 급제자 수의 다항분포 재표본을 만든다.
+복제 n개 × 급제자 S명의 추출 번호를 행렬 한 번(rng.integers)에 뽑고, 행 번호 오프셋을 더한
+np.bincount 한 번으로 복제 × 가문 개수 행렬을 만든 뒤 inequality.row_inequality로
+모든 복제의 지표를 한꺼번에 계산한다 (가문 정렬 없이 값 히스토그램으로 계산).
+
+구간은 복제 분포의 백분위수 q(α/2), q(1-α/2)로 만든다.
+급제자가 1~2명인 가문이 대부분이라 재표본에서 빠지는 가문이 많고, 그 때문에 지표의
+부트스트랩 분포가 표준오차보다 크게 한쪽으로 치우친다 (지니계수는 복제 전부가 추정값보다 커서
+BCa의 편향 보정값도 무한대가 된다). 그래서 기본 구간은 백분위수를 추정값 기준으로 뒤집은
+기본(basic) 구간 [2θ − q(1-α/2), 2θ − q(α/2)]이다: 추정값이 참값에서 벗어난 만큼
+복제가 추정값에서 벗어난다고 보고 치우침을 구간에 반영한다. method='percentile'이면
+백분위수 구간을 그대로 쓴다. 치우침 크기는 편향 컬럼으로 따로 남긴다.
+
+복제는 CHUNK_SIZE개 단위 작업으로 나누고, 작업마다 SeedSequence(seed)에서 파생한
+고정 시드를 쓰므로 워커 수와 관계없이 같은 seed면 같은 구간이 나온다.
+workers > 1이면 작업을 프로세스 풀에 나누어 실행한다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from inequality import METRIC_COLUMNS, family_cells, row_inequality
+
+# 신뢰구간을 계산할 지표 (급제자수는 재표본에서 고정, 가문수는 재표본에서 줄어들기만 하므로 제외)
+BOOTSTRAP_METRICS = METRIC_COLUMNS[2:]
+
+# 작업 하나가 처리하는 복제 수 (시드 분할 단위이기도 함)
+CHUNK_SIZE = 500
+
+DEFAULT_SEED = 20200929
+
+# 구간 계산 방식
+INTERVAL_METHODS = ('basic', 'percentile')
+
+
+def chunk_sizes(n_reps, size=CHUNK_SIZE):
+    """복제 n_reps개를 size개 단위 작업 크기 목록으로 분할"""
+    return [min(size, n_reps - start) for start in range(0, n_reps, size)]
+
+
+def run_chunks(func, tasks, workers=1):
+    """작업 인자 튜플 목록을 순차 또는 프로세스 풀로 실행 (결과는 작업 순서대로)"""
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, *zip(*tasks)))
+    return [func(*task) for task in tasks]
+
+
+def _bootstrap_chunk(counts, n_reps, seed, top_fraction):
+    """작업 단위: 다항분포 복제 n_reps개의 지표 배열"""
+    rng = np.random.default_rng(seed)
+    n_families = len(counts)
+    passers = np.repeat(np.arange(n_families), counts)
+    draws = passers[rng.integers(0, len(passers), size=(n_reps, len(passers)))]
+    draws += (np.arange(n_reps) * n_families)[:, None]
+    family_counts = np.bincount(draws.ravel(), minlength=n_reps * n_families)
+    metrics = row_inequality(family_counts.reshape(n_reps, n_families), top_fraction)
+    return {name: metrics[name] for name in BOOTSTRAP_METRICS}
+
+
+def percentile_interval(replicates, estimate, confidence=0.95, method='basic'):
+    """복제 배열의 백분위수 신뢰구간 (하한, 상한)"""
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"알 수 없는 구간 방식: {method} (사용 가능: {', '.join(INTERVAL_METHODS)})")
+    low, high = np.nanpercentile(replicates, [50 - 50 * confidence, 50 + 50 * confidence])
+    if method == 'percentile':
+        return low, high
+    return 2 * estimate - high, 2 * estimate - low
+
+
+def bootstrap_groups(group_counts, n_boot=10000, seed=DEFAULT_SEED, workers=1,
+                     confidence=0.95, top_fraction=0.1, method='basic'):
+    """그룹별 가문 개수 벡터 → 지표별 부트스트랩 신뢰구간 표
+
+    Args:
+        group_counts: {그룹 라벨: 가문별 급제자 수 배열}
+        n_boot: 그룹당 복제 수
+        seed: 재현용 시드
+        workers: 프로세스 수 (1이면 순차 실행)
+        confidence: 신뢰수준
+        method: 'basic'(백분위수를 추정값 기준으로 뒤집은 구간) 또는 'percentile'
+
+    Returns:
+        DataFrame: (그룹, 지표) 인덱스, 추정값/하한/상한/표준오차/편향 컬럼
+    """
+    labels = list(group_counts)
+    group_seeds = np.random.SeedSequence(seed).spawn(len(labels))
+
+    tasks = []
+    group_tasks = {}
+    for label, group_seed in zip(labels, group_seeds):
+        counts = np.asarray(group_counts[label], dtype=np.int64)
+        counts = counts[counts > 0]
+        sizes = chunk_sizes(n_boot)
+        chunk_seeds = group_seed.spawn(len(sizes))
+        group_tasks[label] = (counts, range(len(tasks), len(tasks) + len(sizes)))
+        tasks += [(counts, n_reps, chunk_seed, top_fraction)
+                  for n_reps, chunk_seed in zip(sizes, chunk_seeds)]
+
+    chunks = run_chunks(_bootstrap_chunk, tasks, workers)
+
+    rows = []
+    for label in labels:
+        counts, task_ids = group_tasks[label]
+        estimate = row_inequality(counts[None, :], top_fraction)
+        for name in BOOTSTRAP_METRICS:
+            replicates = np.concatenate([chunks[i][name] for i in task_ids])
+            value = estimate[name][0]
+            lower, upper = percentile_interval(replicates, value, confidence, method)
+            rows.append({
+                '그룹': label,
+                '지표': name,
+                '추정값': value,
+                '하한': lower,
+                '상한': upper,
+                '표준오차': np.nanstd(replicates, ddof=1),
+                '편향': np.nanmean(replicates) - value
+            })
+    return pd.DataFrame(rows).set_index(['그룹', '지표'])
+
+
+def bootstrap_by(df, by, family='성관', **options):
+    """전처리 DataFrame을 by 컬럼별로 나눈 가문 분포의 부트스트랩 신뢰구간"""
+    labels, groups, cell_counts = family_cells(df, by, family)
+    group_counts = {labels[g]: cell_counts[groups == g] for g in np.unique(groups)}
+    return bootstrap_groups(group_counts, **options)
+
+
+def bootstrap_counts(counts, **options):
+    """단일 분포(가문별 급제자 수)의 부트스트랩 신뢰구간 (지표 인덱스)"""
+    return bootstrap_groups({'전체': counts}, **options).loc['전체']
@@ -0,0 +1,116 @@
+"""
+시험 회차(시험명 + 시험년) 색인과 회차별 가문 집중도 표
+
+전처리 DataFrame의 행을 회차 번호로 안정 정렬한 행 번호 배열과 회차별 시작 위치(CSR 형태)로
+묶어 두어, 회차 하나의 급제자 명단은 구간 조회로, 모든 회차의 지표는 (회차, 성관) 칸 집계 한 번과
+inequality.segmented_inequality 한 번으로 구한다. 회차는 시험년, 시험명 순으로 번호가 매겨진다.
+
+회차별 표에는 시대/시대_상세 라벨이 함께 붙으므로 시대별 표(inequality_by 결과 등)에
+그대로 조인하거나 시대별로 집계할 수 있다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes, count_codes
+from inequality import METRIC_COLUMNS, segmented_inequality
+
+# 회차를 구분하는 컬럼 (정렬 우선순위 순)
+SESSION_KEYS = ('시험년_int', '시험명')
+
+# 점유율을 볼 전체 상위 성관 수
+TOP_CLANS = 50
+
+# 회차 표에 붙이는 시대 라벨 (AnalysisContext 파생 컬럼)
+ERA_COLUMNS = ('시대', '시대_상세')
+
+
+def _key_codes(column):
+    """회차 키 컬럼 → 정렬 순 정수 코드 (결측 -1)와 코드 수"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return codes(column).astype(np.int64), len(column.cat.categories)
+    key_codes, uniques = pd.factorize(column, sort=True)
+    return key_codes.astype(np.int64), len(uniques)
+
+
+class SessionIndex:
+    """회차 번호 → 급제자 행 번호 색인"""
+
+    def __init__(self, context, keys=SESSION_KEYS):
+        """
+        Args:
+            context: AnalysisContext (전처리 DataFrame과 시대 파생 컬럼)
+            keys: 회차를 구분하는 컬럼 (정렬 우선순위 순)
+        """
+        self.context = context
+        self.keys = tuple(keys)
+
+        # 키 코드를 한 칸 번호로 묶은 뒤 관측된 조합만 0..S-1로 다시 번호 (키 정렬 순서 유지)
+        key_codes, sizes = zip(*(_key_codes(context.column(key)) for key in self.keys))
+        valid = np.logical_and.reduce([c >= 0 for c in key_codes])
+        flat = np.ravel_multi_index([c[valid] for c in key_codes], sizes)
+        _, session = np.unique(flat, return_inverse=True)
+
+        self.sessions = np.full(len(context), -1, dtype=np.int64)
+        self.sessions[valid] = session
+        n_sessions = int(session.max()) + 1 if len(session) else 0
+
+        # 회차별로 안정 정렬 (같은 회차 안에서는 원래 행 순서)
+        self.rows_by_session = np.flatnonzero(valid)[np.argsort(session, kind='stable')]
+        self.offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(session, minlength=n_sessions))])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def sizes(self):
+        """회차별 급제자 수 (회차 키가 모두 있는 행 기준)"""
+        return np.diff(self.offsets)
+
+    def rows(self, session):
+        """회차의 급제자 행 위치 (행 순)"""
+        return self.rows_by_session[self.offsets[session]:self.offsets[session + 1]]
+
+    def labels(self):
+        """회차별 키와 시대 라벨 DataFrame (회차 번호 순)"""
+        first = self.rows_by_session[self.offsets[:-1]]
+        labels = pd.DataFrame({
+            name: self.context.column(name).iloc[first].reset_index(drop=True)
+            for name in self.keys + ERA_COLUMNS
+        })
+        # 회차 행은 시험년이 모두 있으므로 정수 연도로 표시
+        if '시험년_int' in labels.columns:
+            labels['시험년_int'] = labels['시험년_int'].astype(np.int64)
+        return labels.rename(columns={'시험년_int': '시험년'})
+
+    def concentration(self, family='성관', top_clans=TOP_CLANS, top_fraction=0.1):
+        """회차별 가문 집중도 표
+
+        Returns:
+            DataFrame: 회차마다 한 행, 회차 키/시대 라벨 + METRIC_COLUMNS
+                       + 반복성관수(2명 이상 급제한 성관 수)
+                       + 상위{top_clans}성관점유(전체 급제자 수 상위 성관 출신 비율)
+        """
+        family_col = self.context.column(family)
+        family_codes = codes(family_col).astype(np.int64)
+        n_families = len(family_col.cat.categories)
+
+        # (회차, 성관) 칸별 급제자 수
+        valid = (self.sessions >= 0) & (family_codes >= 0)
+        cells, counts = np.unique(self.sessions[valid] * n_families + family_codes[valid],
+                                  return_counts=True)
+        groups, cell_families = cells // n_families, cells % n_families
+
+        metrics = segmented_inequality(groups, counts, len(self), top_fraction)
+        table = pd.concat([self.labels(), pd.DataFrame(metrics, columns=METRIC_COLUMNS)],
+                          axis=1)
+
+        top = family_col.cat.categories.get_indexer(count_codes(family_col).head(top_clans).index)
+        table['반복성관수'] = np.bincount(groups, weights=counts >= 2,
+                                     minlength=len(self)).astype(np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table[f'상위{top_clans}성관점유'] = np.bincount(
+                groups, weights=counts * np.isin(cell_families, top),
+                minlength=len(self)) / table['급제자수'].to_numpy()
+        return table
@@ -0,0 +1,36 @@
+"""
+공용 테스트 픽스처
+
+tests/fixtures에는 네 과거의 작은 XML 원본(배포판 20200929)이 있다.
+무과 파일은 실제 배포판과 같이 태그가 한 칸씩 어긋난 배치로 작성되어 있다
+(exam_schema.MUGWA_SCHEMA 참고).
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+
+@pytest.fixture
+def data_dir():
+    """픽스처 XML 디렉터리"""
+    return FIXTURE_DIR
+
+
+@pytest.fixture
+def parser(tmp_path):
+    """픽스처 XML을 읽는 파서 (캐시는 임시 디렉터리에)"""
+    from kinship_analysis import KwagwaDataParser
+    return KwagwaDataParser(FIXTURE_DIR, cache_dir=tmp_path / 'cache')
+
+
+@pytest.fixture
+def copied_data_dir(tmp_path):
+    """수정/삭제해도 되는 픽스처 XML 사본 디렉터리"""
+    return Path(shutil.copytree(FIXTURE_DIR, tmp_path / 'data'))
@@ -0,0 +1,54 @@
+"""분석 문맥: 공유 전처리 DataFrame을 복사·수정하지 않고 기존 copy() 방식과 같은 컬럼을 주는지 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis_context import AnalysisContext
+from prepared_store import prepared_frame
+
+
+@pytest.fixture
+def shared(parser):
+    data = pd.concat([parser.load_exam('문과'), parser.load_exam('사마시')], ignore_index=True)
+    return prepared_frame(data)
+
+
+def baseline_columns(shared):
+    """기존 분석 메서드처럼 combined_df.copy()에 임시 컬럼을 더한 DataFrame"""
+    df = shared.copy()
+    df['시대'] = df['시험년_int'].apply(
+        lambda year: None if pd.isna(year) else
+        '조선 전기' if year < 1494 else '조선 중기' if year < 1608 else '조선 후기')
+    df['연대'] = (df['시험년_int'] // 10) * 10
+    return df
+
+
+def test_with_columns_matches_copy_and_leaves_frame_alone(shared):
+    columns = list(shared.columns)
+    context = AnalysisContext(shared)
+    df = context.with_columns('시대', '연대', '지역')
+    expected = baseline_columns(shared)
+
+    assert df['시대'].astype(object).tolist() == expected['시대'].tolist()
+    pd.testing.assert_series_equal(df['연대'], expected['연대'], check_names=False)
+    assert list(shared.columns) == columns
+
+    # 기존 컬럼은 복사되지 않고, 붙인 DataFrame을 고쳐도 공유 DataFrame은 그대로
+    assert np.shares_memory(df['시험년_int'].to_numpy(), shared['시험년_int'].to_numpy())
+    before = shared['시험년_int'].copy()
+    df.loc[df.index[0], '시험년_int'] = 0
+    pd.testing.assert_series_equal(shared['시험년_int'], before)
+
+    assert context.with_columns() is shared
+    with pytest.raises(KeyError):
+        context.column('없는컬럼')
+
+
+def test_derived_columns_are_cached_per_frame(shared):
+    context = AnalysisContext(shared)
+    era = context.column('시대')
+    assert context.column('시대') is era
+    assert AnalysisContext(shared).column('시대') is era
+    assert context.cube('시대', '지역') is AnalysisContext(shared).cube('시대', '지역')
+    assert context.dated.tolist() == shared['시험년_int'].notna().tolist()
@@ -0,0 +1,82 @@
+"""세과 연속 세대 탐지: 성관별 반복문(기존 방식)과 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import continuity
+from continuity import clan_runs, sweep_thresholds
+from dictionary_encoding import encode_column
+
+
+def baseline_runs(years, gap_min=20, gap_max=40):
+    """기존 _check_consecutive_generations에 최장 런(가장 이른 것)의 시작/종료 연도를 더한 것"""
+    if len(years) == 0:
+        return 0, np.nan, np.nan
+    consecutive = max_consecutive = 1
+    start = best_start = best_end = 0
+    for i in range(1, len(years)):
+        gap = years[i] - years[i - 1]
+        if gap_min <= gap <= gap_max:
+            consecutive += 1
+        else:
+            consecutive = 1
+            start = i
+        if consecutive > max_consecutive:
+            max_consecutive = consecutive
+            best_start, best_end = start, i
+    return max_consecutive, years[best_start], years[best_end]
+
+
+@pytest.fixture
+def clan_frame():
+    """성관 40개, 성관마다 1~12명, 시험년 일부 결측인 전처리 DataFrame 모양의 표"""
+    rng = np.random.default_rng(5)
+    sizes = rng.integers(1, 13, size=40)
+    clans = np.repeat([f'성관{i:02d}' for i in range(40)], sizes)
+    years = rng.integers(1400, 1900, size=len(clans)).astype(float)
+    # 세대 간격 연쇄가 생기도록 일부 성관은 25~35년 간격으로 배치
+    for i in range(0, 40, 4):
+        rows = np.flatnonzero(clans == f'성관{i:02d}')
+        years[rows] = 1500 + np.cumsum(rng.integers(25, 36, size=len(rows)))
+    years[rng.random(len(years)) < 0.1] = np.nan
+    order = rng.permutation(len(clans))
+    return pd.DataFrame({'성관': encode_column(pd.Series(clans[order])),
+                         '시험년_int': years[order]})
+
+
+def baseline_table(df, gap_min=20, gap_max=40):
+    rows = {}
+    for clan, group in df.groupby('성관', observed=True):
+        years = np.sort(group['시험년_int'].dropna().to_numpy())
+        runs, first, last = baseline_runs(years, gap_min, gap_max)
+        rows[clan] = {'급제자수': len(group), '연도확인수': len(years), '최대연속세대': runs,
+                      '연속시작년도': first, '연속종료년도': last}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+@pytest.mark.parametrize('gaps', [(20, 40), (25, 35), (10, 49)])
+def test_clan_runs_matches_baseline(clan_frame, gaps):
+    table = clan_runs(clan_frame, gap_min=gaps[0], gap_max=gaps[1])
+    expected = baseline_table(clan_frame, *gaps)
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(table.loc[expected.index, columns],
+                                  expected.astype(table[columns].dtypes),
+                                  check_names=False, check_index_type=False)
+    assert (table['최대연속세대'] >= 4).sum() > 0
+
+
+@pytest.mark.parametrize('batch_cells', [continuity.SWEEP_BATCH_CELLS, 50])
+def test_sweep_matches_clan_runs_per_cell(clan_frame, monkeypatch, batch_cells):
+    monkeypatch.setattr(continuity, 'SWEEP_BATCH_CELLS', batch_cells)
+    gap_mins, gap_maxs = range(10, 30, 3), range(25, 50, 4)
+    sweep = sweep_thresholds(clan_frame, gap_mins, gap_maxs, min_generations=(1, 2, 3, 4))
+
+    expected = []
+    for lo in gap_mins:
+        for hi in gap_maxs:
+            if lo > hi:
+                continue
+            runs = clan_runs(clan_frame, gap_min=lo, gap_max=hi)['최대연속세대']
+            expected += [(lo, hi, g, int((runs >= g).sum())) for g in (1, 2, 3, 4)]
+    assert sweep.values.tolist() == [list(row) for row in expected]
@@ -0,0 +1,63 @@
+"""집계 큐브: DataFrame groupby/value_counts(기존 방식)와 조회 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from count_cube import CountCube
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(9)
+    n = 400
+    clans = rng.choice(['김 안동', '이 전주', '박 밀양', '최 경주', '정 동래'], size=n)
+    eras = rng.choice(['조선 전기', '조선 중기', '조선 후기'], size=n).astype(object)
+    regions = rng.choice(['경기/한양', '경상', '전라', '충청'], size=n).astype(object)
+    eras[rng.random(n) < 0.05] = None
+    regions[rng.random(n) < 0.05] = None
+    return pd.DataFrame({'성관': pd.Categorical(clans), '시대': eras, '지역': regions})
+
+
+def test_rollup_and_table_match_groupby(frame):
+    cube = CountCube.from_frame(frame, ['성관', '시대', '지역'])
+
+    # 다른 차원이 결측인 행까지 포함한 성관별 행 수
+    expected = frame['성관'].value_counts(sort=False)
+    assert cube.rollup('성관').to_series().to_dict() == expected.to_dict()
+
+    table = cube.table('시대', '지역')
+    crosstab = pd.crosstab(frame['시대'], frame['지역'])
+    pd.testing.assert_frame_equal(table, crosstab.loc[table.index, table.columns],
+                                  check_names=False, check_dtype=False)
+
+    # 축 순서를 바꾼 rollup
+    swapped = cube.rollup('지역', '성관').to_series()
+    grouped = frame.groupby(['지역', '성관'], observed=False).size()
+    assert swapped.to_dict() == grouped.reindex(swapped.index, fill_value=0).to_dict()
+
+
+def test_slice_dice_count_match_masks(frame):
+    cube = CountCube.from_frame(frame, ['성관', '시대', '지역'])
+    mask = (frame['성관'] == '김 안동') & (frame['시대'] == '조선 중기')
+    assert cube.count(성관='김 안동', 시대='조선 중기') == mask.sum()
+
+    sliced = cube.slice(성관='김 안동').rollup('지역').to_series()
+    assert sliced.to_dict() == \
+        frame[frame['성관'] == '김 안동']['지역'].value_counts().reindex(sliced.index,
+                                                                     fill_value=0).to_dict()
+
+    diced = cube.dice(지역=['전라', '평안', '경상']).rollup('지역').to_series()
+    counts = frame['지역'].value_counts()
+    assert diced.tolist() == [counts['전라'], 0, counts['경상']]
+
+    with pytest.raises(KeyError):
+        cube.slice(성관='없는 성관')
+
+
+def test_ranked_matches_value_counts(frame):
+    cube = CountCube.from_frame(frame, ['성관', '지역'])
+    ranked = cube.ranked('성관', exclude=['정 동래'])
+    expected = frame['성관'].astype(object).value_counts().drop('정 동래')
+    assert ranked.index.tolist() == expected.index.tolist()
+    assert ranked.tolist() == expected.tolist()
@@ -0,0 +1,46 @@
+"""사전 인코딩: 문자열 컬럼 연산(기존 방식)과 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import code_counts, codes, count_codes, encode_column, encode_pair
+
+SURNAMES = pd.Series(['김', '이', '김', None, '박', '이', '김', '최', '박'], dtype=object)
+BONGWAN = pd.Series(['안동', '전주', '광산', '밀양', None, '전주', '안동', '경주', '밀양'],
+                    dtype=object)
+
+
+def test_encode_column_round_trip():
+    encoded = encode_column(SURNAMES)
+    assert list(encoded.categories) == sorted(SURNAMES.dropna().unique())
+    assert pd.Series(encoded).astype(object).where(lambda s: s.notna(), None).tolist() == \
+        SURNAMES.tolist()
+    assert codes(pd.Series(encoded))[3] == -1
+
+    # 이미 인코딩된 컬럼은 쓰지 않는 코드만 제거하고 순서를 유지
+    reencoded = encode_column(pd.Series(encoded)[SURNAMES != '최'])
+    assert list(reencoded.categories) == ['김', '박', '이']
+
+
+def test_encode_pair_matches_string_concat():
+    left = pd.Series(encode_column(SURNAMES))
+    right = pd.Series(encode_column(BONGWAN))
+    pair = pd.Series(encode_pair(left, right))
+
+    expected = SURNAMES + ' ' + BONGWAN
+    assert pair.astype(object).where(pair.notna(), None).tolist() == \
+        expected.where(expected.notna(), None).tolist()
+    assert list(pair.cat.categories) == sorted(expected.dropna().unique())
+
+
+def test_count_codes_matches_value_counts():
+    clans = SURNAMES + ' ' + BONGWAN
+    encoded = pd.Series(encode_column(clans), name='성관')
+    counted = count_codes(encoded)
+    expected = clans.rename('성관').value_counts()
+    assert counted.index.tolist() == expected.index.tolist()
+    assert counted.tolist() == expected.tolist()
+
+    # code_counts는 코드 표 순서의 개수
+    np.testing.assert_array_equal(code_counts(encoded),
+                                  expected.reindex(encoded.cat.categories).to_numpy())
@@ -0,0 +1,69 @@
+"""시대 구분: 기존 분석별 연도 → 시대 함수와 경계 연도 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+
+from era_binning import custom_scheme, era_column, get_scheme
+
+YEARS = [1392, 1449, 1450, 1493, 1494, 1495, 1549, 1550, 1607, 1608, 1649, 1650,
+         1749, 1750, 1849, 1850, 1894, np.nan]
+
+
+def baseline_categorize_period(year):
+    """기존 KinshipAnalyzer.analyze_period_changes의 3구분"""
+    if pd.isna(year):
+        return '미상'
+    if year < 1494:
+        return '조선 전기'
+    elif year < 1608:
+        return '조선 중기'
+    else:
+        return '조선 후기'
+
+
+def baseline_categorize_detailed(year):
+    """기존 ComprehensiveKinshipAnalyzer.analyze_temporal_changes의 6구분"""
+    if year < 1450:
+        return '조선 초기 (1392-1449)'
+    elif year < 1550:
+        return '조선 전기 (1450-1549)'
+    elif year < 1650:
+        return '조선 중기 (1550-1649)'
+    elif year < 1750:
+        return '조선 후기 전반 (1650-1749)'
+    elif year < 1850:
+        return '조선 후기 후반 (1750-1849)'
+    else:
+        return '조선 말기 (1850-1910)'
+
+
+def test_three_era_matches_baseline():
+    eras = get_scheme('3-era').bin(YEARS, unknown='미상')
+    assert list(eras) == [baseline_categorize_period(y) for y in YEARS]
+    assert eras.ordered
+    assert list(eras.categories) == ['조선 전기', '조선 중기', '조선 후기', '미상']
+
+
+def test_six_era_matches_baseline():
+    scheme = get_scheme('6-era')
+    years = YEARS[:-1]
+    eras = scheme.bin(years)
+    detailed = np.asarray(scheme.span_labels(), dtype=object)[eras.codes]
+    assert list(detailed) == [baseline_categorize_detailed(y) for y in years]
+    assert pd.isna(scheme.bin([np.nan])[0])
+
+
+def test_reign_and_custom_boundaries():
+    reigns = get_scheme('reign').bin([1392, 1493, 1494, 1608, 1724, 1909])
+    assert list(reigns) == ['태조', '성종', '연산군', '광해군', '영조', '순종']
+
+    scheme = custom_scheme([1600], ['이전', '이후'])
+    assert list(scheme.bin([1599, 1600])) == ['이전', '이후']
+
+
+def test_era_column_is_cached_per_frame():
+    df = pd.DataFrame({'시험년_int': [1493.0, 1494.0, np.nan]})
+    first = era_column(df, '3-era', unknown='미상')
+    assert era_column(df, '3-era', unknown='미상') is first
+    assert first.tolist() == ['조선 전기', '조선 중기', '미상']
+    assert era_column(df.copy(), '3-era', unknown='미상') is not first
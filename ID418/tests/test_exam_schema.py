@@ -0,0 +1,28 @@
+"""과거별 스키마 컬럼/dtype 검사 (무과 픽스처는 실제 태그 배치)"""
+
+import pytest
+
+from exam_schema import EXAM_SCHEMAS
+
+
+@pytest.mark.parametrize('exam_type', list(EXAM_SCHEMAS))
+def test_columns_and_dtypes(parser, exam_type):
+    df = parser.parse(exam_type)
+    schema = EXAM_SCHEMAS[exam_type]
+    assert list(df.columns) == [f.name for f in schema] + ['과거구분']
+    for f in schema:
+        assert str(df[f.name].dtype) == f.dtype, f.name
+    assert str(df['과거구분'].dtype) == 'category'
+
+
+def test_mugwa_reads_shifted_tags(parser):
+    row = parser.parse('무과').iloc[0]
+    assert (row['급제자'], row['본관'], row['등급'], row['거주지'], row['부명']) == (
+        '김수동', '안동', '병과', '서울', '김일')
+    assert (row['시험년'], row['생년'], row['등위']) == (1694, 1670, 5)
+
+
+def test_mungwa_values(parser):
+    row = parser.parse('문과').iloc[0]
+    assert (row['급제자'], row['자'], row['본관'], row['시험명']) == ('김영석', '자윤', '안동', '식년시')
+    assert (row['시험년'], row['생년'], row['등위']) == (1684, 1650, 3)
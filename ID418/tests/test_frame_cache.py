@@ -0,0 +1,74 @@
+"""FrameCache 캐시 재사용·무효화와 컬럼 투영 검사"""
+
+import os
+
+from kinship_analysis import KwagwaDataParser
+
+
+def test_projections_do_not_evict_each_other(parser, monkeypatch):
+    calls = []
+    original = KwagwaDataParser.parse
+
+    def counting_parse(self, exam_type, columns=None):
+        calls.append((exam_type, columns))
+        return original(self, exam_type, columns)
+
+    monkeypatch.setattr(KwagwaDataParser, 'parse', counting_parse)
+
+    first = parser.load_exam('문과', ('급제자', '본관'))
+    second = parser.load_exam('문과', ('급제자', '시험년'))
+    assert len(calls) == 2
+
+    # 두 투영 모두 캐시에 남아 다시 파싱하지 않는다
+    again_first = parser.load_exam('문과', ('급제자', '본관'))
+    again_second = parser.load_exam('문과', ('급제자', '시험년'))
+    assert len(calls) == 2
+    assert again_first.equals(first)
+    assert again_second.equals(second)
+
+
+def test_cached_projection_matches_parse(parser):
+    parser.load_exam('문과', ('급제자', '본관'))
+    parser.load_exam('문과', ('시험년', '생년'))
+    cached = parser.load_exam('문과', ('급제자', '생년'))
+    parsed = parser.parse('문과', ('급제자', '생년'))
+    assert cached.equals(parsed)
+
+
+def counting(monkeypatch):
+    """KwagwaDataParser.parse 호출 과거 목록"""
+    calls = []
+    original = KwagwaDataParser.parse
+
+    def counting_parse(self, exam_type, columns=None):
+        calls.append(exam_type)
+        return original(self, exam_type, columns)
+
+    monkeypatch.setattr(KwagwaDataParser, 'parse', counting_parse)
+    return calls
+
+
+def test_cache_invalidation(copied_data_dir, tmp_path, monkeypatch):
+    calls = counting(monkeypatch)
+    parser = KwagwaDataParser(copied_data_dir, cache_dir=tmp_path / 'cache')
+    path = parser.exam_path('문과')
+    first = parser.load_exam('문과')
+    assert parser.load_exam('문과').equals(first)
+    assert calls == ['문과']
+
+    # 수정 시각만 바뀌면 내용 해시가 같으므로 캐시를 그대로 쓴다
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert parser.load_exam('문과').equals(first)
+    assert calls == ['문과']
+
+    # 내용이 바뀌면 다시 파싱한다
+    path.write_text(path.read_text(encoding='utf-8').replace('이정', '이전'), encoding='utf-8')
+    changed = parser.load_exam('문과')
+    assert calls == ['문과', '문과']
+    assert changed['급제자'].tolist()[1] == '이전'
+
+    # 스키마(캐시 형식 키)가 바뀌어도 다시 파싱한다
+    monkeypatch.setattr(KwagwaDataParser, 'cache_variant', lambda self, exam_type: 'other')
+    parser.load_exam('문과')
+    assert calls == ['문과', '문과', '문과']
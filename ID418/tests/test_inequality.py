@@ -0,0 +1,87 @@
+"""불평등 지표 일괄 계산: 분포별로 따로 계산한 기존 공식과 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from inequality import (METRIC_COLUMNS, inequality, inequality_by, row_inequality,
+                        segmented_inequality)
+
+
+def baseline_gini(values):
+    """기존 AdvancedKinshipAnalyzer._calculate_gini"""
+    sorted_values = np.sort(values)
+    n = len(values)
+    cumsum = np.cumsum(sorted_values)
+    return (2 * np.sum((np.arange(1, n + 1)) * sorted_values)) / (n * cumsum[-1]) - (n + 1) / n
+
+
+def baseline_metrics(counts):
+    """가문별 급제자 수(0 제외) 하나의 지표를 정의대로 계산"""
+    counts = np.asarray([c for c in counts if c > 0], dtype=np.float64)
+    share = counts / counts.sum()
+    k = max(1, int(len(counts) * 0.1))
+    entropy = -np.sum(share * np.log(share))
+    return {
+        '가문수': len(counts),
+        '급제자수': counts.sum(),
+        '지니계수': baseline_gini(counts),
+        '상위10%점유': np.sort(counts)[::-1][:k].sum() / counts.sum(),
+        'HHI': np.sum(share ** 2),
+        '타일지수': np.log(len(counts)) - entropy,
+        '엔트로피': entropy
+    }
+
+
+def assert_metrics(actual, expected):
+    for name in METRIC_COLUMNS:
+        assert actual[name] == pytest.approx(expected[name], rel=1e-12, abs=1e-12), name
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(7)
+    values = rng.geometric(0.3, size=(40, 25)) - 1
+    values[0, :] = 0
+    values[0, 3] = 4
+    return values
+
+
+def test_row_inequality_matches_baseline(matrix):
+    metrics = row_inequality(matrix)
+    for row, counts in enumerate(matrix):
+        assert_metrics({name: values[row] for name, values in metrics.items()},
+                       baseline_metrics(counts))
+
+
+def test_segmented_inequality_matches_baseline(matrix):
+    groups = np.repeat(np.arange(matrix.shape[0] + 1), matrix.shape[1])
+    counts = np.concatenate([matrix.ravel(), np.zeros(matrix.shape[1])])
+    metrics = segmented_inequality(groups, counts)
+    for row, row_counts in enumerate(matrix):
+        assert_metrics({name: values[row] for name, values in metrics.items()},
+                       baseline_metrics(row_counts))
+
+    # 급제자가 없는 그룹은 NaN
+    assert metrics['가문수'][-1] == 0
+    assert np.isnan(metrics['지니계수'][-1])
+    assert_metrics(inequality(matrix[1]), baseline_metrics(matrix[1]))
+
+    # 급제자가 하나도 없는 분포
+    empty = inequality([])
+    assert empty['가문수'] == 0 and np.isnan(empty['지니계수'])
+
+
+def test_inequality_by_matches_groupby(parser):
+    from prepared_store import prepared_frame
+    from era_binning import era_column
+
+    data = pd.concat([parser.load_exam('문과'), parser.load_exam('사마시')], ignore_index=True)
+    df = prepared_frame(data)
+    eras = era_column(df, '6-era')
+    table = inequality_by(df.assign(시대=eras), '시대')
+
+    clans = df['성관'].astype(object)
+    for era, counts in clans.groupby(eras, observed=True).value_counts().groupby(level=0):
+        assert_metrics(table.loc[era], baseline_metrics(counts.to_numpy()))
+    assert set(table.index) == set(eras.dropna())
@@ -0,0 +1,66 @@
+"""KwagwaDataParser 로딩 경로 검사"""
+
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from exam_schema import INT
+from kinship_analysis import KwagwaDataParser
+
+
+def baseline_values(path, tag):
+    """기존 파서와 같은 방식(전체 트리 + find)으로 읽은 레코드별 태그 텍스트"""
+    records = ET.parse(path).getroot().find('items').findall(KwagwaDataParser.RECORD_TAG)
+    return [(item.find(tag).text if item.find(tag) is not None else None) or ""
+            for item in records]
+
+
+@pytest.mark.parametrize('exam_type', list(KwagwaDataParser.EXAM_FILES))
+def test_streaming_matches_tree_and_baseline(data_dir, exam_type):
+    tree = KwagwaDataParser(data_dir, use_cache=False).parse(exam_type)
+    streamed = KwagwaDataParser(data_dir, streaming=True, use_cache=False).parse(exam_type)
+    assert_frame_equal(streamed, tree)
+
+    path = KwagwaDataParser(data_dir).exam_path(exam_type)
+    for f in KwagwaDataParser.EXAM_SCHEMAS[exam_type]:
+        expected = pd.Series(baseline_values(path, f.tag), name=f.name)
+        if f.dtype == INT:
+            expected = pd.to_numeric(expected, errors='coerce').astype(INT)
+            assert streamed[f.name].equals(expected), f.name
+        else:
+            assert streamed[f.name].astype(str).tolist() == expected.tolist(), f.name
+
+
+def test_parallel_load_matches_sequential(data_dir):
+    sequential = KwagwaDataParser(data_dir, use_cache=False).load_all_data(lazy=False)
+    parser = KwagwaDataParser(data_dir, workers=2, use_cache=False)
+    parallel = parser.load_all_data()
+    assert list(parallel) == list(sequential)
+    for exam_type in KwagwaDataParser.EXAM_FILES:
+        assert_frame_equal(parallel[exam_type], sequential[exam_type])
+        assert parser.parse_stats[exam_type]['records'] == len(sequential[exam_type])
+
+
+def test_lazy_loading_parses_on_first_access(parser, monkeypatch):
+    calls = []
+    original = KwagwaDataParser.parse
+
+    def counting_parse(self, exam_type, columns=None):
+        calls.append(exam_type)
+        return original(self, exam_type, columns)
+
+    monkeypatch.setattr(KwagwaDataParser, 'parse', counting_parse)
+    data = parser.load_all_data()
+    assert calls == []
+    assert '무과' in data and len(data) == 4
+    assert not data.is_loaded('무과')
+
+    mungwa = data['문과']
+    assert calls == ['문과']
+    assert data['문과'] is mungwa
+    assert calls == ['문과']
+    assert [data.is_loaded(t) for t in data] == [True, False, False, False]
+    with pytest.raises(KeyError):
+        data['향시']
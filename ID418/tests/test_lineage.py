@@ -0,0 +1,35 @@
+"""무과 부명 계보 검사 (픽스처는 실제 무과 태그 배치)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lineage import LINEAGE_COLUMNS, LineageGraph
+
+
+def test_mugwa_schema_reads_shifted_tags(parser):
+    df = parser.load_exam('무과', LINEAGE_COLUMNS)
+    assert df['급제자'].tolist()[:3] == ['김수동', '김영석', '김태호']
+    assert df['본관'].tolist()[:3] == ['안동', '안동', '안동']
+    assert df['시험년'].tolist()[:3] == [1694, 1714, 1740]
+    assert df['부명'].tolist()[:3] == ['김일', '김수동', '김영석']
+
+
+def test_father_son_chain(parser):
+    graph = LineageGraph.from_frame(parser.load_exam('무과', LINEAGE_COLUMNS))
+
+    # 김 안동 3대 사슬만 연결되고, 같은 이름의 김 광산 김수동은 아버지가 되지 않는다
+    assert graph.parent.tolist() == [-1, 0, 1, -1, -1]
+    assert graph.chains(3).tolist() == [[0, 1, 2]]
+    assert graph.descendants(0).tolist() == [1, 2]
+
+    table = graph.clan_table()
+    assert table.loc['김 안동', '부자연속세대'] == 3
+    assert table.loc['김 광산', '부자연속세대'] == 1
+
+
+def test_requires_clan_and_year():
+    df = pd.DataFrame({'급제자': ['김수동'], '본관': ['안동'],
+                       '시험년': [np.nan], '부명': ['김일']})
+    with pytest.raises(ValueError):
+        LineageGraph.from_frame(df)
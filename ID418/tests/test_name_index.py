@@ -0,0 +1,68 @@
+"""이름 글자 색인: 성관별 문자열 groupby(기존 방식)와 조회·항렬자 집계 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from name_index import NameIndex
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(13)
+    n = 500
+    surnames = rng.choice(['김', '이', '박'], size=n)
+    bongwan = rng.choice(['안동', '전주', '밀양', '경주'], size=n)
+    second = rng.choice(list('영수태문정'), size=n, p=[0.4, 0.2, 0.2, 0.1, 0.1])
+    third = rng.choice(list('석동호민') + [''], size=n)
+    names = pd.Series([a + b + c for a, b, c in zip(surnames, second, third)], dtype=object)
+    names[rng.random(n) < 0.03] = names[0] + '우'
+    years = rng.integers(1400, 1890, size=n).astype(float)
+    years[rng.random(n) < 0.1] = np.nan
+    clans = pd.Series(surnames + ' ' + bongwan, dtype=object)
+    clans[rng.random(n) < 0.02] = None
+    return pd.DataFrame({'급제자': names, '성관': pd.Categorical(clans), '시험년_int': years})
+
+
+def test_rows_match_masks(frame):
+    index = NameIndex.from_frame(frame)
+    for clan in ['김 안동', '박 경주']:
+        for position in (1, 2, 3):
+            for char in ['김', '영', '수', '석', '없']:
+                mask = (frame['성관'] == clan) & (frame['급제자'].str[position - 1] == char)
+                assert index.rows(clan, position, char).tolist() == np.flatnonzero(mask).tolist()
+    assert len(index.rows('없는 성관', 2, '영')) == 0
+
+
+def test_shared_characters_match_groupby(frame):
+    shared = NameIndex.from_frame(frame).shared_characters(min_count=3, min_family=5)
+
+    expected = []
+    for clan, group in frame.groupby('성관', observed=True):
+        if len(group) < 5:
+            continue
+        for position in (2, 3):
+            chars = group['급제자'].str[position - 1]
+            for char, count in chars.value_counts().items():
+                if count < 3:
+                    continue
+                years = group.loc[chars == char, '시험년_int']
+                expected.append((clan, position, char, count, len(group),
+                                 years.min(), years.max(), years.notna().sum()))
+    actual = [tuple(row) for row in shared.itertuples(index=False)]
+    assert actual == expected
+
+
+def test_top_character_matches_baseline(frame):
+    """기존 analyze_name_patterns: 성관별 2번째 글자 최빈값과 그 횟수"""
+    shared = NameIndex.from_frame(frame).shared_characters(positions=(2,), min_count=3,
+                                                           min_family=5)
+    top = shared.drop_duplicates('성관').set_index('성관')
+
+    for clan, group in frame.groupby('성관', observed=True):
+        if len(group) < 5:
+            continue
+        second_chars = group['급제자'].str.split('', expand=True)[2].value_counts()
+        if second_chars.iloc[0] >= 3:
+            assert (top.at[clan, '항렬자'], top.at[clan, '사용횟수']) == \
+                (second_chars.index[0], second_chars.iloc[0])
@@ -0,0 +1,34 @@
+"""동방 성관 관계망 검사 (무과 픽스처는 실제 태그 배치)"""
+
+from network import EXAM_TYPES, SESSION_COLUMNS, ClanNetwork
+
+
+def test_all_exams_contribute(parser):
+    data = {exam_type: parser.load_exam(exam_type, SESSION_COLUMNS) for exam_type in EXAM_TYPES}
+    network = ClanNetwork.from_exams(data)
+
+    assert (network.coverage['반영수'] == network.coverage['급제자수']).all()
+    assert network.coverage.loc['무과', '반영수'] == 5
+
+    # 무과 1714년 회차의 김 안동·김 광산, 문과 1684년 식년시의 김 안동·이 전주,
+    # 사마시 1678년 식년시의 김 안동·최 경주가 연결된다
+    index = {clan: i for i, clan in enumerate(network.clan_labels)}
+    assert network.adjacency[index['김 안동'], index['김 광산']] == 1
+    assert network.adjacency[index['김 안동'], index['이 전주']] == 1
+    assert network.adjacency[index['김 안동'], index['최 경주']] == 1
+    assert network.n_edges == 3
+
+
+def test_session_members_use_prepared_clan_key(parser):
+    from network import session_members
+    from prepared_store import prepared_frame
+
+    df = parser.load_exam('사마시')
+    df = df.assign(본관=df['본관'].astype(object).where(df['급제자'] != '최민', ''))
+    clans, sessions = session_members(df, '사마시')
+
+    prepared = prepared_frame(df)['성관'].astype(object)
+    assert clans[df['급제자'] != '최민'].tolist() == prepared[df['급제자'] != '최민'].tolist()
+    # 본관이 빈 급제자는 관계망에서 제외
+    assert clans[df['급제자'] == '최민'].isna().all()
+    assert sessions.tolist()[0] == '사마시|식년시|1678'
@@ -0,0 +1,51 @@
+"""공유 전처리 저장소: 메모이즈 동작과 기존 prepare_data 결과 일치 검사"""
+
+import pandas as pd
+
+from kinship_analysis import KinshipAnalyzer
+from prepared_store import PreparedFrameStore, prepared_frame
+
+
+def baseline_prepare(source):
+    """기존 KinshipAnalyzer.prepare_data의 전처리 (원본은 기존 파서처럼 문자열 컬럼)"""
+    df = source.astype({'급제자': object, '본관': object})
+    df['시험년_int'] = pd.to_numeric(df['시험년'].astype(object), errors='coerce')
+    df['생년_int'] = pd.to_numeric(df['생년'].astype(object), errors='coerce')
+    df = df.dropna(subset=['급제자', '본관'])
+    df['성씨'] = df['급제자'].str[0]
+    df['성관'] = df['성씨'] + ' ' + df['본관']
+    return df
+
+
+def test_same_source_returns_same_frame(parser):
+    store = PreparedFrameStore()
+    source = parser.load_exam('문과')
+    first = store.get(source)
+    assert store.get(source) is first
+    assert len(store) == 1
+
+    # 내용이 같아도 다른 원본 객체나 다른 옵션이면 따로 만든다
+    assert store.get(source.copy()) is not first
+    extended = store.get(source, numeric=('시험년', '생년', '등위'))
+    assert extended is not first
+    assert extended['등위_int'].tolist() == [3.0, 12.0, 1.0]
+
+
+def test_matches_baseline_prepare(parser):
+    source = parser.load_exam('문과')
+    prepared = PreparedFrameStore().get(source)
+    expected = baseline_prepare(source)
+
+    assert prepared.index.equals(expected.index)
+    for col in ('시험년_int', '생년_int'):
+        pd.testing.assert_series_equal(prepared[col], expected[col].astype('float64'))
+    for col in ('성씨', '본관', '성관'):
+        assert prepared[col].astype(object).tolist() == expected[col].astype(object).tolist()
+
+
+def test_analyzers_share_prepared_frame(parser):
+    data = {'문과': parser.load_exam('문과')}
+    first = KinshipAnalyzer(data)
+    second = KinshipAnalyzer(data)
+    assert second.combined_df is first.combined_df
+    assert prepared_frame(data['문과']) is first.combined_df
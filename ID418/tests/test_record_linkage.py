@@ -0,0 +1,22 @@
+"""사마시·문과·무과 인물 연결 검사 (무과 픽스처는 실제 태그 배치)"""
+
+from record_linkage import DEFAULT_EXAMS, LINKAGE_COLUMNS, link_exams, progression_counts
+
+
+def test_links_across_exams(parser):
+    data = {exam_type: parser.load_exam(exam_type, LINKAGE_COLUMNS) for exam_type in DEFAULT_EXAMS}
+    crosswalk = link_exams(data)
+
+    people = crosswalk.groupby('인물ID')['과거구분'].agg(list)
+    linked = crosswalk[crosswalk['인물ID'].isin(people[people.str.len() > 1].index)]
+    assert sorted(zip(linked['과거구분'], linked['급제자'])) == [
+        ('무과', '박수동'), ('문과', '김영석'), ('사마시', '김영석'), ('사마시', '박수동')]
+
+    # 무과 김영석은 생년(1690)이 달라 사마시·문과 김영석(1650)과 다른 인물
+    mugwa = crosswalk[(crosswalk['과거구분'] == '무과') & (crosswalk['급제자'] == '김영석')]
+    assert mugwa['생년'].tolist() == [1690]
+    assert people[mugwa['인물ID'].iloc[0]] == ['무과']
+
+    counts = progression_counts(crosswalk)
+    assert counts['사마시+문과'] == 1
+    assert counts['사마시+무과'] == 1
@@ -0,0 +1,54 @@
+"""지역 분류 표: 기존 map_region(if/elif)과 분류 결과 일치 검사"""
+
+import pandas as pd
+
+from region_gazetteer import RegionGazetteer, default_gazetteer
+
+
+def baseline_map_region(geo):
+    """기존 IntegratedVisualization.prepare_data의 map_region"""
+    if pd.isna(geo) or geo == '' or '미상' in str(geo):
+        return '미상'
+    geo = str(geo)
+    if '한성' in geo or '경' in geo or '京' in geo:
+        return '경기/한양'
+    elif '평양' in geo or '평안' in geo or '안주' in geo or '정주' in geo:
+        return '평안'
+    elif '전주' in geo or '전라' in geo or '나주' in geo or '남원' in geo:
+        return '전라'
+    elif '함흥' in geo or '함경' in geo or '북청' in geo:
+        return '함경'
+    elif '강릉' in geo or '강원' in geo or '원주' in geo or '춘천' in geo:
+        return '강원'
+    elif '황해' in geo or '해주' in geo:
+        return '황해'
+    elif '충청' in geo or '충주' in geo or '청주' in geo or '공주' in geo:
+        return '충청'
+    elif '제주' in geo:
+        return '제주'
+    else:
+        return '기타'
+
+
+RESIDENCES = [
+    '서울', '한성', '경기 수원', '京', '평안 정주', '평양', '전라 남원', '전주', '경상 안동',
+    '함경 북청', '강원 원주', '춘천', '황해 해주', '충청 공주', '청주', '제주', '미상',
+    '전라 미상', '경상 경주', '안주', '', None, '경상 안동', '서울'
+]
+
+
+def test_default_table_matches_baseline():
+    residence = pd.Series(RESIDENCES, dtype=object)
+    classified = default_gazetteer().classify(residence)
+    assert list(classified.astype(object)) == [baseline_map_region(v) for v in RESIDENCES]
+
+    # 인코딩된 거주지 컬럼도 같은 결과
+    encoded = residence.astype('category')
+    assert list(default_gazetteer().classify(encoded).astype(object)) == \
+        [baseline_map_region(v) for v in RESIDENCES]
+
+
+def test_rule_order_is_priority():
+    gazetteer = RegionGazetteer([('가', ['안']), ('나', ['안동'])])
+    assert list(gazetteer.classify(pd.Series(['경상 안동', '대구']))) == ['가', '기타']
+    assert gazetteer.regions == ['미상', '가', '나', '기타']
@@ -0,0 +1,106 @@
+"""배포판 증분 반영: 레코드 비교와 증분 집계가 전체 재계산과 같은지 검사"""
+
+import pandas as pd
+
+from kinship_analysis import KwagwaDataParser
+from release_ingest import (AGGREGATE_EXAMS, ReleaseIngestor, apply_delta,
+                            clan_period_counts, diff_records)
+
+PREVIOUS = '20200929'
+RELEASE = '20210315'
+
+MUNGWA_ADDED = (
+    '<급제자><ID>문과000003</ID><시험명>정시</시험명><왕대>정조</왕대><왕력>5</왕력><간지>신축</간지>'
+    '<시험년>1781</시험년><급제자>정약</급제자><자></자><호></호><시호></시호><생년>1750</생년>'
+    '<졸년></졸년><본관>나주</본관><등급>병과</등급><등위>7</등위><거주지>경기 광주</거주지>'
+    '<시험유형>문과</시험유형></급제자>\n'
+)
+
+
+def make_release(data_dir):
+    """픽스처를 고쳐 새 배포판 XML을 만든다
+
+    문과: 이정 본관 변경, 박수동 삭제, 문과000003 추가 / 무과: 김태호 삭제, 김민호 추가
+    """
+    old = KwagwaDataParser(data_dir, release=PREVIOUS)
+    new = KwagwaDataParser(data_dir, release=RELEASE)
+    for exam_type in KwagwaDataParser.EXAM_FILES:
+        lines = old.exam_path(exam_type).read_text(encoding='utf-8').splitlines(keepends=True)
+        if exam_type == '문과':
+            lines = [line.replace('<본관>전주</본관>', '<본관>경주</본관>') for line in lines
+                     if '문과000002' not in line]
+            lines.insert(-1, MUNGWA_ADDED)
+        elif exam_type == '무과':
+            removed = next(line for line in lines if '김태호' in line)
+            lines.remove(removed)
+            lines.insert(-1, removed.replace('김태호', '김민호').replace('1740', '1770'))
+        new.exam_path(exam_type).write_text(''.join(lines), encoding='utf-8')
+    return old, new
+
+
+def test_diff_records(copied_data_dir):
+    old, new = make_release(copied_data_dir)
+
+    diff = diff_records(old.load_exam('문과'), new.load_exam('문과'))
+    assert diff['added']['ID'].tolist() == ['문과000003']
+    assert diff['removed']['ID'].tolist() == ['문과000002']
+    assert diff['changed'][['ID', '컬럼', '이전값', '새값']].values.tolist() == \
+        [['문과000001', '본관', '전주', '경주']]
+
+    # 무과는 ID가 없으므로 바뀐 행이 삭제 + 추가로 나타난다
+    diff = diff_records(old.load_exam('무과'), new.load_exam('무과'))
+    assert diff['added']['급제자'].tolist() == ['김민호']
+    assert diff['removed']['급제자'].tolist() == ['김태호']
+    assert diff['changed'].empty
+
+    diff = diff_records(old.load_exam('사마시'), new.load_exam('사마시'))
+    assert diff['added'].empty and diff['removed'].empty and diff['changed'].empty
+
+
+def full_counts(parser):
+    frames = [parser.load_exam(t) for t in AGGREGATE_EXAMS]
+    return clan_period_counts(pd.concat(frames, ignore_index=True)).sort_index()
+
+
+def test_apply_delta_matches_full_rebuild(copied_data_dir):
+    old, new = make_release(copied_data_dir)
+    removed, added = [], []
+    for exam_type in AGGREGATE_EXAMS:
+        diff = diff_records(old.load_exam(exam_type), new.load_exam(exam_type))
+        removed += [diff['removed'], diff['changed_old']]
+        added += [diff['added'], diff['changed_new']]
+
+    updated = apply_delta(full_counts(old), pd.concat(removed, ignore_index=True),
+                          pd.concat(added, ignore_index=True))
+    pd.testing.assert_series_equal(updated, full_counts(new), check_names=False)
+
+    # 무과도 집계에 들어가고, 0이 된 항목(문과 전주 이씨)은 빠진다
+    exams = updated.index.get_level_values('과거구분')
+    assert '무과' in set(exams)
+    assert ('문과', '이 전주') not in {key[:2] for key in updated.index}
+
+
+def test_ingest_with_previous_sources_deleted(copied_data_dir, tmp_path):
+    old, _ = make_release(copied_data_dir)
+    cache_dir = tmp_path / 'cache'
+
+    # 이전 배포판을 한 번 읽어 캐시와 집계를 남긴 뒤 원본 XML을 지운다
+    ReleaseIngestor(copied_data_dir, PREVIOUS, RELEASE, cache_dir=cache_dir).previous_aggregates()
+    for exam_type in KwagwaDataParser.EXAM_FILES:
+        old.exam_path(exam_type).unlink()
+
+    ingestor = ReleaseIngestor(copied_data_dir, PREVIOUS, RELEASE, cache_dir=cache_dir)
+    updated = ingestor.ingest()
+    ingestor.verify(updated)
+    assert ingestor.diffs['문과']['added']['ID'].tolist() == ['문과000003']
+    assert len(ingestor.diffs['무과']['removed']) == 1
+
+
+def test_clan_key_matches_prepared_store(parser):
+    from prepared_store import prepared_frame
+
+    df = parser.load_exam('문과')
+    df = df.assign(본관=df['본관'].astype(object).where(df['급제자'] != '이정', '전주 '))
+    counts = clan_period_counts(df)
+    clans = set(prepared_frame(df)['성관'].astype(str))
+    assert set(counts.index.get_level_values('성관')) == clans
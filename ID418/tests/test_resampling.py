@@ -0,0 +1,56 @@
+"""부트스트랩 신뢰구간: 고정 시드 재현성과 복제별 지표 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from resampling import _bootstrap_chunk, bootstrap_groups, percentile_interval
+
+GROUPS = {
+    '전기': np.array([5, 3, 3, 2, 1, 1, 1, 1, 1, 1, 1, 1]),
+    '후기': np.array([9, 4, 2, 2, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]),
+    '단일': np.array([4])
+}
+
+
+def test_fixed_seed_is_reproducible_for_any_worker_count():
+    options = {'n_boot': 1200, 'seed': 11}
+    first = bootstrap_groups(GROUPS, **options)
+    pd.testing.assert_frame_equal(bootstrap_groups(GROUPS, **options), first)
+    pd.testing.assert_frame_equal(bootstrap_groups(GROUPS, workers=2, **options), first)
+
+    other = bootstrap_groups(GROUPS, n_boot=1200, seed=12)
+    assert not other['하한'].equals(first['하한'])
+
+    # 가문이 하나뿐이면 복제도 모두 같은 분포
+    single = first.loc['단일']
+    assert single.loc['지니계수', ['하한', '상한', '표준오차']].tolist() == [0, 0, 0]
+
+
+def test_chunk_matches_per_replicate_baseline():
+    counts = GROUPS['후기']
+    seed = np.random.SeedSequence(3)
+    metrics = _bootstrap_chunk(counts, 50, seed, 0.1)
+
+    # 같은 시드로 복제마다 급제자를 복원추출해 가문별로 세고 기존 지니 공식으로 계산
+    rng = np.random.default_rng(seed)
+    passers = np.repeat(np.arange(len(counts)), counts)
+    draws = rng.integers(0, len(passers), size=(50, len(passers)))
+    for row, draw in enumerate(draws):
+        family_counts = np.bincount(passers[draw], minlength=len(counts))
+        values = np.sort(family_counts[family_counts > 0]).astype(float)
+        n = len(values)
+        gini = 2 * np.sum(np.arange(1, n + 1) * values) / (n * values.sum()) - (n + 1) / n
+        share = values / values.sum()
+        assert metrics['지니계수'][row] == pytest.approx(gini, abs=1e-12)
+        assert metrics['HHI'][row] == pytest.approx(np.sum(share ** 2), abs=1e-12)
+
+
+def test_intervals_come_from_replicate_percentiles():
+    replicates = np.arange(1001, dtype=float) / 1000
+    assert percentile_interval(replicates, 0.4, method='percentile') == \
+        pytest.approx((0.025, 0.975))
+    # 기본 구간: 백분위수를 추정값 기준으로 뒤집음
+    assert percentile_interval(replicates, 0.4) == pytest.approx((0.8 - 0.975, 0.8 - 0.025))
+    with pytest.raises(ValueError):
+        percentile_interval(replicates, 0.4, method='normal')
@@ -0,0 +1,55 @@
+"""회차 색인: (시험년, 시험명) groupby(기존 방식)와 명단·회차별 집중도 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis_context import AnalysisContext
+from inequality import METRIC_COLUMNS, inequality
+from session_index import SessionIndex
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(17)
+    n = 700
+    clans = rng.choice([f'성관{i:02d}' for i in range(25)], size=n,
+                       p=np.r_[[0.15, 0.1], [0.75 / 23] * 23])
+    years = rng.choice([1450.0, 1494.0, 1550.0, 1608.0, 1700.0, np.nan], size=n,
+                       p=[0.2, 0.2, 0.2, 0.15, 0.2, 0.05])
+    exams = rng.choice(['식년시', '별시', '증광시'], size=n).astype(object)
+    exams[rng.random(n) < 0.03] = None
+    return pd.DataFrame({'성관': pd.Categorical(clans), '시험년_int': years, '시험명': exams})
+
+
+def grouped(frame):
+    """회차 키가 모두 있는 행의 (시험년, 시험명) groupby (키 정렬 순)"""
+    return frame.dropna(subset=['시험년_int', '시험명']).groupby(['시험년_int', '시험명'],
+                                                              sort=True)
+
+
+def test_rows_match_groupby(frame):
+    index = SessionIndex(AnalysisContext(frame))
+    groups = list(grouped(frame))
+    assert len(index) == len(groups)
+    for session, ((year, exam), group) in enumerate(groups):
+        assert index.rows(session).tolist() == group.index.tolist()
+    assert index.sizes.sum() == frame[['시험년_int', '시험명']].notna().all(axis=1).sum()
+
+    labels = index.labels()
+    assert list(zip(labels['시험년'], labels['시험명'])) == [key for key, _ in groups]
+    assert labels.loc[labels['시험년'] == 1494, '시대'].eq('조선 중기').all()
+
+
+def test_concentration_matches_groupby(frame):
+    table = SessionIndex(AnalysisContext(frame)).concentration(top_clans=3)
+    top = frame['성관'].astype(object).value_counts().head(3).index
+
+    for session, (_, group) in enumerate(grouped(frame)):
+        counts = group['성관'].astype(object).value_counts()
+        expected = inequality(counts.to_numpy())
+        row = table.iloc[session]
+        for name in METRIC_COLUMNS:
+            assert row[name] == pytest.approx(expected[name], rel=1e-12, abs=1e-12), name
+        assert row['반복성관수'] == (counts >= 2).sum()
+        assert row['상위3성관점유'] == pytest.approx(group['성관'].isin(top).mean())
@@ -0,0 +1,48 @@
+"""이동창 불평등 시계열: 창마다 처음부터 다시 센 지표와 결과 일치 검사"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from inequality import METRIC_COLUMNS, inequality
+from window_inequality import sliding_inequality
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(21)
+    n = 600
+    clans = rng.choice([f'성관{i}' for i in range(30)], size=n, p=np.r_[[0.2], [0.8 / 29] * 29])
+    regions = rng.choice(['경기/한양', '경상', '전라', '미상'], size=n)
+    years = rng.integers(1400, 1560, size=n).astype(float)
+    years[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({'성관': pd.Categorical(clans), '지역': pd.Categorical(regions),
+                         '시험년_int': years})
+
+
+def brute_force(df, window, start, end, family='성관', exclude=()):
+    rows = []
+    for first in range(start, end - window + 2):
+        in_window = df[(df['시험년_int'] >= first) & (df['시험년_int'] <= first + window - 1)
+                       & ~df[family].isin(list(exclude))]
+        counts = in_window[family].value_counts().to_numpy()
+        rows.append(inequality(counts))
+    return pd.DataFrame(rows, columns=METRIC_COLUMNS)
+
+
+@pytest.mark.parametrize('window', [1, 10, 30])
+def test_sliding_matches_brute_force(frame, window):
+    table = sliding_inequality(frame, window=window, start=1390, end=1570)
+    expected = brute_force(frame, window, 1390, 1570)
+    assert table['시작년'].tolist() == list(range(1390, 1570 - window + 2))
+    assert (table['종료년'] - table['시작년']).eq(window - 1).all()
+    pd.testing.assert_frame_equal(table[METRIC_COLUMNS], expected, check_dtype=False,
+                                  rtol=1e-12, atol=1e-12)
+
+
+def test_sliding_other_family_with_exclude(frame):
+    table = sliding_inequality(frame, window=20, start=1400, end=1560, family='지역',
+                               exclude=['미상'])
+    expected = brute_force(frame, 20, 1400, 1560, family='지역', exclude=['미상'])
+    pd.testing.assert_frame_equal(table[METRIC_COLUMNS], expected, check_dtype=False,
+                                  rtol=1e-12, atol=1e-12)
@@ -0,0 +1,19 @@
+"""XML 백엔드 × 파싱 모드별 파싱 결과 동일성 검사"""
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from kinship_analysis import KwagwaDataParser
+from xml_backends import parse_variants
+
+# 픽스처 XML의 과거별 급제자 레코드 수 (레코드 안의 '급제자' 이름 필드는 세지 않음)
+FIXTURE_RECORDS = {'문과': 3, '사마시': 3, '잡과': 1, '무과': 5}
+
+
+@pytest.mark.parametrize('exam_type', list(KwagwaDataParser.EXAM_FILES))
+def test_backends_agree(data_dir, exam_type):
+    results = parse_variants(data_dir, exam_type)
+    (_, (expected, _)), *others = results.items()
+    assert len(expected) == FIXTURE_RECORDS[exam_type]
+    for variant, (df, _) in others:
+        assert_frame_equal(df, expected, obj=f"{exam_type} {variant}")
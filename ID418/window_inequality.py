@@ -0,0 +1,89 @@
+"""
+연도 이동창(sliding window) 불평등 시계열
+
+N년 창을 1년씩 옮기며 창 안의 가문 분포 지표(가문수, 지니계수, 상위10%점유 등)를 구한다.
+창마다 처음부터 다시 세지 않고, 창에 새로 들어오는 해와 빠지는 해의 급제자만
+가문별 개수 벡터에 더하고 빼며, 동시에 "급제자 수가 v인 가문 수" 히스토그램도 갱신한다.
+창 위치마다 히스토그램 한 행을 남겨 두었다가 마지막에 inequality.histogram_inequality로
+모든 창의 지표를 한 번에 계산한다.
+
+가문 대신 지역 등 다른 인코딩 컬럼을 family로 주면 같은 방식으로 지역 불평등 추이를 구한다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dictionary_encoding import codes
+from inequality import METRIC_COLUMNS, histogram_inequality
+
+# 기본 시계열 범위 (문과 시행 기간)
+FIRST_YEAR = 1392
+LAST_YEAR = 1894
+
+DEFAULT_WINDOW = 30
+
+
+def sliding_inequality(df, window=DEFAULT_WINDOW, start=FIRST_YEAR, end=LAST_YEAR,
+                       family='성관', year_column='시험년_int', exclude=(), top_fraction=0.1):
+    """window년 이동창 불평등 지표 시계열
+
+    Args:
+        df: 전처리 DataFrame (family 컬럼은 인코딩/범주형)
+        window: 창 길이 (년)
+        start, end: 첫 창의 시작 연도, 마지막 창의 종료 연도
+        exclude: 집계에서 뺄 family 값 (예: 지역 '미상')
+
+    Returns:
+        DataFrame: 창마다 한 행, 시작년/종료년/중심년 + METRIC_COLUMNS
+                   (급제자가 없는 창의 비율 지표는 NaN)
+    """
+    family_col = df[family]
+    family_codes = codes(family_col).astype(np.int64)
+    years = df[year_column].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (family_codes >= 0) & (years >= start) & (years <= end)
+    if len(exclude):
+        excluded = np.flatnonzero(family_col.cat.categories.isin(list(exclude)))
+        valid &= ~np.isin(family_codes, excluded)
+
+    # 연도순 정렬 후 해마다 급제자 구간 경계
+    order = np.argsort(years[valid], kind='stable')
+    years = years[valid][order].astype(np.int64)
+    _, families = np.unique(family_codes[valid][order], return_inverse=True)
+    bounds = np.searchsorted(years, np.arange(start, end + 2))
+
+    n_families = int(families.max()) + 1 if len(families) else 0
+    n_windows = max(0, end - start - window + 2)
+    width = int(np.bincount(families).max(initial=0)) + 1 if len(families) else 1
+
+    counts = np.zeros(n_families, dtype=np.int64)
+    hist = np.zeros(width, dtype=np.int64)
+    hist[0] = n_families
+    rows = np.zeros((n_windows, width), dtype=np.int64)
+
+    def update(batch, sign):
+        """batch 급제자를 창에 넣거나(sign=1) 빼고(sign=-1) 히스토그램 갱신"""
+        if len(batch) == 0:
+            return
+        touched, added = np.unique(batch, return_counts=True)
+        before = counts[touched]
+        after = before + sign * added
+        hist[:] += np.bincount(after, minlength=width) - np.bincount(before, minlength=width)
+        counts[touched] = after
+
+    if n_windows:
+        update(families[bounds[0]:bounds[window]], 1)
+        rows[0] = hist
+    for i in range(1, n_windows):
+        update(families[bounds[i - 1]:bounds[i]], -1)
+        update(families[bounds[i + window - 1]:bounds[i + window]], 1)
+        rows[i] = hist
+
+    metrics = histogram_inequality(rows, top_fraction)
+    table = pd.DataFrame(metrics, columns=METRIC_COLUMNS)
+    table.loc[table['가문수'] == 0, METRIC_COLUMNS[2:]] = np.nan
+
+    first = start + np.arange(n_windows)
+    table.insert(0, '시작년', first)
+    table.insert(1, '종료년', first + window - 1)
+    table.insert(2, '중심년', first + (window - 1) / 2)
+    return table
@@ -0,0 +1,208 @@
+"""
+과거 XML 파서 백엔드
+
+- stdlib: xml.etree.ElementTree (항상 사용 가능)
+- lxml  : lxml.etree (설치되어 있으면 'auto'가 선택, iterparse 태그 필터 사용)
+
+두 백엔드 모두 급제자 레코드마다 {태그: 텍스트}를 문서 순서대로 돌려주며,
+레코드 안의 '급제자'(이름) 필드 요소는 레코드로 취급하지 않는다.
+어느 백엔드를 쓰든 KwagwaDataParser의 결과 DataFrame은 동일해야 하며
+(tests/test_xml_backends.py가 픽스처 XML로 검사), 이 모듈을 직접 실행하면
+네 과거 모두에 대해 백엔드 × 파싱 모드별 속도를 비교한다.
+
+    python xml_backends.py --data-dir <XML 디렉터리>
+"""
+
+import argparse
+import time
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class StdlibBackend:
+    """xml.etree.ElementTree 백엔드"""
+
+    name = 'stdlib'
+
+    def tree_values(self, filepath, record_tag, tags):
+        """전체 트리를 올린 뒤 레코드마다 {태그: 텍스트}를 돌려준다"""
+        root = ET.parse(filepath).getroot()
+        wanted = set(tags)
+        name_fields = set()
+        for item in root.iter(record_tag):
+            if item in name_fields:
+                continue
+            name_fields.update(item.findall(record_tag))
+            
+            values = {}
+            for child in item:
+                if child.tag in wanted and child.tag not in values:
+                    values[child.tag] = child.text
+            yield values
+
+    def stream_values(self, filepath, record_tag, tags):
+        """iterparse로 레코드마다 {태그: 텍스트}를 돌려주고, 다 읽은 레코드는 부모에서 떼어낸다
+        
+        같은 태그가 중복되면 첫 번째 값을 사용한다 (element.find와 동일).
+        """
+        wanted = set(tags)
+        stack = []
+        for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag != record_tag:
+                continue
+            parent = stack[-1] if stack else None
+            if parent is not None and parent.tag == record_tag:
+                continue  # 레코드 안의 '급제자'(이름) 필드
+
+            values = {}
+            for child in elem:
+                if child.tag in wanted and child.tag not in values:
+                    values[child.tag] = child.text
+            yield values
+
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+
+
+class LxmlBackend:
+    """lxml.etree 백엔드 (C 구현 iterparse + 태그 필터)"""
+
+    name = 'lxml'
+
+    def tree_values(self, filepath, record_tag, tags):
+        """전체 트리를 올린 뒤 필드/레코드 태그만 C 레벨에서 걸러 문서 순서로 순회
+        
+        lxml의 element.find/findtext는 호출마다 경로를 해석하므로 레코드×태그 횟수만큼
+        부르면 stdlib보다 느려진다. 대신 root.iter(태그 목록)을 한 번만 돌며
+        레코드 요소가 나오면 새 레코드를 시작한다.
+        """
+        root = lxml_etree.parse(str(filepath)).getroot()
+        field_tags = set(tags)
+        watched = sorted(field_tags | {record_tag})
+        values = None
+        for elem in root.iter(watched):
+            if elem.tag == record_tag and not self._is_name_field(elem, record_tag):
+                if values is not None:
+                    yield values
+                values = {}
+            elif values is not None and elem.tag in field_tags and elem.tag not in values:
+                values[elem.tag] = elem.text
+        if values is not None:
+            yield values
+
+    def stream_values(self, filepath, record_tag, tags):
+        """레코드 태그만 C 레벨에서 걸러 받아 자식 필드로 {태그: 텍스트} 구성"""
+        wanted = set(tags)
+        for _, elem in lxml_etree.iterparse(str(filepath), events=('end',), tag=record_tag):
+            parent = elem.getparent()
+            if parent is not None and parent.tag == record_tag:
+                continue  # 레코드 안의 '급제자'(이름) 필드
+            
+            values = {}
+            for child in elem:
+                if child.tag in wanted and child.tag not in values:
+                    values[child.tag] = child.text
+            yield values
+            
+            # 읽은 레코드와 그 앞의 형제 요소를 해제하여 메모리를 일정하게 유지
+            elem.clear(keep_tail=True)
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def _is_name_field(self, elem, record_tag):
+        parent = elem.getparent()
+        return parent is not None and parent.tag == record_tag
+
+
+BACKENDS = {
+    'stdlib': StdlibBackend,
+    'lxml': LxmlBackend
+}
+
+
+def available_backends():
+    """현재 환경에서 사용 가능한 백엔드 이름"""
+    return [name for name in BACKENDS if name != 'lxml' or lxml_etree is not None]
+
+
+def get_backend(name='auto'):
+    """백엔드 선택: 'auto'는 lxml이 설치되어 있으면 lxml, 아니면 stdlib"""
+    if name == 'auto':
+        name = 'lxml' if lxml_etree is not None else 'stdlib'
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 XML 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    if name == 'lxml' and lxml_etree is None:
+        raise ImportError("lxml이 설치되어 있지 않습니다 (pip install lxml)")
+    return BACKENDS[name]()
+
+
+def parse_variants(base_path, exam_type, streaming_modes=(False, True)):
+    """사용 가능한 백엔드 × 파싱 모드별 파싱 결과
+
+    Returns:
+        dict: (백엔드, 스트리밍 여부) → (DataFrame, 소요 초)
+    """
+    from kinship_analysis import KwagwaDataParser
+
+    results = {}
+    for backend in available_backends():
+        for streaming in streaming_modes:
+            parser = KwagwaDataParser(base_path, streaming=streaming, use_cache=False,
+                                      backend=backend)
+            start = time.perf_counter()
+            df = parser.parse(exam_type)
+            results[(backend, streaming)] = (df, time.perf_counter() - start)
+    return results
+
+
+def benchmark_backends(base_path, streaming_modes=(False, True)):
+    """네 과거 모두의 백엔드 × 파싱 모드별 파싱 시간 표"""
+    import pandas as pd
+    from kinship_analysis import KwagwaDataParser
+
+    timings = []
+    for exam_type in KwagwaDataParser.EXAM_FILES:
+        results = parse_variants(base_path, exam_type, streaming_modes)
+        for (backend, streaming), (df, elapsed) in results.items():
+            timings.append({
+                '과거': exam_type,
+                '백엔드': backend,
+                '모드': '스트리밍' if streaming else '전체 트리',
+                '레코드수': len(df),
+                '초': round(elapsed, 3)
+            })
+    return pd.DataFrame(timings)
+
+
+def main(argv=None):
+    """백엔드 속도 비교"""
+    arg_parser = argparse.ArgumentParser(description="과거 XML 파서 백엔드 벤치마크")
+    arg_parser.add_argument('--data-dir', default='.',
+                            help='원본 XML 파일이 있는 디렉터리 (기본: 현재 디렉터리)')
+    args = arg_parser.parse_args(argv)
+
+    print(f"사용 가능한 백엔드: {', '.join(available_backends())}")
+    timings = benchmark_backends(args.data_dir)
+
+    print("\n[파싱 시간 비교]")
+    table = timings.pivot_table(index='과거', columns=['백엔드', '모드'], values='초')
+    print(table.to_string())
+    if 'lxml' in available_backends():
+        for mode in ('전체 트리', '스트리밍'):
+            speedup = table[('stdlib', mode)].sum() / table[('lxml', mode)].sum()
+            print(f"  lxml 속도 향상 ({mode}): {speedup:.2f}배")
+
+
+if __name__ == "__main__":
+    main()